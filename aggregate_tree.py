@@ -0,0 +1,169 @@
+import operator
+
+from redblack_tree import RedBlackTree
+
+"""
+Class AggregateTree(RedBlackTree)는 각 노드에 그 노드를 root로 하는 subtree의 요약값(summary)을 저장하여, 정렬된 범위 안에 있는 element들의 합계, 최솟값, 최댓값 같은 값을 O(log n)에 구해주는 red-black tree이다.
+요약값은 사용자가 주는 세 가지로 정해진다.
+    measure(element): element 하나의 값 (None이면 element 자체)
+    combine(a, b): 두 값을 합친 값. (a, b, c의 순서를 유지하면) 결합법칙 combine(combine(a, b), c) == combine(a, combine(b, c))을 만족해야 한다. 교환법칙은 필요 없다.
+    identity: 빈 범위의 값. combine(identity, a) == combine(a, identity) == a이어야 한다.
+예를 들어 합계는 (operator.add, 0), 최솟값은 (min, float('inf')), 개수는 measure=lambda e: 1과 (operator.add, 0)이다. 여러 값을 한번에 구하려면 measure가 tuple을 돌려주고 combine이 tuple의 각 자리를 합치면 된다.
+element의 값은 노드를 만들 때 한번 계산하여 _value에 저장하고, subtree의 요약값 _summary는 OrderStatisticTree의 _count와 마찬가지로 RedBlackTree의 _update hook으로 유지된다. 따라서 _rotate와 insert/delete가 구조를 바꾼 O(log n)개의 노드에 대해서만 combine이 다시 호출된다.
+key 함수를 주면 RedBlackTree(key=...)와 같이 element를 key의 순서로 정렬하고, range_aggregate의 범위도 key로 받는다. 예를 들어 (timestamp, payload) record들을 key=lambda r: r[0], measure=lambda r: r[1]로 넣으면 시간 범위 안의 payload를 합칠 수 있다.
+
+:param combine: 두 값을 합치는 결합법칙을 만족하는 함수
+:param identity: combine의 항등원
+:param measure: element로부터 값을 계산하는 함수, None이면 element 자체를 값으로 쓴다.
+:param key: 정렬에 사용할 key 함수 (RedBlackTree.__init__ 참고)
+"""
+class AggregateTree(RedBlackTree):
+    """Red-black tree maintaining a monoid summary of every subtree."""
+
+    #-------------------------- nested _Node class --------------------------
+    class _Node(RedBlackTree._Node):
+        """Red-black tree node that also stores its value and the summary of its subtree."""
+        __slots__ = '_value', '_summary'
+
+        def __init__(self, element, parent=None, left=None, right=None, color=RedBlackTree._Node.RED):
+            super().__init__(element, parent, left, right, color)
+            self._value = None
+            self._summary = None
+
+    _augmented = True
+
+    def __init__(self, combine=operator.add, identity=0, measure=None, key=None):
+        """Create an empty tree summarizing elements with the given monoid."""
+        super().__init__(key)
+        self._combine = combine
+        self._identity = identity
+        self._measure = measure
+
+    """
+    _new_node(self, element)는 RedBlackTree와 같이 노드를 만든 뒤 element의 값을 계산하여 _value와 _summary에 저장한다.
+    """
+    def _new_node(self, element):
+        node = super()._new_node(element)
+        value = element if self._measure is None else self._measure(element)
+        node._value = value
+        node._summary = value
+        return node
+
+    """
+    _copy_element(self, dst, src)는 delete에서 successor의 element를 target으로 옮길 때 그 값도 함께 옮겨준다. _summary는 그 뒤에 _update로 다시 계산된다.
+    """
+    def _copy_element(self, dst, src):
+        super()._copy_element(dst, src)
+        dst._value = src._value
+
+    """
+    _update(self, node)는 node의 _summary를 왼쪽 subtree의 요약값, node의 값, 오른쪽 subtree의 요약값을 순서대로 combine한 값으로 다시 계산한다. 없는 자식은 건너뛰므로 identity와 combine을 하지 않는다.
+
+    :param node: _summary를 다시 계산할 노드
+    """
+    def _update(self, node):
+        summary = node._value
+        if node._left is not None:
+            summary = self._combine(node._left._summary, summary)
+        if node._right is not None:
+            summary = self._combine(summary, node._right._summary)
+        node._summary = summary
+
+    """
+    _augmentation_error(self, node)는 validate에서 node의 _summary가 두 자식의 요약값과 node의 값으로 다시 계산한 값과 같은지 검사한다.
+
+    :param node: 검사할 노드
+    :return: 다르면 설명 문자열, 같으면 None
+    """
+    def _augmentation_error(self, node):
+        summary = node._value
+        if node._left is not None:
+            summary = self._combine(node._left._summary, summary)
+        if node._right is not None:
+            summary = self._combine(summary, node._right._summary)
+        if summary != node._summary:
+            return f'_summary is {node._summary!r} but the subtree combines to {summary!r}'
+        return None
+
+    """
+    aggregate(self)는 트리 전체의 요약값을 O(1)에 반환한다. 트리가 비어있으면 identity를 반환한다.
+    """
+    def aggregate(self):
+        return self._identity if self._root is None else self._root._summary
+
+    """
+    range_aggregate(self, lo=None, hi=None, inclusive=(True, True))는 lo와 hi 사이(irange와 같은 범위 규칙, key 함수가 있으면 key의 범위)에 있는 element들의 값을 정렬 순서대로 combine한 값을 반환한다. 범위가 비어있으면 identity를 반환한다.
+    root에서 내려가면서 범위 안에 있는 첫 노드(split 노드)를 찾은 뒤, 그 노드의 왼쪽 subtree에서는 lo 이상인 부분을, 오른쪽 subtree에서는 hi 이하인 부분을 각각 한번씩 내려가면서 구한다. 내려가는 도중 범위에 통째로 들어가는 subtree는 저장된 _summary를 그대로 사용하므로 전체 비용은 O(log n)번의 비교와 combine이다.
+
+    :param lo: 범위의 하한, None이면 하한이 없다.
+    :param hi: 범위의 상한, None이면 상한이 없다.
+    :param inclusive: (하한 포함 여부, 상한 포함 여부)
+    :return: 범위 안 element들의 요약값
+    """
+    def range_aggregate(self, lo=None, hi=None, inclusive=(True, True)):
+        lo_inclusive, hi_inclusive = inclusive
+        node = self._root
+        while node is not None:
+            if lo is not None and self._below(node._element, lo, lo_inclusive):
+                node = node._right
+            elif hi is not None and self._above(node._element, hi, hi_inclusive):
+                node = node._left
+            else:
+                break
+        if node is None:
+            return self._identity
+        summary = self._suffix(node._left, lo, lo_inclusive)
+        summary = self._combine(summary, node._value)
+        return self._combine(summary, self._prefix(node._right, hi, hi_inclusive))
+
+    """
+    _below(key, lo, inclusive)는 key가 하한 lo 때문에 범위 밖인지, _above(key, hi, inclusive)는 key가 상한 hi 때문에 범위 밖인지를 < 비교만으로 반환한다.
+    """
+    @staticmethod
+    def _below(key, lo, inclusive):
+        return key < lo if inclusive else not lo < key
+
+    @staticmethod
+    def _above(key, hi, inclusive):
+        return hi < key if inclusive else not key < hi
+
+    """
+    _suffix(self, node, lo, inclusive)는 node를 root로 하는 subtree에서 lo 이상(inclusive가 False면 lo 초과)인 element들의 요약값을, _prefix(self, node, hi, inclusive)는 hi 이하(hi 미만)인 element들의 요약값을 구한다.
+    _suffix는 내려가면서 범위 안에 있는 노드를 만나면 그 노드와 오른쪽 subtree를 지금까지 구한 값의 앞에 붙이고(정렬 순서상 그 뒤에 만날 노드들은 모두 앞쪽이므로) 왼쪽으로, 범위 밖이면 오른쪽으로 간다. _prefix는 좌우와 붙이는 방향만 반대이다.
+    """
+    def _suffix(self, node, lo, inclusive):
+        combine = self._combine
+        summary = self._identity
+        while node is not None:
+            if lo is not None and self._below(node._element, lo, inclusive):
+                node = node._right
+                continue
+            part = node._value
+            if node._right is not None:
+                part = combine(part, node._right._summary)
+            summary = combine(part, summary)
+            if lo is None:
+                # 하한이 없으면 왼쪽 subtree 전체가 범위 안에 있다.
+                if node._left is not None:
+                    summary = combine(node._left._summary, summary)
+                break
+            node = node._left
+        return summary
+
+    def _prefix(self, node, hi, inclusive):
+        combine = self._combine
+        summary = self._identity
+        while node is not None:
+            if hi is not None and self._above(node._element, hi, inclusive):
+                node = node._left
+                continue
+            part = node._value
+            if node._left is not None:
+                part = combine(node._left._summary, part)
+            summary = combine(summary, part)
+            if hi is None:
+                if node._right is not None:
+                    summary = combine(summary, node._right._summary)
+                break
+            node = node._right
+        return summary
@@ -0,0 +1,390 @@
+from array import array
+
+"""
+Class ArrayRedBlackTree는 RedBlackTree와 같은 insert/delete/search API를 제공하지만, 노드를 객체로 만들지 않고 노드의 각 필드를 평행한 배열(struct-of-arrays)에 나누어 저장하는 red-black tree이다.
+i번 노드의 key는 self._keys[i], 왼쪽/오른쪽 자식과 부모의 번호는 self._left[i], self._right[i], self._parent[i], 색상은 self._color[i](1이면 red, 0이면 black)에 저장된다. 0번 자리는 모든 빈 자식과 root의 부모를 대신하는 black NIL 노드(sentinel)로 사용하므로 None 검사를 따로 할 필요가 없다.
+key는 typecode에 맞는 C 타입의 값으로 배열에 바로 저장되므로(기본값 'q'는 64bit 정수) key마다 Python 객체를 만들지 않아도 되고, 노드 하나에 8바이트(key) + 4바이트 * 3(link) + 1바이트(color)만 사용한다. 지워진 노드의 자리는 free-list로 연결해 두었다가 다음 insert에서 다시 사용한다.
+
+:param typecode: key를 저장할 array의 typecode (예: 'q'는 64bit 정수, 'd'는 실수)
+"""
+class ArrayRedBlackTree:
+    """Red-black tree whose nodes are stored in parallel arrays."""
+
+    RED = 1
+    BLACK = 0
+    _LINK_TYPECODE = 'i'      # node index type; 32bit is enough for 2**31 - 1 nodes
+
+    def __init__(self, typecode='q'):
+        """Create an initially empty tree."""
+        self._keys = array(typecode, [0])              # slot 0 is the NIL sentinel
+        self._left = array(self._LINK_TYPECODE, [0])
+        self._right = array(self._LINK_TYPECODE, [0])
+        self._parent = array(self._LINK_TYPECODE, [0])
+        self._color = bytearray(1)                     # NIL is black
+        self._root = 0
+        self._size = 0
+        self._free = 0                                 # head of the free-list, 0 if empty
+
+    def __len__(self):
+        return self._size
+
+    """
+    _alloc(self, key)는 key를 가진 red 노드를 위한 자리를 하나 만들고 그 번호를 반환한다. free-list에 지워진 자리가 있으면 그 자리를 다시 사용하고, 없으면 각 배열의 끝에 새 자리를 추가한다. free-list는 _left 배열을 이용하여 다음 빈 자리를 연결한다.
+    두 경우 모두 key를 가장 먼저 배열에 저장한다. 배열이 담을 수 없는 key(typecode 'q'에 실수, 문자열, 64bit를 넘는 정수 등)는 여기서 TypeError나 OverflowError를 내는데, 그 전에 free-list나 다른 배열을 바꾸었다면 자리 하나를 잃어버리거나 배열들의 길이가 어긋나기 때문이다.
+
+    :param key: 새 노드에 저장할 key
+    :return: 새 노드의 번호
+    :raises TypeError: key가 배열의 typecode에 맞지 않는 경우
+    :raises OverflowError: key가 배열의 typecode의 범위를 벗어나는 경우
+    """
+    def _alloc(self, key):
+        i = self._free
+        if i:
+            self._keys[i] = key
+            self._free = self._left[i]
+            self._left[i] = 0
+            self._right[i] = 0
+            self._parent[i] = 0
+            self._color[i] = self.RED
+        else:
+            i = len(self._keys)
+            self._keys.append(key)
+            self._left.append(0)
+            self._right.append(0)
+            self._parent.append(0)
+            self._color.append(self.RED)
+        return i
+
+    """
+    _release(self, i)는 지워진 i번 노드의 자리를 free-list의 맨 앞에 연결한다.
+
+    :param i: 지워진 노드의 번호
+    """
+    def _release(self, i):
+        self._left[i] = self._free
+        self._free = i
+
+    """
+    _find(self, key)는 root에서 내려가면서 key를 가진 노드의 번호를 찾는다. 없으면 0(NIL)을 반환한다.
+
+    :param key: 찾고자 하는 key
+    :return: key를 가진 노드의 번호, 없으면 0
+    """
+    def _find(self, key):
+        keys, left, right = self._keys, self._left, self._right
+        i = self._root
+        while i:
+            k = keys[i]
+            if key < k:
+                i = left[i]
+            elif k < key:
+                i = right[i]
+            else:
+                return i
+        return 0
+
+    """
+    search(self, key)는 key가 트리에 있으면 key를, 없으면 None을 반환한다.
+
+    :param key: 찾고자 하는 key
+    :return: 찾은 key 또는 None
+    """
+    def search(self, key):
+        i = self._find(key)
+        return self._keys[i] if i else None
+
+    def __contains__(self, key):
+        return self._find(key) != 0
+
+    """
+    _rotate_left(self, x)와 _rotate_right(self, x)는 x와 x의 오른쪽(왼쪽) 자식 y의 관계를 바꾸어 y가 x의 자리로 올라오게 한다.
+
+    :param x: rotate의 기준이 되는 노드의 번호
+    """
+    def _rotate_left(self, x):
+        left, right, parent = self._left, self._right, self._parent
+        y = right[x]
+        right[x] = left[y]
+        if left[y]:
+            parent[left[y]] = x
+        p = parent[x]
+        parent[y] = p
+        if p == 0:
+            self._root = y
+        elif x == left[p]:
+            left[p] = y
+        else:
+            right[p] = y
+        left[y] = x
+        parent[x] = y
+
+    def _rotate_right(self, x):
+        left, right, parent = self._left, self._right, self._parent
+        y = left[x]
+        left[x] = right[y]
+        if right[y]:
+            parent[right[y]] = x
+        p = parent[x]
+        parent[y] = p
+        if p == 0:
+            self._root = y
+        elif x == right[p]:
+            right[p] = y
+        else:
+            left[p] = y
+        right[y] = x
+        parent[x] = y
+
+    """
+    insert(self, key)는 key를 가진 red 노드를 BST 규칙에 따라 leaf 자리에 넣고 double red를 처리한다. RedBlackTree와 마찬가지로 같은 key는 오른쪽으로 보낸다.
+    double red 처리는 부모의 형제(uncle)가 red이면 recoloring 후 grandparent에서 다시 검사하고, black이면 필요에 따라 한번 또는 두번 rotate하는 방식이다.
+
+    :param key: 넣고자 하는 key
+    """
+    def insert(self, key):
+        keys, left, right = self._keys, self._left, self._right
+        z = self._alloc(key)
+        parent = self._parent
+        color = self._color
+        y = 0
+        x = self._root
+        while x:
+            y = x
+            if key < keys[x]:
+                x = left[x]
+            else:
+                x = right[x]
+        parent[z] = y
+        if y == 0:
+            self._root = z
+        elif key < keys[y]:
+            left[y] = z
+        else:
+            right[y] = z
+        self._size += 1
+
+        # double red 처리
+        while color[parent[z]] == self.RED:
+            p = parent[z]
+            g = parent[p]
+            if p == left[g]:
+                u = right[g]
+                if color[u] == self.RED:
+                    color[p] = color[u] = self.BLACK
+                    color[g] = self.RED
+                    z = g
+                else:
+                    if z == right[p]:
+                        z = p
+                        self._rotate_left(z)
+                        p = parent[z]
+                    color[p] = self.BLACK
+                    color[g] = self.RED
+                    self._rotate_right(g)
+            else:
+                u = left[g]
+                if color[u] == self.RED:
+                    color[p] = color[u] = self.BLACK
+                    color[g] = self.RED
+                    z = g
+                else:
+                    if z == left[p]:
+                        z = p
+                        self._rotate_right(z)
+                        p = parent[z]
+                    color[p] = self.BLACK
+                    color[g] = self.RED
+                    self._rotate_left(g)
+        color[self._root] = self.BLACK
+
+    """
+    _transplant(self, u, v)는 u 자리에 v를 연결하여 u를 그 부모로부터 떼어낸다. v가 NIL이어도 v의 부모를 기록해두어 double black 처리에 사용한다.
+
+    :param u: 떼어낼 노드의 번호
+    :param v: u 자리에 들어갈 노드의 번호
+    """
+    def _transplant(self, u, v):
+        left, right, parent = self._left, self._right, self._parent
+        p = parent[u]
+        if p == 0:
+            self._root = v
+        elif u == left[p]:
+            left[p] = v
+        else:
+            right[p] = v
+        parent[v] = p
+
+    """
+    delete(self, key)는 key를 가진 노드를 트리에서 지우고 key를 반환한다. key가 없으면 None을 반환한다. 자식이 둘인 노드를 지우는 경우에는 successor 노드를 그 자리로 옮긴다. 지워진 자리가 black이었다면 그 자리에 들어온 노드 x에서 double black을 처리한다. 지워진 노드의 자리는 free-list로 돌려준다.
+
+    :param key: 지우고자 하는 key
+    :return: 지운 key 또는 None
+    """
+    def delete(self, key):
+        z = self._find(key)
+        if z == 0:
+            return None
+        keys, left, right, parent, color = self._keys, self._left, self._right, self._parent, self._color
+        removed = keys[z]
+        y = z
+        y_color = color[y]
+        if left[z] == 0:
+            x = right[z]
+            self._transplant(z, x)
+        elif right[z] == 0:
+            x = left[z]
+            self._transplant(z, x)
+        else:
+            y = right[z]
+            while left[y]:
+                y = left[y]
+            y_color = color[y]
+            x = right[y]
+            if parent[y] == z:
+                parent[x] = y
+            else:
+                self._transplant(y, x)
+                right[y] = right[z]
+                parent[right[y]] = y
+            self._transplant(z, y)
+            left[y] = left[z]
+            parent[left[y]] = y
+            color[y] = color[z]
+        if y_color == self.BLACK:
+            self._fix_double_black(x)
+        self._release(z)
+        self._size -= 1
+        parent[0] = 0
+        return removed
+
+    """
+    _fix_double_black(self, x)는 x 자리에 생긴 double black을 처리한다. 형제가 red인 경우 rotate로 형제를 black으로 만들고, 형제의 자식이 모두 black이면 형제를 red로 바꾸고 위로 올라가며, 형제에게 red 자식이 있으면 rotate로 마무리한다.
+
+    :param x: double black이 생긴 자리의 노드 번호 (NIL일 수 있다.)
+    """
+    def _fix_double_black(self, x):
+        left, right, parent, color = self._left, self._right, self._parent, self._color
+        RED, BLACK = self.RED, self.BLACK
+        while x != self._root and color[x] == BLACK:
+            p = parent[x]
+            if x == left[p]:
+                w = right[p]
+                if color[w] == RED:
+                    color[w] = BLACK
+                    color[p] = RED
+                    self._rotate_left(p)
+                    w = right[p]
+                if color[left[w]] == BLACK and color[right[w]] == BLACK:
+                    color[w] = RED
+                    x = p
+                else:
+                    if color[right[w]] == BLACK:
+                        color[left[w]] = BLACK
+                        color[w] = RED
+                        self._rotate_right(w)
+                        w = right[p]
+                    color[w] = color[p]
+                    color[p] = BLACK
+                    color[right[w]] = BLACK
+                    self._rotate_left(p)
+                    x = self._root
+            else:
+                w = left[p]
+                if color[w] == RED:
+                    color[w] = BLACK
+                    color[p] = RED
+                    self._rotate_right(p)
+                    w = left[p]
+                if color[right[w]] == BLACK and color[left[w]] == BLACK:
+                    color[w] = RED
+                    x = p
+                else:
+                    if color[left[w]] == BLACK:
+                        color[right[w]] = BLACK
+                        color[w] = RED
+                        self._rotate_left(w)
+                        w = left[p]
+                    color[w] = color[p]
+                    color[p] = BLACK
+                    color[left[w]] = BLACK
+                    self._rotate_right(p)
+                    x = self._root
+        color[x] = BLACK
+
+    """
+    __iter__(self)는 key들을 오름차순으로 yield한다. _parent 배열을 따라 올라가는 방식이므로 추가 메모리는 O(1)이다.
+
+    :yield: 트리의 key들을 오름차순으로 yield한다.
+    """
+    def __iter__(self):
+        keys, left, right, parent = self._keys, self._left, self._right, self._parent
+        i = self._root
+        if i == 0:
+            return
+        while left[i]:
+            i = left[i]
+        while i:
+            yield keys[i]
+            if right[i]:
+                i = right[i]
+                while left[i]:
+                    i = left[i]
+            else:
+                child = i
+                i = parent[i]
+                while i and child == right[i]:
+                    child = i
+                    i = parent[i]
+
+    def inorder_traverse(self):
+        return list(self)
+
+    """
+    nbytes(self)는 노드를 저장하는 배열들이 차지하는 메모리의 크기(바이트)를 반환한다. free-list에 있는 빈 자리도 포함된다.
+
+    :return: 배열들의 크기의 합
+    """
+    def nbytes(self):
+        total = len(self._color)
+        for arr in (self._keys, self._left, self._right, self._parent):
+            total += arr.itemsize * len(arr)
+        return total
+
+    """
+    check_tree_property_silent(self)는 parent-child link, BST 성질, root black, double red, black height를 한번의 순회로 검사하여 모두 만족하면 True를 반환한다. 재귀 대신 명시적인 stack을 사용한다.
+
+    :return: red-black tree의 성질을 모두 만족하면 True, 아니면 False
+    """
+    def check_tree_property_silent(self):
+        keys, left, right, parent, color = self._keys, self._left, self._right, self._parent, self._color
+        if self._root == 0:
+            return True
+        if color[self._root] != self.BLACK or parent[self._root] != 0:
+            return False
+        black_height = {0: 1}
+        stack = [(self._root, False)]
+        while stack:
+            i, visited = stack.pop()
+            l, r = left[i], right[i]
+            if not visited:
+                stack.append((i, True))
+                for c in (l, r):
+                    if c:
+                        if parent[c] != i:
+                            return False
+                        stack.append((c, False))
+                continue
+            if l and keys[i] < keys[l]:
+                return False
+            if r and keys[r] < keys[i]:
+                return False
+            if color[i] == self.RED and (color[l] == self.RED or color[r] == self.RED):
+                return False
+            if black_height[l] != black_height[r]:
+                return False
+            black_height[i] = black_height[l] + (1 if color[i] == self.BLACK else 0)
+            if l:
+                del black_height[l]
+            if r:
+                del black_height[r]
+        return True
@@ -0,0 +1,3 @@
+"""
+benchmarks 패키지는 트리 구현들의 성능을 측정하는 스크립트들을 모아둔 곳이다. 저장소의 최상위 디렉토리에서 python -m benchmarks.<모듈 이름> 또는 python -m benchmarks <command> 형태로 실행한다.
+"""
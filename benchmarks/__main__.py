@@ -0,0 +1,26 @@
+import sys
+
+from benchmarks import bench_lookup, bench_profile, bench_sentinel, bench_storage, bench_suite
+
+"""
+python -m benchmarks <command> [옵션...]은 command에 해당하는 benchmark 모듈의 main에 나머지 옵션을 넘겨 실행한다. 각 command의 옵션은 python -m benchmarks <command> --help로 볼 수 있다.
+"""
+
+COMMANDS = {
+    'lookup': bench_lookup.main,
+    'profile': bench_profile.main,
+    'sentinel': bench_sentinel.main,
+    'storage': bench_storage.main,
+    'suite': bench_suite.main,
+}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print('usage: python -m benchmarks {' + ','.join(sorted(COMMANDS)) + '} [options]', file=sys.stderr)
+        return 2
+    COMMANDS[argv[0]](argv[1:])
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import argparse
+import random
+import time
+
+from redblack_tree import RedBlackTree
+
+"""
+bench_lookup은 RedBlackTree의 search(point lookup)가 초당 몇 번 수행되는지를 트리 크기별로 측정하는 micro-benchmark이다. 트리는 from_sorted로 0부터 n-1까지의 정수를 넣어 만들고, 트리에 있는 key(hit)와 없는 key(miss)를 따로 측정한다.
+10M개의 key로 만든 트리는 약 1GB의 메모리를 사용한다.
+
+사용법: python -m benchmarks lookup --sizes 1000,1000000,10000000 --lookups 200000
+"""
+
+"""
+lookups_per_second(tree, probes, repeat)는 probes의 key들을 모두 search하는 것을 repeat번 반복하여 그 중 가장 빠른 시간으로 초당 search 횟수를 계산한다.
+
+:param tree: search할 트리
+:param probes: search할 key들의 리스트
+:param repeat: 반복 횟수
+:return: 초당 search 횟수
+"""
+def lookups_per_second(tree, probes, repeat):
+    search = tree.search
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for k in probes:
+            search(k)
+        best = min(best, time.perf_counter() - start)
+    return len(probes) / best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks lookup', description='Measure RedBlackTree point lookups per second.')
+    parser.add_argument('--sizes', default='1000,1000000,10000000', help='comma separated tree sizes')
+    parser.add_argument('--lookups', type=int, default=200000, help='number of search calls per measurement')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    print(f'{"size":>12}{"hit lookups/s":>16}{"miss lookups/s":>16}')
+    for size in (int(s) for s in args.sizes.split(',')):
+        tree = RedBlackTree.from_sorted(range(size))
+        hits = [rng.randrange(size) for _ in range(args.lookups)]
+        misses = [rng.randrange(size) + 0.5 for _ in range(args.lookups)]
+        hit_rate = lookups_per_second(tree, hits, args.repeat)
+        miss_rate = lookups_per_second(tree, misses, args.repeat)
+        print(f'{size:>12,}{hit_rate:>16,.0f}{miss_rate:>16,.0f}')
+        del tree
+
+if __name__ == '__main__':
+    main()
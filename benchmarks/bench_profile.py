@@ -0,0 +1,363 @@
+import argparse
+import ast
+import cProfile
+import json
+import os
+import pstats
+import random
+import sys
+import time
+import tracemalloc
+
+import linked_tree
+import redblack_tree
+import tree
+
+"""
+bench_profile은 기록해둔 연산 trace를 RedBlackTree 또는 LinkedTree에 다시 적용(replay)하면서 시간과 메모리가 트리 내부의 어느 함수(_search_n_add_for_insert, _process_double_red, _rotate, _process_double_black_01 같은 delete case들, _validate, _make_position 등)에서 쓰이는지 보여준다. 같은 trace를 여러번 replay하며 각 pass는 다음을 측정한다.
+    1. cProfile: 함수마다 호출 횟수, 자신의 시간(tottime), 호출한 함수를 포함한 시간(cumtime)
+    2. sys.setprofile: 호출 stack 전체마다의 시간을 모아 flamegraph.pl이나 speedscope가 읽을 수 있는 collapsed-stack 파일로 저장한다. 한 줄이 "함수;함수;함수 나노초" 형식이다.
+    3. tracemalloc: replay가 끝났을 때 남아있는 메모리를 그 메모리를 할당한 가장 안쪽의 트리 함수별로 나누고, replay 동안의 최대 메모리를 잰다. 곧바로 해제되는 할당(예를 들어 _make_position이 만드는 Position)은 남지 않으므로 cProfile의 호출 횟수로 확인한다.
+    4. RedBlackTree인 경우 enable_instrumentation으로 rotation, recoloring, double red/black 처리 횟수를 센다.
+profiler가 함수 호출마다 비용을 더하므로 절대적인 시간보다 함수들 사이의 비율을 보는 데 사용한다.
+
+trace 파일은 한 줄에 연산 하나를 JSON 리스트로 적은 것이다. (write_trace로 만들 수 있다.)
+    redblack: ["insert", 값], ["delete", 값], ["search", 값], ["traverse"]
+    linked: ["add_root", 값], ["add_child", 부모 번호, 값], ["replace", 번호, 값], ["delete", 번호], ["depth", 번호], ["height"], ["preorder"], ["postorder"], ["levelorder"]
+    linked의 번호는 add_root와 add_child로 만들어진 순서(root가 0)이다.
+
+사용법:
+    python -m benchmarks profile --tree redblack --generate 50000 --trace ops.jsonl
+    python -m benchmarks profile --tree redblack --trace ops.jsonl --collapsed ops.collapsed
+"""
+
+TREES = ('redblack', 'linked')
+_TREE_FILES = tuple(os.path.abspath(module.__file__) for module in (redblack_tree, linked_tree, tree))
+
+#-------------------------- trace --------------------------
+"""
+write_trace(path, ops)와 read_trace(path)는 연산들의 리스트를 위의 형식으로 저장하고 읽는다.
+
+:param path: trace 파일의 경로
+:param ops: 연산(리스트 또는 tuple)들의 iterable
+:return: read_trace의 경우 연산 리스트들의 리스트
+:raises ValueError: 빈 줄이 아닌데 JSON 리스트가 아닌 줄이 있는 경우
+"""
+def write_trace(path, ops):
+    with open(path, 'w') as f:
+        for op in ops:
+            f.write(json.dumps(list(op)) + '\n')
+
+def read_trace(path):
+    ops = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            op = json.loads(line)
+            if not isinstance(op, list) or not op:
+                raise ValueError(f'{path}:{number}: operation must be a non-empty JSON list')
+            ops.append(op)
+    return ops
+
+"""
+generate_trace(kind, size, rng)는 profile할 trace가 없을 때 사용할 연산들을 만든다.
+redblack: size개의 서로 다른 정수를 무작위 순서로 insert하면서 네 번에 한번 search를 하고, 그 중 절반을 무작위 순서로 delete한 뒤 두 번 순회한다.
+linked: size개의 노드를 무작위로 고른 부모 아래에 add_child로 붙이고, depth, replace, leaf의 delete, 세 가지 순회와 height를 섞는다.
+
+:param kind: 'redblack' 또는 'linked'
+:param size: 넣을 element(노드)의 개수
+:param rng: random.Random 객체
+:return: 연산 리스트들의 리스트
+"""
+def generate_trace(kind, size, rng):
+    ops = []
+    if kind == 'redblack':
+        keys = rng.sample(range(10 * size), size)
+        for i, k in enumerate(keys):
+            ops.append(['insert', k])
+            if i % 4 == 3:
+                ops.append(['search', keys[rng.randrange(i + 1)]])
+        rng.shuffle(keys)
+        ops.extend(['delete', k] for k in keys[:size // 2])
+        ops.extend([['traverse'], ['traverse']])
+        return ops
+    if kind != 'linked':
+        raise ValueError(f'unknown tree: {kind}')
+
+    ops.append(['add_root', 0])
+    alive = [0]                 # 지워지지 않은 노드의 번호들
+    parents = [None]            # 번호별 부모의 번호
+    children = [0]              # 번호별 자식의 수
+    for i in range(1, size):
+        parent = alive[rng.randrange(len(alive))]
+        ops.append(['add_child', parent, i])
+        alive.append(len(parents))
+        parents.append(parent)
+        children.append(0)
+        children[parent] += 1
+        if i % 8 == 0:
+            ops.append(['depth', alive[rng.randrange(len(alive))]])
+            ops.append(['replace', alive[rng.randrange(len(alive))], -i])
+    for _ in range(size // 20):
+        j = rng.randrange(1, len(alive))
+        if children[alive[j]] == 0:        # LinkedTree._delete는 leaf만 지울 수 있다.
+            ops.append(['delete', alive[j]])
+            children[parents[alive[j]]] -= 1
+            alive[j] = alive[-1]
+            alive.pop()
+    for name in ('preorder', 'postorder', 'levelorder', 'height'):
+        ops.append([name])
+    return ops
+
+#-------------------------- replay --------------------------
+"""
+replay(structure, ops)는 ops의 연산들을 차례로 structure에 적용한다. 순회는 generator를 끝까지 소비한다.
+
+:param structure: RedBlackTree 또는 LinkedTree 객체
+:param ops: read_trace가 반환한 연산들
+:raises ValueError: 알 수 없는 연산이 있는 경우
+"""
+def replay(structure, ops):
+    if isinstance(structure, linked_tree.LinkedTree):
+        _replay_linked(structure, ops)
+    else:
+        _replay_redblack(structure, ops)
+
+def _replay_redblack(structure, ops):
+    for op in ops:
+        name = op[0]
+        if name == 'insert':
+            structure.insert(op[1])
+        elif name == 'delete':
+            structure.delete(op[1])
+        elif name == 'search':
+            structure.search(op[1])
+        elif name == 'traverse':
+            for _ in structure:
+                pass
+        else:
+            raise ValueError(f'unknown redblack operation: {name}')
+
+def _replay_linked(structure, ops):
+    positions = []
+    for op in ops:
+        name = op[0]
+        if name == 'add_root':
+            positions.append(structure._add_root(op[1]))
+        elif name == 'add_child':
+            positions.append(structure._add_child(positions[op[1]], op[2]))
+        elif name == 'replace':
+            structure._replace(positions[op[1]], op[2])
+        elif name == 'delete':
+            structure._delete(positions[op[1]])
+        elif name == 'depth':
+            structure.depth(positions[op[1]])
+        elif name == 'height':
+            structure.height()
+        elif name in ('preorder', 'postorder', 'levelorder'):
+            for _ in getattr(structure, name)():
+                pass
+        else:
+            raise ValueError(f'unknown linked operation: {name}')
+
+def _new_structure(kind):
+    return redblack_tree.RedBlackTree() if kind == 'redblack' else linked_tree.LinkedTree()
+
+#-------------------------- naming --------------------------
+"""
+Class _FunctionNames는 파일의 (경로, 줄 번호)를 그 줄을 포함하는 가장 안쪽 함수의 이름(예: RedBlackTree._rotate)으로 바꿔준다. cProfile은 함수 이름만, tracemalloc은 줄 번호만 알려주므로 같은 이름을 쓰기 위해 소스를 ast로 읽어 함수들의 줄 범위를 기억해둔다.
+"""
+class _FunctionNames:
+    """Map (file, line) pairs to qualified function names."""
+
+    def __init__(self):
+        self._spans = {}
+
+    def _load(self, path):
+        spans = []
+        try:
+            with open(path, encoding='utf-8') as f:
+                module = ast.parse(f.read())
+        except (OSError, SyntaxError):
+            module = None
+
+        def visit(node, prefix):
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    name = prefix + child.name
+                    if not isinstance(child, ast.ClassDef):
+                        spans.append((child.lineno, child.end_lineno, name))
+                    visit(child, name + '.')
+
+        if module is not None:
+            visit(module, '')
+        return spans
+
+    def name(self, path, line, default):
+        spans = self._spans.get(path)
+        if spans is None:
+            spans = self._spans[path] = self._load(path)
+        best = None
+        for start, end, name in spans:
+            if start <= line <= end and (best is None or start > best[0]):
+                best = (start, name)
+        return best[1] if best else default
+
+def _is_tree_file(path):
+    return os.path.abspath(path) in _TREE_FILES
+
+#-------------------------- passes --------------------------
+def profile_calls(kind, ops, names):
+    structure = _new_structure(kind)
+    profiler = cProfile.Profile()
+    profiler.runcall(replay, structure, ops)
+    rows = {}
+    for (path, line, func), (_, calls, tottime, cumtime, _) in pstats.Stats(profiler).stats.items():
+        if _is_tree_file(path):
+            label = f'{os.path.basename(path)}:{names.name(path, line, func)}'
+            rows[label] = {'calls': calls, 'tottime': tottime, 'cumtime': cumtime}
+    return rows, profiler
+
+"""
+Class _StackCollector는 sys.setprofile에 등록되어 Python 함수의 호출과 반환마다 불린다. 직전 event부터 지금까지의 시간을 현재 호출 stack(바깥 함수부터 ';'로 이은 문자열)에 더한다. generator는 yield할 때 반환되고 다시 시작할 때 호출되므로 stack이 맞게 유지된다. C 함수의 호출은 따로 세지 않고 호출한 Python 함수의 시간에 포함한다. 이 함수 자신이 쓰는 시간은 최대한 빼기 위해 마지막 시각을 함수가 끝날 때 다시 잰다.
+"""
+class _StackCollector:
+    """Profile hook that accumulates exclusive time per full call stack."""
+
+    def __init__(self, names):
+        self._names = names
+        self._stack = []
+        self._labels = {}
+        self.weights = {}
+        self._last = time.perf_counter_ns()
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            path = code.co_filename
+            name = getattr(code, 'co_qualname', code.co_name)
+            if _is_tree_file(path):
+                name = self._names.name(path, code.co_firstlineno, name)
+            label = self._labels[code] = f'{os.path.basename(path)}:{name}'
+        return label
+
+    def __call__(self, frame, event, arg):
+        now = time.perf_counter_ns()
+        stack = self._stack
+        if stack:
+            key = stack[-1]
+            self.weights[key] = self.weights.get(key, 0) + now - self._last
+        if event == 'call':
+            label = self._label(frame.f_code)
+            stack.append(stack[-1] + ';' + label if stack else label)
+        elif event == 'return' and stack:
+            stack.pop()
+        self._last = time.perf_counter_ns()
+
+def collect_stacks(kind, ops, names):
+    structure = _new_structure(kind)
+    collector = _StackCollector(names)
+    sys.setprofile(collector)
+    try:
+        replay(structure, ops)
+    finally:
+        sys.setprofile(None)
+    return collector.weights
+
+"""
+profile_memory(kind, ops, names, frames)는 tracemalloc을 켜고 replay한 뒤, 남아있는 메모리 block들을 traceback에서 가장 안쪽에 있는 트리 함수별로 더한다. 트리 함수가 traceback에 없으면 '<other>'로 센다.
+
+:return: (함수 이름 -> {'bytes', 'blocks'} dict, replay 동안의 최대 메모리 증가량)
+"""
+def profile_memory(kind, ops, names, frames=16):
+    structure = _new_structure(kind)
+    tracemalloc.start(frames)
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        replay(structure, ops)
+        peak = tracemalloc.get_traced_memory()[1] - base
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    rows = {}
+    for stat in snapshot.statistics('traceback'):
+        label = '<other>'
+        for frame in reversed(stat.traceback):
+            if _is_tree_file(frame.filename):
+                label = f'{os.path.basename(frame.filename)}:{names.name(frame.filename, frame.lineno, "?")}'
+                break
+        row = rows.setdefault(label, {'bytes': 0, 'blocks': 0})
+        row['bytes'] += stat.size
+        row['blocks'] += stat.count
+    return rows, peak
+
+def count_rebalancing(ops):
+    structure = redblack_tree.RedBlackTree()
+    structure.enable_instrumentation()
+    replay(structure, ops)
+    return structure.stats()
+
+#-------------------------- report --------------------------
+def write_collapsed(path, weights):
+    with open(path, 'w') as f:
+        for stack, weight in sorted(weights.items()):
+            if weight > 0:
+                f.write(f'{stack} {weight}\n')
+
+def print_report(kind, ops, wall, calls, memory, peak, rebalancing, top):
+    print(f'trace: {len(ops)} operations on {kind}, replay {wall:.3f}s without profiling')
+    if rebalancing is not None:
+        print('rebalancing: ' + ', '.join(f'{name}={value}' for name, value in rebalancing.items()))
+    print(f'memory: peak {peak / 1024:.1f} KiB during replay')
+    print()
+    print(f'{"function":<52}{"calls":>10}{"tottime ms":>12}{"cumtime ms":>12}{"live KiB":>10}{"blocks":>9}')
+    labels = sorted(set(calls) | set(memory), key=lambda label: -calls.get(label, {}).get('tottime', 0.0))
+    for label in labels[:top]:
+        c = calls.get(label, {'calls': 0, 'tottime': 0.0, 'cumtime': 0.0})
+        m = memory.get(label, {'bytes': 0, 'blocks': 0})
+        print(f'{label:<52}{c["calls"]:>10}{c["tottime"] * 1000:>12.2f}{c["cumtime"] * 1000:>12.2f}'
+              f'{m["bytes"] / 1024:>10.1f}{m["blocks"]:>9}')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks profile',
+                                     description='Replay an operation trace under cProfile and tracemalloc.')
+    parser.add_argument('--tree', choices=TREES, default='redblack')
+    parser.add_argument('--trace', help='trace file to replay (written first when --generate is given)')
+    parser.add_argument('--generate', type=int, metavar='SIZE', help='generate a synthetic trace of SIZE elements')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--collapsed', help='collapsed-stack output path (default: <trace>.collapsed or profile.collapsed)')
+    parser.add_argument('--pstats', help='also dump raw cProfile stats here')
+    parser.add_argument('--top', type=int, default=30, help='number of functions to print')
+    args = parser.parse_args(argv)
+
+    if args.generate is not None:
+        ops = generate_trace(args.tree, args.generate, random.Random(args.seed))
+        if args.trace:
+            write_trace(args.trace, ops)
+    elif args.trace:
+        ops = read_trace(args.trace)
+    else:
+        parser.error('either --trace or --generate is required')
+
+    names = _FunctionNames()
+    start = time.perf_counter()
+    replay(_new_structure(args.tree), ops)
+    wall = time.perf_counter() - start
+
+    calls, profiler = profile_calls(args.tree, ops, names)
+    weights = collect_stacks(args.tree, ops, names)
+    memory, peak = profile_memory(args.tree, ops, names)
+    rebalancing = count_rebalancing(ops) if args.tree == 'redblack' else None
+
+    collapsed = args.collapsed or (args.trace + '.collapsed' if args.trace else 'profile.collapsed')
+    write_collapsed(collapsed, weights)
+    if args.pstats:
+        profiler.dump_stats(args.pstats)
+    print_report(args.tree, ops, wall, calls, memory, peak, rebalancing, args.top)
+    print()
+    print(f'collapsed stacks written to {collapsed}')
+
+if __name__ == '__main__':
+    main()
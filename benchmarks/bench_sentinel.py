@@ -0,0 +1,78 @@
+import argparse
+import gc
+import random
+import time
+
+from redblack_tree import RedBlackTree
+from sentinel_redblack_tree import SentinelRedBlackTree
+
+"""
+bench_sentinel은 RedBlackTree와 SentinelRedBlackTree를 같은 random workload로 비교한다. 같은 key들을 random 순서로 insert하고, 모든 key를 다른 random 순서로 search한 뒤, 또 다른 random 순서로 모두 delete하면서 각 단계의 초당 연산 횟수를 잰다. 각 단계는 repeat번 반복하여 가장 좋은 값을 사용하고, 측정하는 동안에는 gc를 꺼둔다. 마지막 열은 RedBlackTree 대비 속도의 배수이다.
+
+사용법: python -m benchmarks sentinel --size 200000 --repeat 3
+"""
+
+ENGINES = (('RedBlackTree', RedBlackTree), ('SentinelRedBlackTree', SentinelRedBlackTree))
+
+"""
+run_workload(factory, keys, probes, victims)는 factory()로 만든 빈 트리에 keys를 insert하고, probes를 search하고, victims를 delete하는 데 걸린 시간을 각각 잰다. 마지막에 트리가 비어있는지 확인한다.
+
+:return: {'insert': 초, 'search': 초, 'delete': 초}
+:raises ValueError: delete가 끝난 뒤 트리가 비어있지 않은 경우
+"""
+def run_workload(factory, keys, probes, victims):
+    times = {}
+    tree = factory()
+    insert, search, delete = tree.insert, tree.search, tree.delete
+    start = time.perf_counter()
+    for k in keys:
+        insert(k)
+    times['insert'] = time.perf_counter() - start
+    start = time.perf_counter()
+    for k in probes:
+        search(k)
+    times['search'] = time.perf_counter() - start
+    start = time.perf_counter()
+    for k in victims:
+        delete(k)
+    times['delete'] = time.perf_counter() - start
+    if len(tree):
+        raise ValueError(f'{len(tree)} elements are left after deleting every key')
+    return times
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks sentinel', description='Compare RedBlackTree and SentinelRedBlackTree on a random workload.')
+    parser.add_argument('--size', type=int, default=200000, help='number of keys')
+    parser.add_argument('--repeat', type=int, default=3, help='best of this many runs')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(10 * args.size), args.size)
+    probes = keys[:]
+    rng.shuffle(probes)
+    victims = keys[:]
+    rng.shuffle(victims)
+
+    best = {}
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(args.repeat):
+            for name, factory in ENGINES:
+                times = run_workload(factory, keys, probes, victims)
+                previous = best.setdefault(name, times)
+                for op, seconds in times.items():
+                    previous[op] = min(previous[op], seconds)
+    finally:
+        if enabled:
+            gc.enable()
+
+    baseline = best[ENGINES[0][0]]
+    print(f'{"engine":<22}{"op":<8}{"ops/s":>14}{"speedup":>10}')
+    for name, _ in ENGINES:
+        for op, seconds in best[name].items():
+            print(f'{name:<22}{op:<8}{args.size / seconds:>14,.0f}{baseline[op] / seconds:>9.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import random
+import time
+import tracemalloc
+
+from redblack_tree import RedBlackTree
+from array_redblack_tree import ArrayRedBlackTree
+
+"""
+bench_storage는 객체 노드를 사용하는 RedBlackTree와 배열에 노드를 저장하는 ArrayRedBlackTree를 같은 정수 key들로 만들어 key 하나당 사용하는 메모리(바이트)와 초당 search 횟수를 비교한다.
+메모리는 tracemalloc으로 트리를 만드는 동안 새로 할당된 메모리의 양을 잰다. key로 쓰이는 int 객체는 측정 전에 미리 만들어 두므로 포함되지 않는다. 실제로 key를 트리에만 보관하는 경우 RedBlackTree는 key마다 int 객체(약 28바이트)가 더 필요하지만 ArrayRedBlackTree는 그렇지 않다.
+
+사용법: python -m benchmarks storage --size 200000 --lookups 200000
+"""
+
+"""
+build(factory, keys)는 factory()로 만든 빈 트리에 keys를 차례로 insert하고 걸린 시간을 잰다.
+
+:param factory: 빈 트리를 만드는 함수
+:param keys: insert할 key들의 리스트
+:return: (만들어진 트리, insert에 걸린 시간(초))
+"""
+def build(factory, keys):
+    start = time.perf_counter()
+    tree = factory()
+    for k in keys:
+        tree.insert(k)
+    return tree, time.perf_counter() - start
+
+"""
+measure_bytes_per_key(factory, keys)는 tracemalloc을 켠 상태에서 트리를 한번 더 만들어 그 동안 늘어난 메모리를 key 개수로 나눈다. tracemalloc은 할당마다 기록을 남겨 시간이 크게 늘어나므로 시간 측정과는 따로 수행한다.
+
+:param factory: 빈 트리를 만드는 함수
+:param keys: insert할 key들의 리스트
+:return: key 하나당 바이트
+"""
+def measure_bytes_per_key(factory, keys):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = build(factory, keys)[0]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tree
+    return (after - before) / max(len(keys), 1)
+
+"""
+measure_lookups(tree, probes)는 probes에 있는 key들을 모두 search하는 데 걸린 시간으로부터 초당 search 횟수를 계산한다.
+
+:param tree: search할 트리
+:param probes: search할 key들의 리스트
+:return: 초당 search 횟수
+"""
+def measure_lookups(tree, probes):
+    search = tree.search
+    start = time.perf_counter()
+    for k in probes:
+        search(k)
+    elapsed = time.perf_counter() - start
+    return len(probes) / elapsed if elapsed > 0 else float('inf')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks storage', description='Compare object-node and array-backed red-black trees.')
+    parser.add_argument('--size', type=int, default=200000, help='number of keys to insert')
+    parser.add_argument('--lookups', type=int, default=200000, help='number of search calls to time')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(10**9, 10**9 + 10 * args.size), args.size)
+    probes = [rng.choice(keys) for _ in range(args.lookups)]
+
+    print(f'{"engine":<20}{"bytes/key":>12}{"insert s":>12}{"lookups/s":>14}')
+    for name, factory in (('RedBlackTree', RedBlackTree), ('ArrayRedBlackTree', ArrayRedBlackTree)):
+        per_key = measure_bytes_per_key(factory, keys)
+        tree, build_time = build(factory, keys)
+        rate = measure_lookups(tree, probes)
+        print(f'{name:<20}{per_key:>12.1f}{build_time:>12.2f}{rate:>14,.0f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,358 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left, insort
+
+from hw1 import binarySearch_1, binarySearch_2
+from linked_tree import LinkedTree
+from redblack_tree import RedBlackTree
+
+"""
+bench_suite는 RedBlackTree, LinkedTree, hw1.py의 binary search들을 정해진 workload들로 측정하여 결과를 JSON으로 출력한다. 같은 seed와 크기로 실행하면 같은 입력이 만들어지므로 결과를 저장해두고 나중의 결과와 비교할 수 있다.
+
+workload:
+    redblack: RedBlackTree의 insert, delete, search, traversal을 random, sorted, reverse, zipf 순서의 key로 측정한다. 같은 연산을 bisect로 관리하는 정렬된 리스트와 dict로도 측정하여 기준(baseline)으로 사용한다.
+    linked: LinkedTree의 preorder, postorder, levelorder, depth, height를 wide(root 아래 두 단계로 넓게 퍼진) 트리와 deep(root 아래 긴 사슬들이 달린) 트리에서 측정한다.
+    binary_search: binarySearch_1, binarySearch_2를 bisect.bisect_left와 비교한다.
+
+결과의 각 항목에는 초당 연산 횟수(ops_per_sec, 반복 중 가장 빠른 것), 연산 하나의 지연 시간의 p50/p99(마이크로초), 연산을 수행하는 동안의 최대 메모리 증가량(peak_memory_bytes)이 들어간다. traversal, preorder 같은 순회는 트리 전체를 한번 순회하는 것을 연산 하나로 센다.
+RedBlackTree 항목에는 같은 workload의 bisect, dict 기준 대비 속도 비율(relative_to)이 붙는다. --compare로 이전 결과 파일을 주면 같은 항목의 ops_per_sec 비율(change)이 붙으므로 1보다 작으면 느려진 것이다.
+메모리는 tracemalloc이 할당마다 기록을 남겨 시간이 크게 늘어나므로 시간 측정과는 따로 한번 더 실행하여 잰다.
+
+사용법: python -m benchmarks suite --size 20000 --output result.json
+"""
+
+DISTRIBUTIONS = ('random', 'sorted', 'reverse', 'zipf')
+SUITES = ('redblack', 'linked', 'binary_search')
+
+"""
+make_keys(distribution, size, rng, zipf_s=1.1)는 distribution에 따른 순서의 key 리스트를 만든다. zipf는 size개의 서로 다른 key 중에서 순위 r인 key가 1/r**zipf_s에 비례하는 확률로 뽑히도록 size개를 뽑으므로 같은 key가 여러번 나온다. 순위는 key의 크기와 상관없도록 섞는다.
+
+:param distribution: 'random', 'sorted', 'reverse', 'zipf' 중 하나
+:param size: key의 개수
+:param rng: random.Random 객체
+:param zipf_s: zipf 분포의 지수
+:return: key들의 리스트
+:raises ValueError: 알 수 없는 distribution인 경우
+"""
+def make_keys(distribution, size, rng, zipf_s=1.1):
+    keys = list(range(0, 2 * size, 2))
+    if distribution == 'random':
+        rng.shuffle(keys)
+    elif distribution == 'reverse':
+        keys.reverse()
+    elif distribution == 'zipf':
+        rng.shuffle(keys)
+        total = 0.0
+        cumulative = []
+        for rank in range(1, size + 1):
+            total += 1.0 / rank ** zipf_s
+            cumulative.append(total)
+        keys = rng.choices(keys, cum_weights=cumulative, k=size)
+    elif distribution != 'sorted':
+        raise ValueError(f'unknown distribution: {distribution}')
+    return keys
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+"""
+measure(setup, operation, inputs, repeat)는 workload 하나를 repeat번 실행하여 결과 dict를 만든다. 매 반복마다 setup()으로 상태를 새로 만들고(시간에 포함하지 않는다), inputs의 값마다 operation(상태, 값)을 한번씩 호출하며 호출마다 걸린 시간을 잰다. timeit과 마찬가지로 시간을 재는 동안에는 garbage collector를 끈다. 마지막으로 tracemalloc을 켜고 한번 더 실행하여 setup 이후에 늘어난 메모리의 최댓값을 잰다.
+
+:param setup: 상태를 만드는 인자 없는 함수
+:param operation: 연산 하나를 수행하는 함수
+:param inputs: operation에 차례로 넘길 값들의 리스트
+:param repeat: 반복 횟수
+:param memory: False이면 메모리를 재지 않는다.
+:return: ops, ops_per_sec, p50_us, p99_us, peak_memory_bytes를 담은 dict
+"""
+def measure(setup, operation, inputs, repeat, memory=True):
+    latencies = []
+    best = None
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        state = setup()
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = clock()
+            for value in inputs:
+                t0 = clock()
+                operation(state, value)
+                latencies.append(clock() - t0)
+            elapsed = clock() - start
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if best is None or elapsed < best:
+            best = elapsed
+        del state
+
+    peak = None
+    if memory:
+        state = setup()
+        tracemalloc.start()
+        try:
+            base = tracemalloc.get_traced_memory()[0]
+            for value in inputs:
+                operation(state, value)
+            peak = tracemalloc.get_traced_memory()[1] - base
+        finally:
+            tracemalloc.stop()
+        del state
+
+    latencies.sort()
+    return {
+        'ops': len(inputs),
+        'ops_per_sec': len(inputs) * 1e9 / best if best else float('inf'),
+        'p50_us': _percentile(latencies, 0.50) / 1000,
+        'p99_us': _percentile(latencies, 0.99) / 1000,
+        'peak_memory_bytes': peak,
+    }
+
+#-------------------------- redblack --------------------------
+"""
+_ordered_structures()는 RedBlackTree와 기준 자료구조들의 (이름, 만들기, insert, delete, search, traversal) tuple들을 반환한다. bisect 기준은 insort로 정렬을 유지하는 리스트이고, dict 기준의 traversal은 정렬된 순서로 순회해야 하므로 sorted를 사용한다.
+"""
+def _ordered_structures():
+    def tree_delete(tree, key):
+        tree.delete(key)
+
+    def tree_traverse(tree, _):
+        for _ in tree:
+            pass
+
+    def list_build(keys):
+        return sorted(keys)
+
+    def list_delete(values, key):
+        i = bisect_left(values, key)
+        if i < len(values) and values[i] == key:
+            del values[i]
+
+    def list_search(values, key):
+        i = bisect_left(values, key)
+        return values[i] if i < len(values) and values[i] == key else None
+
+    def list_traverse(values, _):
+        for _ in values:
+            pass
+
+    def dict_build(keys):
+        return dict.fromkeys(keys)
+
+    def dict_insert(table, key):
+        table[key] = None
+
+    def dict_delete(table, key):
+        table.pop(key, None)
+
+    def dict_search(table, key):
+        return table.get(key)
+
+    def dict_traverse(table, _):
+        for _ in sorted(table):
+            pass
+
+    return (
+        ('RedBlackTree', RedBlackTree.from_iterable, RedBlackTree.insert, tree_delete,
+         RedBlackTree.search, tree_traverse),
+        ('bisect', list_build, insort, list_delete, list_search, list_traverse),
+        ('dict', dict_build, dict_insert, dict_delete, dict_search, dict_traverse),
+    )
+
+def run_redblack(args, rng):
+    results = []
+    for distribution in DISTRIBUTIONS:
+        keys = make_keys(distribution, args.size, rng)
+        for name, build, insert, delete, search, traverse in _ordered_structures():
+            workloads = (
+                ('insert', lambda: build([]), insert, keys),
+                ('delete', lambda: build(keys), delete, keys),
+                ('search', lambda: build(keys), search, keys),
+                ('traversal', lambda: build(keys), traverse, [None] * args.traversals),
+            )
+            for operation, setup, op, inputs in workloads:
+                result = measure(setup, op, inputs, args.repeat, not args.no_memory)
+                result.update(suite='redblack', structure=name, operation=operation,
+                              distribution=distribution, size=args.size)
+                results.append(result)
+    _add_relative(results)
+    return results
+
+"""
+_add_relative(results)는 RedBlackTree 항목마다 같은 연산과 distribution의 bisect, dict 항목 대비 ops_per_sec 비율을 relative_to에 기록한다. 1보다 크면 RedBlackTree가 더 빠른 것이다.
+"""
+def _add_relative(results):
+    baselines = {}
+    for r in results:
+        if r['structure'] != 'RedBlackTree':
+            baselines[r['operation'], r['distribution'], r['structure']] = r['ops_per_sec']
+    for r in results:
+        if r['structure'] == 'RedBlackTree':
+            r['relative_to'] = {
+                name: r['ops_per_sec'] / baselines[r['operation'], r['distribution'], name]
+                for name in ('bisect', 'dict')
+                if baselines.get((r['operation'], r['distribution'], name))
+            }
+
+#-------------------------- linked --------------------------
+"""
+build_wide(size)는 root 아래에 약 sqrt(size)개의 자식이 있고 각 자식 아래에 다시 약 sqrt(size)개의 자식이 있는 LinkedTree를 만든다.
+build_deep(size, depth)는 root 아래에 길이 depth의 사슬들을 size개의 노드가 될 때까지 매다는 LinkedTree를 만든다. Tree의 depth, height, preorder, postorder는 재귀로 구현되어 있으므로 depth는 재귀 한도보다 충분히 작아야 한다.
+
+:return: (트리, 가장 깊은 곳의 노드들을 포함한 leaf position들의 리스트)
+"""
+def build_wide(size):
+    tree = LinkedTree()
+    root = tree._add_root(0)
+    fanout = max(1, int(size ** 0.5))
+    leaves = []
+    count = 1
+    while count < size:
+        child = tree._add_child(root, count)
+        count += 1
+        for _ in range(fanout):
+            if count >= size:
+                break
+            leaves.append(tree._add_child(child, count))
+            count += 1
+    return tree, leaves
+
+def build_deep(size, depth):
+    tree = LinkedTree()
+    root = tree._add_root(0)
+    leaves = []
+    count = 1
+    while count < size:
+        p = root
+        for _ in range(depth):
+            if count >= size:
+                break
+            p = tree._add_child(p, count)
+            count += 1
+        leaves.append(p)
+    return tree, leaves
+
+def run_linked(args, rng):
+    if args.depth >= sys.getrecursionlimit() // 2:
+        raise ValueError('depth is too close to the recursion limit')
+
+    def traverse(method):
+        def operation(tree, _):
+            for _ in method(tree):
+                pass
+        return operation
+
+    def depth(tree, p):
+        return tree.depth(p)
+
+    def height(tree, _):
+        return tree.height()
+
+    results = []
+    for shape, (tree, leaves) in (('wide', build_wide(args.size)),
+                                  ('deep', build_deep(args.size, args.depth))):
+        probes = [rng.choice(leaves) for _ in range(args.probes)]
+        traversals = [None] * args.traversals
+        workloads = (
+            ('preorder', traverse(LinkedTree.preorder), traversals),
+            ('postorder', traverse(LinkedTree.postorder), traversals),
+            ('levelorder', traverse(LinkedTree.levelorder), traversals),
+            ('depth', depth, probes),
+            ('height', height, traversals),
+        )
+        for operation, op, inputs in workloads:
+            result = measure(lambda: tree, op, inputs, args.repeat, not args.no_memory)
+            result.update(suite='linked', structure='LinkedTree', operation=operation,
+                          distribution=shape, size=len(tree))
+            results.append(result)
+    return results
+
+#-------------------------- binary_search --------------------------
+def run_binary_search(args, rng):
+    values = list(range(0, 2 * args.size, 2))
+    # 절반은 있는 값, 절반은 없는 값(홀수)을 찾는다.
+    probes = [rng.randrange(2 * args.size) for _ in range(args.probes)]
+    length = len(values)
+    searches = (
+        ('binarySearch_1', lambda values, v: binarySearch_1(values, v)),
+        ('binarySearch_2', lambda values, v: binarySearch_2(values, v, 0, length)),
+        ('bisect', bisect_left),
+    )
+    results = []
+    for name, op in searches:
+        result = measure(lambda: values, op, probes, args.repeat, not args.no_memory)
+        result.update(suite='binary_search', structure=name, operation='search',
+                      distribution='random', size=length)
+        results.append(result)
+    return results
+
+#-------------------------- report --------------------------
+def _result_key(result):
+    return result['suite'], result['structure'], result['operation'], result['distribution'], result['size']
+
+"""
+_add_change(results, path)는 path에 저장된 이전 결과에서 같은 항목(suite, structure, operation, distribution, size)을 찾아 현재 ops_per_sec를 이전 값으로 나눈 비율을 change에 기록한다.
+"""
+def _add_change(results, path):
+    with open(path) as f:
+        previous = {_result_key(r): r['ops_per_sec'] for r in json.load(f)['results']}
+    for r in results:
+        old = previous.get(_result_key(r))
+        if old:
+            r['change'] = r['ops_per_sec'] / old
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks suite', description='Benchmark RedBlackTree, LinkedTree and binary search and print JSON.')
+    parser.add_argument('--size', type=int, default=20000, help='number of keys / tree nodes')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per workload (best is reported)')
+    parser.add_argument('--probes', type=int, default=5000, help='calls per run for depth and binary search')
+    parser.add_argument('--traversals', type=int, default=5, help='full traversals per run')
+    parser.add_argument('--depth', type=int, default=300, help='chain length of the deep LinkedTree')
+    parser.add_argument('--suites', default=','.join(SUITES), help='comma separated subset of ' + ', '.join(SUITES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--compare', help='previous JSON result to compute change ratios against')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args(argv)
+
+    runners = {'redblack': run_redblack, 'linked': run_linked, 'binary_search': run_binary_search}
+    suites = [s for s in args.suites.split(',') if s]
+    for suite in suites:
+        if suite not in runners:
+            parser.error(f'unknown suite: {suite}')
+
+    results = []
+    for suite in suites:
+        results.extend(runners[suite](args, random.Random(args.seed)))
+    if args.compare:
+        _add_change(results, args.compare)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'size': args.size,
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+import threading
+import time
+
+from redblack_tree import RedBlackTree
+
+"""
+Class _ReadWriteLock은 여러 reader가 동시에 잡을 수 있고 writer는 혼자서만 잡을 수 있는 lock이다. 기다리는 writer가 있으면 새로 오는 reader는 writer가 끝날 때까지 기다리므로(writer 우선) read가 많은 경우에도 writer가 굶지 않는다. 재진입(같은 thread가 잡은 상태에서 다시 잡는 것)은 지원하지 않는다.
+lock을 얻기까지 기다린 시간과 횟수를 내부 mutex를 잡은 상태에서 기록하므로 ConcurrentRedBlackTree.stats()에서 경합(contention)을 확인할 수 있다.
+"""
+class _ReadWriteLock:
+    """Writer-preferring reader-writer lock that records wait times."""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+        self.read_acquires = 0
+        self.read_wait = 0.0
+        self.write_acquires = 0
+        self.write_wait = 0.0
+        self.max_wait = 0.0
+
+    def acquire_read(self):
+        start = time.perf_counter()
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+            waited = time.perf_counter() - start
+            self.read_acquires += 1
+            self.read_wait += waited
+            if waited > self.max_wait:
+                self.max_wait = waited
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        start = time.perf_counter()
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+            waited = time.perf_counter() - start
+            self.write_acquires += 1
+            self.write_wait += waited
+            if waited > self.max_wait:
+                self.max_wait = waited
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+
+"""
+Class ConcurrentRedBlackTree는 RedBlackTree(또는 그 subclass)를 감싸서 여러 thread에서 동시에 사용할 수 있게 해주는 wrapper이다.
+search, in, irange 같은 읽기는 _ReadWriteLock의 read lock을 잡으므로 여러 thread에서 동시에 실행된다. insert와 delete는 바로 트리를 바꾸지 않고 write-combining queue(self._pending)에 쌓인다. 그 다음 write lock을 잡은 한 thread가 그때까지 쌓인 쓰기를 모두 한번에(batch) 적용하므로, 여러 thread가 동시에 쓰는 경우 lock을 쓰기마다 잡지 않고 batch마다 한번만 잡게 된다.
+insert와 delete는 기본적으로(wait=True) 자신의 쓰기가 적용된 뒤에 반환한다. 다른 thread가 먼저 write lock을 잡아 내 쓰기까지 적용했다면 lock을 다시 잡지 않는다. wait=False로 호출하면 쓰기를 queue에 넣기만 하고 바로 반환하며, queue에 batch_size개 이상이 쌓이거나 다음 읽기 또는 flush()가 호출될 때 적용된다. 읽기는 시작하기 전에 queue에 남은 쓰기를 먼저 적용하므로 같은 thread에서 한 쓰기는 항상 바로 다음 읽기에서 보인다.
+batch는 쓰기를 하나씩 트리에 적용하고, 트리가 어떤 쓰기를 거부하면(예: 비교할 수 없는 element) 그 예외를 해당 항목에만 기록하고 나머지 쓰기는 계속 적용한다. 예외는 batch를 적용한 thread가 아니라 그 쓰기를 넣은 thread에서 raise된다. wait=True인 쓰기는 그 insert/delete 호출에서, wait=False인 쓰기는 같은 thread가 다음에 flush()를 호출할 때 raise된다.
+
+:param tree: 감쌀 트리, None이면 새 RedBlackTree를 만든다. 쓰기는 tree.insert/tree.delete로 적용하므로 element를 받는 트리여야 한다.
+:param batch_size: wait=False인 쓰기가 이만큼 쌓이면 바로 적용한다.
+"""
+class ConcurrentRedBlackTree:
+    """Thread-safe wrapper around a red-black tree with batched writes."""
+
+    _INSERT = 0
+    _DELETE = 1
+
+    def __init__(self, tree=None, batch_size=256):
+        """Create a concurrent wrapper around tree (a new RedBlackTree by default)."""
+        if batch_size < 1:
+            raise ValueError('batch_size must be positive')
+        self._tree = RedBlackTree() if tree is None else tree
+        self._batch_size = batch_size
+        self._lock = _ReadWriteLock()
+        self._queue_lock = threading.Lock()     # self._pending, ticket 번호와 self._deferred의 리스트들만 보호한다.
+        self._pending = []
+        self._enqueued = 0                      # 지금까지 queue에 들어온 쓰기의 개수 (ticket 번호)
+        self._applied = 0                       # 지금까지 트리에 적용된 쓰기의 개수
+        self._batches = 0
+        self._batched_ops = 0
+        self._max_batch = 0
+        self._deferred = threading.local()      # .errors: 이 thread가 wait=False로 넣은 쓰기에서 난 예외들 (self._queue_lock이 보호)
+
+    #-------------------------- reads --------------------------
+    """
+    __len__(self)도 다른 읽기와 같이 read lock을 잡는다. split/join 뒤 크기를 모르는 트리의 len()은 트리를 순회하여 크기를 다시 세므로, 그 동안 쓰기가 트리를 바꾸지 못하게 해야 한다.
+    """
+    def __len__(self):
+        self._flush_pending()
+        self._lock.acquire_read()
+        try:
+            return len(self._tree)
+        finally:
+            self._lock.release_read()
+
+    def search(self, element):
+        self._flush_pending()
+        self._lock.acquire_read()
+        try:
+            return self._tree.search(element)
+        finally:
+            self._lock.release_read()
+
+    def __contains__(self, element):
+        return self.search(element) is not None
+
+    def search_many(self, elements):
+        self._flush_pending()
+        self._lock.acquire_read()
+        try:
+            return self._tree.search_many(elements)
+        finally:
+            self._lock.release_read()
+
+    """
+    irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False)는 RedBlackTree.irange의 결과를 read lock을 잡은 상태에서 리스트로 만들어 반환한다. generator를 그대로 돌려주면 호출한 쪽이 순회를 끝낼 때까지 lock을 잡고 있어야 하므로 범위의 element들을 한번에 복사한다.
+
+    :return: 범위 안에 있는 element들의 리스트
+    """
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        self._flush_pending()
+        self._lock.acquire_read()
+        try:
+            return list(self._tree.irange(lo, hi, inclusive, reverse))
+        finally:
+            self._lock.release_read()
+
+    def inorder_traverse(self):
+        return self.irange()
+
+    #-------------------------- writes --------------------------
+    """
+    insert(self, element, wait=True)와 delete(self, element, wait=True)는 쓰기를 queue에 넣고, wait이 True이면 그 쓰기가 적용될 때까지 기다린다. delete는 wait이 True인 경우 지워진 element(없었다면 None)를 반환하고, wait이 False이면 항상 None을 반환한다.
+
+    :param element: 넣거나 지울 element
+    :param wait: True이면 쓰기가 트리에 적용된 뒤에 반환한다.
+    :return: delete의 경우 지워진 element 또는 None
+    """
+    def insert(self, element, wait=True):
+        self._submit(self._INSERT, element, wait)
+
+    def delete(self, element, wait=True):
+        return self._submit(self._DELETE, element, wait)
+
+    """
+    flush(self)는 queue에 남아있는 쓰기를 모두 트리에 적용한다. 이 thread가 wait=False로 넣은 쓰기 중 실패한 것이 있다면 그 예외를 raise한다.
+    """
+    def flush(self):
+        with self._queue_lock:
+            ticket = self._enqueued
+        self._combine(ticket)
+        self._raise_deferred()
+
+    """
+    _submit(self, op, element, wait)는 [op, element, 결과, 예외, 넣은 thread의 예외 리스트] 항목을 queue에 넣고 ticket 번호를 받는다. 예외 리스트는 wait이 False인 경우에만 넣은 thread의 threading.local에서 꺼내 기록하며, 이 항목이 실패하면 예외를 그 리스트에 남겨둔다. thread id는 thread가 끝난 뒤 다른 thread에 다시 쓰일 수 있으므로 사용하지 않는다. wait이 True이거나 queue가 batch_size만큼 찼다면 _combine으로 queue를 비운다.
+
+    :return: 적용된 쓰기의 결과 (적용되지 않았다면 None)
+    :raises Exception: wait이 True이고 트리가 이 쓰기를 거부한 경우 그 예외
+    """
+    def _submit(self, op, element, wait):
+        entry = [op, element, None, None, None if wait else self._deferred_errors()]
+        with self._queue_lock:
+            self._pending.append(entry)
+            self._enqueued += 1
+            ticket = self._enqueued
+            full = len(self._pending) >= self._batch_size
+        if wait or full:
+            self._combine(ticket)
+        if wait and entry[3] is not None:
+            raise entry[3]
+        return entry[2]
+
+    """
+    _raise_deferred(self)는 현재 thread가 wait=False로 넣은 쓰기에서 난 예외가 있다면 가장 먼저 난 것을 꺼내 raise한다. 나머지는 다음 호출에서 raise된다.
+    """
+    def _raise_deferred(self):
+        errors = getattr(self._deferred, 'errors', None)
+        if not errors:
+            return
+        with self._queue_lock:
+            error = errors.pop(0)
+        raise error
+
+    def _deferred_errors(self):
+        errors = getattr(self._deferred, 'errors', None)
+        if errors is None:
+            errors = self._deferred.errors = []
+        return errors
+
+    """
+    _combine(self, ticket)은 ticket번째 쓰기까지 트리에 적용되도록 한다. 이미 적용되었다면 lock을 잡지 않고 반환한다. 그렇지 않다면 write lock을 잡고, 기다리는 동안 다른 thread가 적용하지 않았는지 다시 확인한 뒤 queue에 쌓인 쓰기를 모두 꺼내 적용한다. queue는 항상 통째로 꺼내고 들어온 순서대로 적용하므로 적용된 쓰기의 개수가 곧 적용된 마지막 ticket 번호이다.
+
+    :param ticket: 적용되어야 하는 마지막 쓰기의 번호
+    """
+    def _combine(self, ticket):
+        if self._applied >= ticket:
+            return
+        self._lock.acquire_write()
+        try:
+            if self._applied >= ticket:
+                return
+            with self._queue_lock:
+                batch = self._pending
+                self._pending = []
+                last = self._enqueued
+            self._apply(batch)
+            self._applied = last
+        finally:
+            self._lock.release_write()
+
+    """
+    _flush_pending(self)는 읽기 전에 queue에 남은 쓰기를 적용한다. 읽기에서는 이전 쓰기의 예외를 raise하지 않는다.
+    """
+    def _flush_pending(self):
+        if self._pending:
+            with self._queue_lock:
+                ticket = self._enqueued
+            self._combine(ticket)
+
+    """
+    _apply(self, batch)는 write lock을 잡은 상태에서 batch의 쓰기를 순서대로 트리에 적용한다. 항목마다 tree.insert 또는 tree.delete를 호출하고 delete의 결과를 항목에 기록한다. 트리가 예외를 raise하면 그 항목에 예외를 기록하고(wait=False인 항목이면 넣은 thread의 몫으로도 남겨둔다) 다음 항목을 계속 적용하므로, 한 쓰기의 실패가 같은 batch의 다른 쓰기를 잃어버리게 하지 않고 _combine의 적용된 개수도 항상 맞다.
+    tree.update로 연속된 insert를 한번에 넣지 않는 이유는, update는 도중에 실패하면 어디까지 들어갔는지 알 수 없고 RedBlackMap처럼 (key, value) 쌍을 받는 트리도 있기 때문이다. batch의 이점인 write lock을 batch마다 한번만 잡는 것은 그대로이다.
+
+    :param batch: [op, element, 결과, 예외, 넣은 thread의 예외 리스트] 항목들의 리스트
+    """
+    def _apply(self, batch):
+        tree = self._tree
+        insert, delete = tree.insert, tree.delete
+        for entry in batch:
+            try:
+                if entry[0] == self._INSERT:
+                    insert(entry[1])
+                else:
+                    entry[2] = delete(entry[1])
+            except Exception as error:
+                entry[3] = error
+                if entry[4] is not None:
+                    with self._queue_lock:
+                        entry[4].append(error)
+        self._batches += 1
+        self._batched_ops += len(batch)
+        if len(batch) > self._max_batch:
+            self._max_batch = len(batch)
+
+    #-------------------------- metrics --------------------------
+    """
+    stats(self)는 lock 경합과 batch에 대한 통계를 dict로 반환한다.
+    read_acquires, write_acquires는 lock을 잡은 횟수, read_wait, write_wait는 lock을 얻기까지 기다린 시간의 합(초), max_wait은 가장 오래 기다린 시간이다. batches는 적용된 batch의 수, batched_ops는 batch로 적용된 쓰기의 수, mean_batch와 max_batch는 batch 크기의 평균과 최댓값이며, pending은 아직 적용되지 않은 쓰기의 수이다.
+
+    :return: 통계 값들을 담은 dict
+    """
+    def stats(self):
+        lock = self._lock
+        return {
+            'read_acquires': lock.read_acquires,
+            'read_wait': lock.read_wait,
+            'write_acquires': lock.write_acquires,
+            'write_wait': lock.write_wait,
+            'max_wait': lock.max_wait,
+            'batches': self._batches,
+            'batched_ops': self._batched_ops,
+            'mean_batch': self._batched_ops / self._batches if self._batches else 0.0,
+            'max_batch': self._max_batch,
+            'pending': len(self._pending),
+        }
@@ -0,0 +1,312 @@
+import os
+import re
+import struct
+import zlib
+
+from redblack_map import RedBlackMap
+from redblack_tree import RedBlackTree
+
+"""
+durable_redblack_tree 모듈은 RedBlackTree의 insert/delete를 write-ahead log(WAL)에 기록하고 주기적으로 checkpoint를 남겨서, process가 죽더라도 마지막 checkpoint와 그 뒤의 log만으로 트리를 복구할 수 있게 해주는 DurableRedBlackTree를 제공한다.
+
+디렉토리 안의 파일:
+    checkpoint-<번호>.rbt: 번호번째 checkpoint 시점의 트리를 RedBlackTree.dump로 저장한 파일
+    wal-<번호>.log: 번호번째 checkpoint 이후의 쓰기 기록 (checkpoint가 없을 때는 번호 0)
+
+log record 형식 (little-endian): payload 길이 4 bytes, payload의 CRC32 4 bytes, payload
+payload: 연산 1 byte (b'I' insert, b'D' delete), element 타입 1 byte (b'q' 정수, b'd' 실수, b'u' 문자열), element 값 (8 bytes 정수/실수 또는 UTF-8 문자열)
+쓰는 도중에 죽어서 log의 끝 부분이 잘렸거나 깨진 경우 CRC나 길이가 맞지 않으므로, 복구할 때 처음으로 맞지 않는 record 앞까지만 사용하고 나머지는 잘라낸다.
+"""
+
+_RECORD = struct.Struct('<II')
+_INSERT = b'I'
+_DELETE = b'D'
+_CHECKPOINT_FILE = re.compile(r'checkpoint-(\d+)\.rbt$')
+
+"""
+_kind_of(element)는 element를 log와 checkpoint에 저장할 때 사용하는 타입 byte를 반환한다. checkpoint(RedBlackTree.dump)의 typecode와 같은 문자를 사용한다.
+
+:param element: int, float 또는 str인 element
+:return: b'q'(정수), b'd'(실수) 또는 b'u'(문자열)
+:raises TypeError: 지원하지 않는 element 타입인 경우
+"""
+def _kind_of(element):
+    kind = type(element)
+    if kind is int:
+        return b'q'
+    if kind is float:
+        return b'd'
+    if kind is str:
+        return b'u'
+    raise TypeError('only int, float or str elements can be logged')
+
+"""
+_encode(op, element)는 연산과 element를 log record 하나의 bytes로 만든다.
+
+:param op: _INSERT 또는 _DELETE
+:param element: int, float 또는 str인 element
+:return: record의 bytes
+:raises TypeError: 지원하지 않는 element 타입인 경우
+:raises OverflowError: 정수가 64bit 범위를 벗어나는 경우
+"""
+def _encode(op, element):
+    kind = _kind_of(element)
+    if kind == b'q':
+        if not -2 ** 63 <= element < 2 ** 63:
+            raise OverflowError('only 64-bit integers can be logged')
+        value = struct.pack('<q', element)
+    elif kind == b'd':
+        value = struct.pack('<d', element)
+    else:
+        value = element.encode('utf-8')
+    payload = op + kind + value
+    return _RECORD.pack(len(payload), zlib.crc32(payload)) + payload
+
+"""
+_decode(data)는 log 파일의 내용을 앞에서부터 읽어 (연산, element) tuple들의 리스트와, 마지막으로 온전하게 읽은 record의 끝 위치를 반환한다. 길이가 모자라거나 CRC가 맞지 않는 record를 만나면 거기서 멈춘다.
+
+:param data: log 파일의 bytes
+:return: ((연산, element)들의 리스트, 온전한 record들의 끝 위치)
+"""
+def _decode(data):
+    records = []
+    position = 0
+    while position + _RECORD.size <= len(data):
+        length, crc = _RECORD.unpack_from(data, position)
+        start = position + _RECORD.size
+        payload = data[start:start + length]
+        if length < 2 or len(payload) != length or zlib.crc32(payload) != crc:
+            break
+        op, kind, value = payload[:1], payload[1:2], payload[2:]
+        if kind == b'q':
+            element = struct.unpack('<q', value)[0]
+        elif kind == b'd':
+            element = struct.unpack('<d', value)[0]
+        else:
+            element = value.decode('utf-8')
+        records.append((op, element))
+        position = start + length
+    return records, position
+
+def _fsync_directory(path):
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+"""
+Class DurableRedBlackTree는 디렉토리 하나를 사용하여 트리의 내용을 디스크에 보존하는 wrapper이다.
+insert와 delete는 트리를 바꾼 뒤 그 변경이 성공한 경우에만 log record를 buffer가 있는 log 파일에 추가한다. 트리가 거부한 쓰기(예: 기존 element와 비교할 수 없는 element)가 log에 남으면 복구할 때마다 같은 오류가 나서 디렉토리를 다시 열 수 없게 되기 때문이다. record는 commit 전까지 buffer에만 있으므로 순서를 바꾸어도 어느 쓰기까지 복구되는지는 달라지지 않는다. 매 쓰기마다 fsync를 하면 디스크 대기 시간이 쓰기마다 들기 때문에, sync_every개의 쓰기를 모아 한번에 flush와 fsync를 한다(group commit). commit()을 호출하면 그때까지의 쓰기가 바로 디스크에 기록된다. sync_every가 1이면 모든 쓰기가 반환하기 전에 디스크에 기록된다.
+log에 checkpoint_every개의 쓰기가 쌓이면 checkpoint()로 트리 전체를 새 checkpoint 파일에 저장하고 새 log를 시작한 뒤 이전 파일들을 지운다. 그래서 복구할 때 다시 적용해야 하는 log의 길이가 checkpoint_every개를 넘지 않는다. checkpoint는 임시 파일에 쓴 뒤 rename하므로 도중에 죽더라도 이전 checkpoint와 log가 그대로 남는다.
+checkpoint 파일은 한 가지 타입의 element만 저장할 수 있으므로, 트리에 들어있는 element의 타입(복구한 트리의 element 또는 빈 트리에 처음 넣은 element의 타입)을 기억해두고 다른 타입의 element를 넣으려 하면 트리와 log를 바꾸기 전에 TypeError를 raise한다. 그렇지 않으면 쓰기는 성공하지만 다음 checkpoint부터 계속 실패하고 log가 끝없이 길어진다. 트리가 비면 다시 어떤 타입이든 넣을 수 있다.
+처음 만들 때 디렉토리에 가장 번호가 큰 checkpoint가 있다면 tree_class.load로 읽고, 그 번호의 log를 다시 적용하여 복구한다. 연속된 insert들은 트리의 update로 한번에 적용한다.
+
+:param path: checkpoint와 log를 저장할 디렉토리 (없으면 만든다.)
+:param tree_class: 사용할 트리 클래스 (RedBlackTree 또는 그 subclass). log에는 element만 기록되고 update로 다시 적용하므로, update가 (key, value) 쌍을 받는 RedBlackMap과 그 subclass는 사용할 수 없다.
+:param sync_every: 몇 개의 쓰기마다 fsync를 할지
+:param checkpoint_every: 몇 개의 쓰기마다 checkpoint를 만들지, None이면 자동으로 만들지 않는다.
+"""
+class DurableRedBlackTree:
+    """Red-black tree whose mutations are logged and checkpointed to disk."""
+
+    def __init__(self, path, tree_class=RedBlackTree, sync_every=64, checkpoint_every=100000):
+        """Open (and recover) the durable tree stored in directory path."""
+        if sync_every < 1:
+            raise ValueError('sync_every must be positive')
+        if issubclass(tree_class, RedBlackMap):
+            raise TypeError('tree_class must store plain elements; RedBlackMap values cannot be logged')
+        self._path = path
+        self._tree_class = tree_class
+        self._sync_every = sync_every
+        self._checkpoint_every = checkpoint_every
+        self._unsynced = 0
+        self._logged = 0
+        os.makedirs(path, exist_ok=True)
+        self._recover()
+
+    def _file(self, prefix, number, suffix):
+        return os.path.join(self._path, f'{prefix}-{number}{suffix}')
+
+    """
+    _recover(self)는 가장 번호가 큰 checkpoint를 읽고(없으면 빈 트리) 같은 번호의 log를 다시 적용한다. log 끝의 깨진 record는 잘라내고, 그 log 파일을 이어서 쓰도록 연다. 남아있는 임시 파일과 오래된 파일도 지운다.
+    CRC가 맞는 record를 트리가 받아들이지 못하는 경우(예: 서로 비교할 수 없는 타입의 element들)는 잘린 log가 아니라 내용이 잘못된 것이므로, 그 부분을 지우지 않고 어느 파일이 문제인지를 담은 ValueError를 raise한다.
+
+    :raises ValueError: checkpoint나 log의 내용을 트리에 적용할 수 없는 경우
+    """
+    def _recover(self):
+        numbers = []
+        for name in os.listdir(self._path):
+            match = _CHECKPOINT_FILE.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        self._number = max(numbers, default=0)
+        if numbers:
+            checkpoint_path = self._file('checkpoint', self._number, '.rbt')
+            try:
+                self._tree = self._tree_class.load(checkpoint_path)
+            except TypeError as error:
+                raise ValueError(f'cannot load {checkpoint_path}: {error}') from error
+        else:
+            self._tree = self._tree_class()
+
+        log_path = self._file('wal', self._number, '.log')
+        data = b''
+        if os.path.exists(log_path):
+            with open(log_path, 'rb') as f:
+                data = f.read()
+        records, end = _decode(data)
+        try:
+            self._replay(records)
+        except TypeError as error:
+            raise ValueError(f'cannot replay {log_path}: {error}') from error
+        self._logged = len(records)
+        self._kind = _kind_of(self._tree.min()) if len(self._tree) else None
+        if end != len(data):
+            with open(log_path, 'r+b') as f:
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+        self._log = open(log_path, 'ab')
+        self._remove_old_files()
+
+    """
+    _replay(self, records)는 log에서 읽은 (연산, element)들을 순서대로 트리에 적용한다. 연속된 insert들은 모아서 update로 넣는다.
+    """
+    def _replay(self, records):
+        run = []
+        for op, element in records:
+            if op == _INSERT:
+                run.append(element)
+                continue
+            if run:
+                self._tree.update(run)
+                run = []
+            self._tree.delete(element)
+        if run:
+            self._tree.update(run)
+
+    """
+    _remove_old_files(self)는 현재 번호보다 작은 번호의 checkpoint와 log, 그리고 끝나지 않은 checkpoint의 임시 파일을 지운다.
+    """
+    def _remove_old_files(self):
+        for name in os.listdir(self._path):
+            stem, _, suffix = name.partition('.')
+            prefix, _, number = stem.partition('-')
+            if prefix not in ('checkpoint', 'wal') or not number.isdigit():
+                continue
+            if int(number) < self._number or suffix == 'rbt.tmp':
+                os.remove(os.path.join(self._path, name))
+
+    #-------------------------- reads --------------------------
+    def __len__(self):
+        return len(self._tree)
+
+    def search(self, element):
+        return self._tree.search(element)
+
+    def __contains__(self, element):
+        return self._tree.search(element) is not None
+
+    def __iter__(self):
+        return iter(self._tree)
+
+    def __reversed__(self):
+        return reversed(self._tree)
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        return self._tree.irange(lo, hi, inclusive, reverse)
+
+    def inorder_traverse(self):
+        return self._tree.inorder_traverse()
+
+    #-------------------------- writes --------------------------
+    """
+    insert(self, element)와 delete(self, element)는 먼저 record를 만들어(지원하지 않는 타입이면 여기서 실패한다) 트리를 바꾸고, insert는 그 전에 element의 타입이 트리의 element들과 같은지(checkpoint로 저장할 수 있는지) 확인한다. 트리가 바뀐 뒤에만 트리가 바뀐 뒤에만 log에 record를 추가한다. 트리가 예외를 raise하면 아무것도 기록되지 않는다. delete는 element가 트리에 없으면 아무것도 기록하지 않고 None을 반환한다.
+
+    :param element: 넣거나 지울 element (int, float 또는 str)
+    :return: delete의 경우 지워진 element 또는 None
+    :raises TypeError: 지원하지 않는 element 타입이거나, 트리의 element들과 타입이 다르거나, 트리의 element와 비교할 수 없는 경우
+    :raises OverflowError: 정수가 64bit 범위를 벗어나는 경우
+    """
+    def insert(self, element):
+        record = _encode(_INSERT, element)
+        kind = _kind_of(element)
+        if self._kind is not None and kind != self._kind:
+            raise TypeError(f'cannot insert {type(element).__name__} into a durable tree of '
+                            f'{type(self._tree.min()).__name__} elements; a checkpoint stores one element type')
+        self._tree.insert(element)
+        self._kind = kind
+        self._append(record)
+        self._after_write()
+
+    def delete(self, element):
+        record = _encode(_DELETE, element)
+        removed = self._tree.delete(element)
+        if removed is None:
+            return None
+        if not len(self._tree):
+            self._kind = None
+        self._append(record)
+        self._after_write()
+        return removed
+
+    def _append(self, record):
+        self._log.write(record)
+        self._unsynced += 1
+        self._logged += 1
+
+    def _after_write(self):
+        if self._unsynced >= self._sync_every:
+            self.commit()
+        if self._checkpoint_every is not None and self._logged >= self._checkpoint_every:
+            self.checkpoint()
+
+    """
+    commit(self)는 buffer에 남아있는 log record들을 파일에 쓰고 fsync로 디스크에 기록한다. 이 함수가 반환된 뒤에는 그때까지의 모든 쓰기가 복구 가능하다.
+    """
+    def commit(self):
+        if self._unsynced:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._unsynced = 0
+
+    """
+    checkpoint(self)는 현재 트리 전체를 다음 번호의 checkpoint 파일로 저장하고 그 번호의 새 log를 시작한다. 순서는 다음과 같다.
+    1. 현재 log를 commit한다.
+    2. 트리를 임시 파일에 dump하고 fsync한 뒤, rename으로 checkpoint 파일을 만들고 디렉토리를 fsync한다. rename이 끝나기 전에 죽으면 이전 checkpoint와 log로 복구된다.
+    3. 새 번호의 log를 열고 이전 checkpoint와 log를 지운다.
+    """
+    def checkpoint(self):
+        self.commit()
+        number = self._number + 1
+        final = self._file('checkpoint', number, '.rbt')
+        temporary = final + '.tmp'
+        self._tree.dump(temporary)
+        with open(temporary, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(temporary, final)
+        _fsync_directory(self._path)
+
+        self._log.close()
+        self._number = number
+        self._log = open(self._file('wal', number, '.log'), 'ab')
+        self._logged = 0
+        self._remove_old_files()
+
+    """
+    close(self)는 남은 log를 commit하고 log 파일을 닫는다. with 문으로 사용하면 블록이 끝날 때 호출된다.
+    """
+    def close(self):
+        if not self._log.closed:
+            self.commit()
+            self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,7 +1,7 @@
 def binarySearch_1(list_in, value, offset=0):
     mid = len(list_in) // 2
     left = list_in[:mid]
-    right = list_in[mid:]
+    right = list_in[mid+1:]
 
     if mid < 0 or mid >= len(list_in):
         return -1
@@ -10,7 +10,7 @@ def binarySearch_1(list_in, value, offset=0):
     elif list_in[mid] > value:
         return binarySearch_1(left, value, offset)
     else:
-        return binarySearch_1(right, value, offset+mid)
+        return binarySearch_1(right, value, offset+mid+1)
 
 def binarySearch_2(list_in, value, offset, length):
     if length == 0:
@@ -23,4 +23,4 @@ def binarySearch_2(list_in, value, offset, length):
     elif list_in[offset+mid] > value:
         return binarySearch_2(list_in, value, offset, mid)
     else:
-        return binarySearch_2(list_in, value, offset+mid, length-mid)
\ No newline at end of file
+        return binarySearch_2(list_in, value, offset+mid+1, length-mid-1)
\ No newline at end of file
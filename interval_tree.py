@@ -0,0 +1,131 @@
+from redblack_tree import RedBlackTree
+
+"""
+Class IntervalTree(RedBlackTree)는 닫힌 구간 (low, high)들을 저장하고 주어진 구간과 겹치는 구간들을 찾아주는 interval tree이다. 구간은 (low, high) tuple을 element로 하여 low, high 순서로 정렬된다. 각 노드에는 그 노드를 root로 하는 subtree에 있는 구간들의 high 중 가장 큰 값(_max)을 함께 저장한다.
+_max는 OrderStatisticTree의 _count와 마찬가지로 RedBlackTree의 _update hook을 통해 유지된다. _rotate와 _reconstruct는 자리가 바뀐 노드들의, insert와 delete는 구조가 바뀐 위치부터 root까지의 _max를 다시 계산하므로 double red/double black 처리를 포함하여 insert와 delete의 비용은 O(log n) 그대로이다.
+겹치는 구간을 찾을 때는 _max가 찾는 구간의 low보다 작은 subtree(그 안의 어떤 구간도 low까지 닿지 않음)와, low가 찾는 구간의 high보다 큰 노드의 오른쪽 subtree(그 안의 모든 구간이 high보다 뒤에서 시작함)를 건너뛰므로 겹치는 구간이 k개라면 대부분의 경우 O(log n + k)개의 노드만 방문한다. (최악의 경우에는 O(min(n, k log n))개)
+
+:param RedBlackTree: 상위 클래스인 RedBlackTree를 가리킨다.
+"""
+class IntervalTree(RedBlackTree):
+    """Red-black tree of closed intervals with subtree max-endpoint augmentation."""
+
+    #-------------------------- nested _Node class --------------------------
+    class _Node(RedBlackTree._Node):
+        """Red-black tree node that also stores the largest high endpoint of its subtree."""
+        __slots__ = '_max',
+
+        def __init__(self, element, parent=None, left=None, right=None, color=RedBlackTree._Node.RED):
+            super().__init__(element, parent, left, right, color)
+            self._max = element[1]
+
+    _augmented = True
+
+    def __init__(self):
+        """Create an initially empty interval tree."""
+        super().__init__()
+
+    """
+    _update(self, node)는 node의 _max를 node의 구간의 high와 두 자식의 _max 중 가장 큰 값으로 다시 계산한다.
+
+    :param node: _max를 다시 계산할 노드
+    """
+    def _update(self, node):
+        high = node._element[1]
+        left = node._left
+        right = node._right
+        if left is not None and high < left._max:
+            high = left._max
+        if right is not None and high < right._max:
+            high = right._max
+        node._max = high
+
+    """
+    _augmentation_error(self, node)는 validate에서 node의 _max가 subtree의 가장 큰 high와 같은지 검사한다.
+
+    :param node: 검사할 노드
+    :return: 다르면 설명 문자열, 같으면 None
+    """
+    def _augmentation_error(self, node):
+        high = node._element[1]
+        for child in (node._left, node._right):
+            if child is not None and high < child._max:
+                high = child._max
+        if node._max != high:
+            return f'_max is {node._max!r} but the largest high endpoint of the subtree is {high!r}'
+        return None
+
+    """
+    insert(self, interval)는 구간 하나를 넣는다. 같은 구간을 여러번 넣을 수 있다.
+
+    :param interval: (low, high) 구간, low <= high이어야 한다.
+    :raises ValueError: low가 high보다 큰 경우
+    """
+    def insert(self, interval):
+        self._insert_node(self._new_node(interval))
+
+    """
+    _new_node(self, interval)는 구간을 (low, high) tuple로 바꾸어 노드를 만든다. insert뿐 아니라 RedBlackTree의 update(많은 구간을 한번에 넣어 트리를 다시 만드는 경우 포함), from_sorted, from_iterable, load도 모두 이 함수로 노드를 만드므로 low <= high 검사를 여기에서 한번에 한다. update의 rebuild 경로에서는 모든 노드를 만든 뒤에 트리를 바꾸므로 잘못된 구간이 있으면 트리는 그대로 남는다.
+
+    :param interval: (low, high) 구간
+    :return: 새 노드
+    :raises ValueError: low가 high보다 큰 경우
+    """
+    def _new_node(self, interval):
+        low, high = interval
+        if high < low:
+            raise ValueError('interval low must not be greater than high')
+        return self._Node((low, high))
+
+    """
+    overlap(self, low, high)는 닫힌 구간 [low, high]와 겹치는(끝점만 닿는 경우 포함) 구간들을 정렬 순서대로 yield한다. 재귀 대신 stack으로 in-order 순회를 하면서 위에서 설명한 두 가지 경우의 subtree를 건너뛴다.
+
+    :param low: 찾는 구간의 시작
+    :param high: 찾는 구간의 끝
+    :yield: 겹치는 (low, high) 구간들
+    """
+    def overlap(self, low, high):
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            # 왼쪽으로 내려가되 _max가 low보다 작은 subtree에는 들어가지 않는다.
+            while node is not None and not node._max < low:
+                stack.append(node)
+                node = node._left
+            if not stack:
+                return
+            node = stack.pop()
+            start, end = node._element
+            if high < start:
+                # 이 노드와 오른쪽의 모든 구간, 그리고 stack에 남은 조상들은 high보다 뒤에서 시작한다.
+                return
+            if not end < low:
+                yield node._element
+            node = node._right
+
+    """
+    stab(self, point)는 point를 포함하는 구간들을 정렬 순서대로 yield한다.
+
+    :param point: 찾는 점
+    :yield: point를 포함하는 (low, high) 구간들
+    """
+    def stab(self, point):
+        return self.overlap(point, point)
+
+    """
+    overlaps_any(self, low, high)는 [low, high]와 겹치는 구간이 하나라도 있는지를 root에서 한번 내려가서 O(log n)에 반환한다. 왼쪽 subtree의 _max가 low 이상이면 겹치는 구간이 있다면 왼쪽에도 반드시 있으므로 왼쪽으로, 아니면 오른쪽으로 내려간다.
+
+    :return: 겹치는 구간이 있으면 True
+    """
+    def overlaps_any(self, low, high):
+        node = self._root
+        while node is not None:
+            start, end = node._element
+            if not end < low and not high < start:
+                return True
+            left = node._left
+            if left is not None and not left._max < low:
+                node = left
+            else:
+                node = node._right
+        return False
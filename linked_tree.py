@@ -170,7 +170,7 @@ class LinkedTree(Tree):
     
     #-------------------------- nonpublic mutators --------------------------
     """
-    _add_root(self,e) 메소드는 empty tree의 루트 자리에 element e를 가진 노드를 넣고 그 position을 반환한다. 이때, self._make_position(node)를 사용하여 node의 position을 알아내는 방안을 사용한다. tree가 empty하지 않다면, 즉 그 tree의 size가 0이 아니라면 'Root exists'라는 message와 함께 ValueError를 raise한다.
+    _add_root(self,e) 메소드는 empty tree의 루트 자리에 element e를 가진 노드를 넣고 그 position을 반환한다. self._root에는 다른 노드들과 마찬가지로 노드 자체를 저장하고, 반환할 때 self._make_position(node)를 사용하여 node의 position을 알아내는 방안을 사용한다. tree가 empty하지 않다면, 즉 그 tree의 size가 0이 아니라면 'Root exists'라는 message와 함께 ValueError를 raise한다.
     
     :param e: tree의 root자리에 넣을 노드의 element
     :return: 새롭게 add된 root의 position 객체를 반환한다.
@@ -179,11 +179,9 @@ class LinkedTree(Tree):
     def _add_root(self, e):
         if self._size != 0:
             raise ValueError("Root exists")
-        root = self._make_position(self._Node(e))
-        self._root = root
+        self._root = self._Node(e)
         self._size = 1
-        go = self.root()
-        return go
+        return self._make_position(self._root)
 
     """
     _add_child(self, p, e)는 position p에 위치한 노드를 self._validate(p)를 통해 얻고 이를 pr, 즉 부모로 지정한 다음 child로 add하고 싶은 노드를 self._Node(e)로 만들고 ch._parent = pr을 통해 이 노드의 부모를 pr로 설정해준다. 그리고 나서 pr의 children list에 ch를 append 해주고 이에 따라 tree의 size가 늘어나는 것을 반영해주면 p position 노드에 element e를 갖는 child를 add하는 역할을 수행할 수 있다. 마지막에는 추가한 child의 position을 self._make_position으로 반환해준다.
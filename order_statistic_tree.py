@@ -0,0 +1,132 @@
+from redblack_tree import RedBlackTree
+
+"""
+Class OrderStatisticTree(RedBlackTree)는 RedBlackTree를 상속받아 각 노드에 그 노드를 root로 하는 subtree의 노드 수(_count)를 함께 저장하는 red-black tree이다. 노드 수가 저장되어 있으므로 트리 전체를 훑지 않고도 root에서 한번 내려가는 것만으로 어떤 element의 순위(rank)나 i번째 element(select)를 O(log n)에 구할 수 있다.
+_count는 RedBlackTree에서 제공하는 _update hook을 통해 유지된다. _rotate는 자리가 바뀐 두 노드의 _count를, insert와 delete는 구조가 바뀐 위치부터 root까지의 _count를 다시 계산한다.
+
+:param RedBlackTree: 상위 클래스인 RedBlackTree를 가리킨다.
+"""
+class OrderStatisticTree(RedBlackTree):
+    """Red-black tree whose nodes also store the size of their subtree."""
+
+    #-------------------------- nested _Node class --------------------------
+    class _Node(RedBlackTree._Node):
+        """Red-black tree node that also stores the size of its subtree."""
+        __slots__ = '_count',
+
+        def __init__(self, element, parent=None, left=None, right=None, color=RedBlackTree._Node.RED):
+            super().__init__(element, parent, left, right, color)
+            self._count = 1
+
+    _augmented = True
+
+    """
+    _update(self, node)는 node의 _count를 두 자식의 _count와 자기 자신(1)을 더한 값으로 다시 계산한다.
+
+    :param node: _count를 다시 계산할 노드
+    """
+    def _update(self, node):
+        count = 1
+        if node._left is not None:
+            count += node._left._count
+        if node._right is not None:
+            count += node._right._count
+        node._count = count
+
+    """
+    _augmentation_error(self, node)는 validate에서 node의 _count가 두 자식의 _count와 1을 더한 값과 같은지 검사한다.
+
+    :param node: 검사할 노드
+    :return: 다르면 설명 문자열, 같으면 None
+    """
+    def _augmentation_error(self, node):
+        count = 1
+        if node._left is not None:
+            count += node._left._count
+        if node._right is not None:
+            count += node._right._count
+        if node._count != count:
+            return f'_count is {node._count} but the subtree has {count} nodes'
+        return None
+
+    """
+    rank(self, key)는 트리 안에서 key보다 작은 element의 개수를 반환한다. root에서 내려가면서 오른쪽으로 갈 때마다 왼쪽 subtree의 노드 수와 현재 노드(1)를 더해준다.
+
+    :param key: 순위를 알고 싶은 key
+    :return: key보다 작은 element의 개수
+    """
+    def rank(self, key):
+        node = self._root
+        result = 0
+        while node is not None:
+            if node._element < key:
+                result += 1
+                if node._left is not None:
+                    result += node._left._count
+                node = node._right
+            else:
+                node = node._left
+        return result
+
+    """
+    _select_node(self, i)는 오름차순으로 i번째(0부터 시작) element를 가진 노드를 반환한다. 왼쪽 subtree의 노드 수와 i를 비교하여 왼쪽으로 갈지, 현재 노드가 답인지, 오른쪽으로 갈지를 정한다.
+
+    :param i: 0 이상 len(self) 미만의 index
+    :return: i번째 노드
+    """
+    def _select_node(self, i):
+        node = self._root
+        while True:
+            left_count = 0 if node._left is None else node._left._count
+            if i < left_count:
+                node = node._left
+            elif i == left_count:
+                return node
+            else:
+                i -= left_count + 1
+                node = node._right
+
+    """
+    select(self, i)는 오름차순으로 i번째(0부터 시작) element를 반환한다. list처럼 음수 index도 사용할 수 있다.
+
+    :param i: 가져오고 싶은 element의 index
+    :return: i번째 element
+    :raises IndexError: index가 범위를 벗어난 경우
+    """
+    def select(self, i):
+        if i < 0:
+            i += self._size
+        if i < 0 or i >= self._size:
+            raise IndexError('index out of range')
+        return self._item_of(self._select_node(i))
+
+    """
+    __getitem__(self, index)는 tree[i]와 tree[i:j] 문법을 지원한다. 정수 index는 select로 처리한다. slice는 시작 위치만 _select_node로 O(log n)에 찾고, step이 1이라면 그 뒤로는 _next_node로 이웃 노드를 따라가므로 k개를 가져오는 비용은 O(log n + k)이다. step이 1이 아닌 경우에는 각 index마다 select를 한다.
+
+    :param index: 정수 index 또는 slice 객체
+    :return: index에 해당하는 element, slice라면 element들의 리스트
+    :raises IndexError: 정수 index가 범위를 벗어난 경우
+    """
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(*index.indices(self._size))
+            if len(indices) == 0:
+                return []
+            if indices.step != 1:
+                return [self._item_of(self._select_node(i)) for i in indices]
+            result = []
+            node = self._select_node(indices.start)
+            for _ in indices:
+                result.append(self._item_of(node))
+                node = self._next_node(node)
+            return result
+        return self.select(index)
+
+    """
+    _subtree_size(self, node)와 _split_sizes(self, left, right, total)는 각 노드에 저장된 _count를 사용하여 순회 없이 O(1)에 subtree의 크기를 반환한다. split과 delete_range에서 사용된다.
+    """
+    def _subtree_size(self, node):
+        return 0 if node is None else node._count
+
+    def _split_sizes(self, left, right, total):
+        return self._subtree_size(left), self._subtree_size(right)
@@ -0,0 +1,450 @@
+"""
+persistent_redblack_tree 모듈은 snapshot을 O(1)에 만들 수 있는 persistent(copy-on-write) red-black tree를 제공한다.
+RedBlackTree는 insert/delete를 할 때 _rotate와 recoloring으로 노드를 그 자리에서 바꾸기 때문에, 다른 thread가 트리를 순회하는 도중에 쓰기가 일어나면 순회가 엉뚱한 노드로 넘어갈 수 있다. PersistentRedBlackTree는 snapshot을 만든 뒤에는 그 snapshot에서 보이는 노드를 절대 바꾸지 않고, 쓰기가 바꾸어야 하는 root부터의 경로(O(log n)개의 노드)만 복사한 뒤 복사본을 바꾼다(path copying). 그래서 snapshot을 가진 reader는 lock 없이 일관된 버전의 트리를 훑을 수 있고, writer도 reader를 기다리지 않는다.
+노드에는 _parent가 없다. parent link가 있으면 경로 하나만 복사할 수 없기 때문이다(자식의 _parent도 모두 바꾸어야 한다). 대신 insert와 delete는 내려온 경로를 list(path)에 저장해두고 이를 parent 대신 사용한다. 순회도 _parent 대신 명시적인 stack을 사용하므로 O(log n)의 추가 메모리가 필요하다.
+"""
+
+"""
+Class RedBlackSnapshot은 PersistentRedBlackTree의 한 버전을 읽기 전용으로 보여주는 객체이다. root 노드와 element 개수만 가지고 있고, search, in, 순회(iter, reversed, irange) 등 읽기 함수만 제공한다. snapshot에서 보이는 노드들은 더 이상 바뀌지 않으므로 여러 thread에서 동시에 읽어도 안전하다.
+PersistentRedBlackTree도 같은 읽기 함수들을 사용하기 위해 이 클래스를 상속받는다.
+
+:param root: 이 버전의 root 노드
+:param size: 이 버전의 element 개수
+"""
+class RedBlackSnapshot:
+    """Read-only view of one version of a persistent red-black tree."""
+
+    #-------------------------- nested _Node class --------------------------
+    class _Node:
+        """Red-black tree node without a parent link, owned by one edit epoch."""
+        RED = object()
+        BLACK = object()
+        __slots__ = '_element', '_left', '_right', '_color', '_edit'
+
+        def __init__(self, element, left=None, right=None, color=RED, edit=None):
+            self._element = element
+            self._left = left
+            self._right = right
+            self._color = color
+            self._edit = edit    # 이 노드를 만든 쓰기 epoch, 현재 epoch와 같을 때만 제자리에서 바꿀 수 있다.
+
+    def __init__(self, root=None, size=0):
+        """Constructor should not be invoked by user."""
+        self._root = root
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    """
+    search(self, element)는 element를 가진 노드를 찾아 그 element를 반환하고, 없으면 None을 반환한다.
+
+    :param element: 찾고자 하는 element
+    :return: 찾은 element 또는 None
+    """
+    def search(self, element):
+        node = self._find_node(element)
+        if node is None:
+            return None
+        return node._element
+
+    def __contains__(self, element):
+        return self._find_node(element) is not None
+
+    """
+    _find_node(self, element)는 root에서부터 반복문으로 내려가며 element를 가진 노드를 찾는다. RedBlackTree._find_node와 같이 level마다 < 비교를 두 번만 한다.
+
+    :param element: 찾고자 하는 노드의 element
+    :return: 찾은 노드 또는 None
+    """
+    def _find_node(self, element):
+        node = self._root
+        while node is not None:
+            current = node._element
+            if element < current:
+                node = node._left
+            elif current < element:
+                node = node._right
+            else:
+                return node
+        return None
+
+    def __iter__(self):
+        return self.irange()
+
+    def __reversed__(self):
+        return self.irange(reverse=True)
+
+    """
+    irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False)는 RedBlackTree.irange와 같이 lo와 hi 사이의 element들을 정렬 순서대로 yield한다. 노드에 _parent가 없으므로 시작 위치까지 내려오면서 아직 방문하지 않은 조상들을 stack에 쌓아두고, 한 노드를 yield한 뒤에는 그 오른쪽(reverse라면 왼쪽) subtree의 가장 왼쪽 경로를 stack에 쌓는다. 비용은 O(log n + k)이고 추가 메모리는 O(log n)이다.
+    generator가 처음 시작될 때의 root를 잡아두므로 snapshot에서는 항상 같은 버전을 훑게 된다.
+
+    :param lo: 범위의 하한, None이면 하한이 없다.
+    :param hi: 범위의 상한, None이면 상한이 없다.
+    :param inclusive: (하한 포함 여부, 상한 포함 여부)
+    :param reverse: True이면 내림차순으로 yield한다.
+    :yield: 범위 안에 있는 element들을 yield한다.
+    """
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        lo_inclusive, hi_inclusive = inclusive
+        stack = []
+        node = self._root
+        if not reverse:
+            while node is not None:
+                current = node._element
+                if lo is not None and (current < lo or (not lo_inclusive and not lo < current)):
+                    node = node._right
+                else:
+                    stack.append(node)
+                    node = node._left
+            while stack:
+                node = stack.pop()
+                current = node._element
+                if hi is not None and (hi < current or (not hi_inclusive and not current < hi)):
+                    return
+                yield current
+                node = node._right
+                while node is not None:
+                    stack.append(node)
+                    node = node._left
+        else:
+            while node is not None:
+                current = node._element
+                if hi is not None and (hi < current or (not hi_inclusive and not current < hi)):
+                    node = node._left
+                else:
+                    stack.append(node)
+                    node = node._right
+            while stack:
+                node = stack.pop()
+                current = node._element
+                if lo is not None and (current < lo or (not lo_inclusive and not lo < current)):
+                    return
+                yield current
+                node = node._left
+                while node is not None:
+                    stack.append(node)
+                    node = node._right
+
+    def inorder_traverse(self):
+        return list(self.irange())
+
+    """
+    check_tree_property_silent(self)는 BST 성질, root black, double red, black height를 명시적인 stack을 사용한 한번의 post-order 순회로 검사한다. 노드에 _parent가 없으므로 parent-child link는 검사하지 않는다.
+
+    :return: red-black tree의 성질을 모두 만족하면 True, 아니면 False
+    """
+    def check_tree_property_silent(self):
+        RED = self._Node.RED
+        if self._root is None:
+            return True
+        if self._root._color is RED:
+            return False
+        heights = []
+        stack = [(self._root, False)]
+        while stack:
+            node, visited = stack.pop()
+            left, right = node._left, node._right
+            if not visited:
+                stack.append((node, True))
+                if right is not None:
+                    stack.append((right, False))
+                if left is not None:
+                    stack.append((left, False))
+                continue
+            # 자식들의 black height은 왼쪽, 오른쪽 순서로 heights에 쌓여 있다.
+            right_height = heights.pop() if right is not None else 1
+            left_height = heights.pop() if left is not None else 1
+            if left is not None and node._element < left._element:
+                return False
+            if right is not None and right._element < node._element:
+                return False
+            if node._color is RED and ((left is not None and left._color is RED) or (right is not None and right._color is RED)):
+                return False
+            if left_height != right_height:
+                return False
+            heights.append(left_height + (0 if node._color is RED else 1))
+        return True
+
+
+"""
+Class PersistentRedBlackTree(RedBlackSnapshot)는 path copying으로 snapshot을 지원하는 red-black tree이다.
+각 노드는 자신을 만든 쓰기 epoch(_edit)를 기억한다. snapshot()을 호출하면 트리의 _edit을 새 객체로 바꾸므로 그 전에 만들어진 노드들은 모두 얼어붙은(frozen) 노드가 된다. 그 뒤의 insert/delete는 바꾸어야 하는 노드가 frozen이면 복사본을 만들어 바꾸고(_writable), 현재 epoch의 노드라면 그 자리에서 바꾼다. 그래서 snapshot을 만들지 않고 쓰기만 하는 동안에는 RedBlackTree처럼 노드를 복사하지 않으며, snapshot 직후의 쓰기만 O(log n)개의 노드를 복사한다.
+insert와 delete의 double red, double black 처리는 ArrayRedBlackTree와 같은 방식이며, 처리 도중 색이나 자식을 바꾸어야 하는 uncle, sibling, nephew 노드도 바꾸기 전에 _writable로 복사한다.
+쓰기는 한 thread(또는 외부 lock으로 순서가 정해진 writer들)에서만 해야 한다. 다른 thread의 reader는 snapshot()으로 받은 RedBlackSnapshot만 읽어야 하며, 트리 자체를 쓰기와 동시에 순회하는 것은 RedBlackTree와 마찬가지로 보장되지 않는다.
+
+:param RedBlackSnapshot: 읽기 함수들을 제공하는 상위 클래스
+"""
+class PersistentRedBlackTree(RedBlackSnapshot):
+    """Red-black tree with O(1) immutable snapshots via path copying."""
+
+    def __init__(self):
+        """Create an initially empty tree."""
+        super().__init__()
+        self._edit = object()
+        self._snapshot = None
+
+    """
+    snapshot(self)는 현재 버전의 트리를 읽기 전용 RedBlackSnapshot으로 반환한다. root와 size만 복사하므로 O(1)이다. _edit을 새 객체로 바꾸어 지금까지의 노드들을 frozen으로 만들고, 이후의 쓰기는 그 노드들 대신 복사본을 바꾼다. 마지막 snapshot 이후 쓰기가 없었다면 같은 snapshot 객체를 다시 반환하므로 epoch도 바뀌지 않는다.
+
+    :return: 현재 버전의 RedBlackSnapshot
+    """
+    def snapshot(self):
+        if self._snapshot is None:
+            self._edit = object()
+            self._snapshot = RedBlackSnapshot(self._root, self._size)
+        return self._snapshot
+
+    """
+    _writable(self, node)는 node가 현재 epoch에 만들어진 노드라면 그대로, frozen 노드라면 같은 내용을 가진 현재 epoch의 복사본을 반환한다. 복사본을 부모에 연결하는 것은 호출한 쪽에서 한다.
+
+    :param node: 바꾸고자 하는 노드
+    :return: 제자리에서 바꾸어도 되는 노드
+    """
+    def _writable(self, node):
+        if node._edit is self._edit:
+            return node
+        return self._Node(node._element, node._left, node._right, node._color, self._edit)
+
+    """
+    _copy_path(self, path)는 root부터 내려온 경로의 노드들을 _writable로 바꾸고, 새로 복사된 노드는 복사된 부모(또는 self._root)에 다시 연결한다. path의 각 자리도 복사본으로 바꾸어준다. 이 작업 뒤로는 path의 노드들을 제자리에서 바꾸어도 snapshot에는 영향이 없다.
+
+    :param path: root부터 차례로 내려온 노드들의 list
+    """
+    def _copy_path(self, path):
+        parent = None
+        for i, node in enumerate(path):
+            copied = self._writable(node)
+            if copied is not node:
+                self._replace_child(parent, node, copied)
+                path[i] = copied
+            parent = copied
+
+    """
+    _replace_child(self, parent, old, new)는 parent의 자식 자리 중 old가 있던 자리에 new를 연결한다. parent가 None이면 old는 root였던 것이므로 self._root를 new로 바꾼다.
+
+    :param parent: old의 부모 노드 또는 None
+    :param old: 원래 자식 노드
+    :param new: old 자리에 들어갈 노드 (None일 수 있다.)
+    """
+    def _replace_child(self, parent, old, new):
+        if parent is None:
+            self._root = new
+        elif parent._left is old:
+            parent._left = new
+        else:
+            parent._right = new
+
+    """
+    _rotate_left(self, node)와 _rotate_right(self, node)는 node를 root로 하는 subtree를 왼쪽/오른쪽으로 회전시키고 새로 subtree의 root가 된 노드를 반환한다. node와 위로 올라오는 자식은 이미 현재 epoch의 노드여야 하며, 반환된 노드를 node의 부모에 연결하는 것은 호출한 쪽에서 한다.
+
+    :param node: 회전시킬 subtree의 root
+    :return: 회전 후 subtree의 root
+    """
+    def _rotate_left(self, node):
+        child = node._right
+        node._right = child._left
+        child._left = node
+        return child
+
+    def _rotate_right(self, node):
+        child = node._left
+        node._left = child._right
+        child._right = node
+        return child
+
+    def _is_black(self, node):
+        return node is None or node._color is self._Node.BLACK
+
+    """
+    insert(self, element)는 element를 가진 red 노드를 leaf 자리에 넣는다. RedBlackTree와 같이 같은 element는 오른쪽으로 보낸다. 먼저 내려온 경로를 path에 모은 뒤 _copy_path로 복사하고, 새 노드를 연결한 다음 path를 parent 대신 사용하여 double red를 처리한다. uncle이 red인 경우 uncle의 색을 바꾸어야 하므로 uncle도 복사한다.
+
+    :param element: 넣고자 하는 element
+    """
+    def insert(self, element):
+        RED, BLACK = self._Node.RED, self._Node.BLACK
+        path = []
+        node = self._root
+        go_left = False
+        while node is not None:
+            path.append(node)
+            go_left = element < node._element
+            node = node._left if go_left else node._right
+        self._snapshot = None
+        self._copy_path(path)
+        node = self._Node(element, edit=self._edit)
+        self._size += 1
+        if not path:
+            node._color = BLACK
+            self._root = node
+            return
+        if go_left:
+            path[-1]._left = node
+        else:
+            path[-1]._right = node
+
+        # double red 처리: path[-1]이 node의 부모이다.
+        while path and path[-1]._color is RED:
+            parent = path.pop()
+            grand = path[-1]            # 부모가 red이면 root가 아니므로 grandparent가 있다.
+            if grand._left is parent:
+                uncle = grand._right
+                if uncle is not None and uncle._color is RED:
+                    uncle = self._writable(uncle)
+                    grand._right = uncle
+                    parent._color = uncle._color = BLACK
+                    grand._color = RED
+                    node = path.pop()
+                    continue
+                if parent._right is node:
+                    grand._left = self._rotate_left(parent)
+                    parent = node
+                path.pop()
+                parent._color = BLACK
+                grand._color = RED
+                self._replace_child(path[-1] if path else None, grand, self._rotate_right(grand))
+            else:
+                uncle = grand._left
+                if uncle is not None and uncle._color is RED:
+                    uncle = self._writable(uncle)
+                    grand._left = uncle
+                    parent._color = uncle._color = BLACK
+                    grand._color = RED
+                    node = path.pop()
+                    continue
+                if parent._left is node:
+                    grand._right = self._rotate_right(parent)
+                    parent = node
+                path.pop()
+                parent._color = BLACK
+                grand._color = RED
+                self._replace_child(path[-1] if path else None, grand, self._rotate_left(grand))
+            break
+        self._root._color = BLACK
+
+    """
+    delete(self, element)는 element를 가진 노드를 지우고 그 element를 반환한다. element가 없으면 아무것도 복사하지 않고 None을 반환한다.
+    자식이 둘인 노드를 지우는 경우에는 successor까지의 경로를 함께 복사한 뒤 successor의 element를 target 자리로 옮기고 successor를 지운다. 실제로 빠지는 노드는 자식이 하나 이하이며, 그 노드가 black이고 자식이 red라면 자식을 black으로 바꾸면 되고, 자식이 없다면 그 자리에서 double black을 처리한다.
+
+    :param element: 지우고자 하는 element
+    :return: 지운 element 또는 None
+    """
+    def delete(self, element):
+        path = []
+        node = self._root
+        while node is not None:
+            current = node._element
+            if element < current:
+                path.append(node)
+                node = node._left
+            elif current < element:
+                path.append(node)
+                node = node._right
+            else:
+                break
+        if node is None:
+            return None
+        removed = node._element
+        path.append(node)
+        target_index = len(path) - 1
+        if node._left is not None and node._right is not None:
+            node = node._right
+            while node is not None:
+                path.append(node)
+                node = node._left
+        self._snapshot = None
+        self._copy_path(path)
+
+        node = path.pop()
+        if target_index < len(path):
+            path[target_index]._element = node._element
+        child = node._left if node._left is not None else node._right
+        parent = path[-1] if path else None
+        is_left = parent is not None and parent._left is node
+        if child is not None:
+            child = self._writable(child)
+        self._replace_child(parent, node, child)
+        self._size -= 1
+        if node._color is self._Node.BLACK:
+            if child is not None:
+                child._color = self._Node.BLACK     # 자식이 하나뿐인 black 노드의 자식은 항상 red이다.
+            elif path:
+                self._process_double_black(path, is_left)
+        return removed
+
+    """
+    _process_double_black(self, path, is_left)는 path[-1]의 왼쪽(is_left가 True) 또는 오른쪽 자리에 생긴 double black을 처리한다. 형제가 red인 경우 회전으로 형제를 black으로 만들고, 형제의 자식이 모두 black이면 형제를 red로 바꾸고 부모 자리로 올라가며, 형제에게 red 자식이 있으면 한번 또는 두번 회전하여 마무리한다. 색을 바꾸거나 회전에 쓰이는 형제와 조카 노드는 바꾸기 전에 _writable로 복사한다.
+
+    :param path: root부터 double black이 생긴 자리의 부모까지의 (복사된) 노드들
+    :param is_left: double black이 부모의 왼쪽 자리인지 여부
+    """
+    def _process_double_black(self, path, is_left):
+        RED, BLACK = self._Node.RED, self._Node.BLACK
+        while path:
+            parent = path[-1]
+            grand = path[-2] if len(path) > 1 else None
+            if is_left:
+                sibling = self._writable(parent._right)
+                parent._right = sibling
+                if sibling._color is RED:
+                    sibling._color = BLACK
+                    parent._color = RED
+                    self._replace_child(grand, parent, self._rotate_left(parent))
+                    path.insert(len(path) - 1, sibling)
+                    grand = sibling
+                    sibling = self._writable(parent._right)
+                    parent._right = sibling
+                if self._is_black(sibling._left) and self._is_black(sibling._right):
+                    sibling._color = RED
+                    node = path.pop()
+                    if node._color is RED:
+                        node._color = BLACK
+                        return
+                    is_left = bool(path) and path[-1]._left is node
+                    continue
+                if self._is_black(sibling._right):
+                    nephew = self._writable(sibling._left)
+                    sibling._left = nephew
+                    nephew._color = BLACK
+                    sibling._color = RED
+                    sibling = self._rotate_right(sibling)
+                    parent._right = sibling
+                nephew = self._writable(sibling._right)
+                sibling._right = nephew
+                nephew._color = BLACK
+                sibling._color = parent._color
+                parent._color = BLACK
+                self._replace_child(grand, parent, self._rotate_left(parent))
+            else:
+                sibling = self._writable(parent._left)
+                parent._left = sibling
+                if sibling._color is RED:
+                    sibling._color = BLACK
+                    parent._color = RED
+                    self._replace_child(grand, parent, self._rotate_right(parent))
+                    path.insert(len(path) - 1, sibling)
+                    grand = sibling
+                    sibling = self._writable(parent._left)
+                    parent._left = sibling
+                if self._is_black(sibling._left) and self._is_black(sibling._right):
+                    sibling._color = RED
+                    node = path.pop()
+                    if node._color is RED:
+                        node._color = BLACK
+                        return
+                    is_left = bool(path) and path[-1]._left is node
+                    continue
+                if self._is_black(sibling._left):
+                    nephew = self._writable(sibling._right)
+                    sibling._right = nephew
+                    nephew._color = BLACK
+                    sibling._color = RED
+                    sibling = self._rotate_left(sibling)
+                    parent._left = sibling
+                nephew = self._writable(sibling._left)
+                sibling._left = nephew
+                nephew._color = BLACK
+                sibling._color = parent._color
+                parent._color = BLACK
+                self._replace_child(grand, parent, self._rotate_right(parent))
+            return
@@ -0,0 +1,185 @@
+from redblack_tree import RedBlackTree
+
+"""
+Class RedBlackMap(RedBlackTree)는 RedBlackTree를 상속받아 key와 value를 함께 저장하는 정렬된 map이다. 노드의 _element 자리에는 key를 저장하고, 노드에 추가된 _value 자리에 value를 저장한다. key와 value를 tuple 같은 객체로 묶어서 element로 넣지 않아도 되므로 노드마다 객체를 하나씩 덜 만들게 되고, 비교도 key끼리만 이루어진다.
+이미 있는 key에 대해 value를 바꾸는 경우에는 노드의 _value만 바꾸어주므로 트리의 구조나 색상은 전혀 바뀌지 않는다. 순회(iter, irange, cursor 등)는 RedBlackTree와 같이 key들을 정렬 순서대로 돌려준다.
+
+:param RedBlackTree: 상위 클래스인 RedBlackTree를 가리킨다.
+"""
+class RedBlackMap(RedBlackTree):
+    """Sorted mapping implemented as a red-black tree of keys with values."""
+
+    #-------------------------- nested _Node class --------------------------
+    class _Node(RedBlackTree._Node):
+        """Red-black tree node that also stores the value of its key."""
+        __slots__ = '_value',
+
+        def __init__(self, element, parent=None, left=None, right=None, color=RedBlackTree._Node.RED, value=None):
+            super().__init__(element, parent, left, right, color)
+            self._value = value
+
+    # get, pop에서 default 값이 주어지지 않았음을 표시하기 위한 객체
+    _MISSING = object()
+
+    """
+    __init__(self)는 빈 map을 만든다. map은 key를 노드의 _element에 직접 저장하므로 RedBlackTree의 key 함수는 사용하지 않는다.
+    """
+    def __init__(self):
+        """Create an initially empty map."""
+        super().__init__()
+
+    """
+    _copy_element(self, dst, src)는 delete에서 successor의 key를 target으로 옮길 때 value도 함께 옮겨준다.
+
+    :param dst: key와 value를 받을 노드
+    :param src: key와 value를 줄 노드
+    """
+    def _copy_element(self, dst, src):
+        dst._element = src._element
+        dst._value = src._value
+
+    """
+    __getitem__(self, key)는 map[key] 문법을 지원하며 key에 해당하는 value를 반환한다.
+
+    :param key: 찾고자 하는 key
+    :return: key에 해당하는 value
+    :raises KeyError: key가 map에 없는 경우
+    """
+    def __getitem__(self, key):
+        node = self._find_node(key)
+        if node is None:
+            raise KeyError(key)
+        return node._value
+
+    """
+    __setitem__(self, key, value)는 map[key] = value 문법을 지원한다. key가 이미 있다면 그 노드의 value만 바꾸고(rebalancing 없음), 없다면 key와 value를 가진 노드를 새로 만들어 트리에 넣는다.
+
+    :param key: 저장할 key
+    :param value: key에 저장할 value
+    """
+    def __setitem__(self, key, value):
+        node = self._find_node(key)
+        if node is not None:
+            node._value = value
+        else:
+            self._insert_node(self._Node(key, value=value))
+
+    """
+    insert(self, key, value=None)는 map[key] = value와 같다. RedBlackTree.insert를 그대로 사용하면 이미 있는 key도 새 노드로 한번 더 들어가 key가 중복되므로 __setitem__을 거치도록 override한다. (key, value) 쌍들을 한번에 넣을 때는 update를 사용한다.
+
+    :param key: 저장할 key
+    :param value: key에 저장할 value
+    """
+    def insert(self, key, value=None):
+        self[key] = value
+
+    """
+    __delitem__(self, key)는 del map[key] 문법을 지원하며 key와 그 value를 map에서 지운다.
+
+    :param key: 지우고자 하는 key
+    :raises KeyError: key가 map에 없는 경우
+    """
+    def __delitem__(self, key):
+        node = self._find_node(key)
+        if node is None:
+            raise KeyError(key)
+        self._delete_node(node)
+
+    """
+    __contains__(self, key)는 key in map 문법을 지원한다.
+
+    :param key: 확인하고자 하는 key
+    :return: key가 map에 있으면 True, 없으면 False
+    """
+    def __contains__(self, key):
+        return self._find_node(key) is not None
+
+    """
+    get(self, key, default=None)은 key에 해당하는 value를 반환하고, key가 없다면 default를 반환한다.
+
+    :param key: 찾고자 하는 key
+    :param default: key가 없을 때 반환할 값
+    :return: key에 해당하는 value 또는 default
+    """
+    def get(self, key, default=None):
+        node = self._find_node(key)
+        if node is None:
+            return default
+        return node._value
+
+    """
+    setdefault(self, key, default=None)는 key가 있다면 그 value를 반환하고, 없다면 key에 default를 저장한 뒤 default를 반환한다.
+
+    :param key: 찾고자 하는 key
+    :param default: key가 없을 때 저장하고 반환할 값
+    :return: key에 해당하는 value 또는 새로 저장된 default
+    """
+    def setdefault(self, key, default=None):
+        node = self._find_node(key)
+        if node is not None:
+            return node._value
+        self._insert_node(self._Node(key, value=default))
+        return default
+
+    """
+    pop(self, key, default)는 key를 map에서 지우고 그 value를 반환한다. key가 없는 경우 default가 주어졌다면 default를 반환하고, 주어지지 않았다면 KeyError를 raise한다.
+
+    :param key: 지우고자 하는 key
+    :param default: key가 없을 때 반환할 값 (선택)
+    :return: 지워진 key의 value 또는 default
+    :raises KeyError: key가 없고 default도 주어지지 않은 경우
+    """
+    def pop(self, key, default=_MISSING):
+        node = self._find_node(key)
+        if node is None:
+            if default is self._MISSING:
+                raise KeyError(key)
+            return default
+        value = node._value
+        self._delete_node(node)
+        return value
+
+    """
+    pop_min(self)와 pop_max(self)는 가장 작은/큰 key를 map에서 지우고 dict.popitem처럼 (key, value) tuple을 반환한다. RedBlackTree의 pop_min/pop_max는 key만 반환하여 value를 잃어버리므로 override한다. map이 비어있으면 None을 반환한다.
+
+    :return: 지워진 (key, value) tuple, map이 비어있다면 None
+    """
+    def pop_min(self):
+        return None if self._root is None else self._pop_item(self._first(self._root))
+
+    def pop_max(self):
+        return None if self._root is None else self._pop_item(self._last(self._root))
+
+    def _pop_item(self, node):
+        # _delete_node는 node에 successor의 key와 value를 복사할 수 있으므로 지우기 전에 꺼내둔다.
+        key, value = node._element, node._value
+        self._delete_node(node)
+        return key, value
+
+    """
+    keys(self), values(self), items(self)는 각각 key, value, (key, value) tuple을 key의 오름차순으로 yield한다.
+
+    :yield: key, value 또는 (key, value)를 key의 오름차순으로 yield한다.
+    """
+    def keys(self):
+        for node in self._iter_nodes(self._root):
+            yield node._element
+
+    def values(self):
+        for node in self._iter_nodes(self._root):
+            yield node._value
+
+    def items(self):
+        for node in self._iter_nodes(self._root):
+            yield node._element, node._value
+
+    """
+    update(self, other)는 dict.update처럼 other의 (key, value) 쌍들을 map에 저장한다. other는 items()를 가진 mapping이거나 (key, value) 쌍의 iterable이다. 이미 있는 key는 value만 바뀐다.
+
+    :param other: mapping 또는 (key, value) 쌍의 iterable
+    """
+    def update(self, other):
+        if hasattr(other, 'items'):
+            other = other.items()
+        for key, value in other:
+            self[key] = value
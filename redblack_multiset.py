@@ -0,0 +1,255 @@
+from redblack_tree import RedBlackTree
+
+"""
+Class RedBlackMultiset(RedBlackTree)는 같은 element를 여러번 넣을 수 있는 정렬된 multiset이다. RedBlackTree는 같은 element를 넣으면 오른쪽 subtree에 별도의 노드로 넣기 때문에, 같은 값이 아주 많이 반복되는 경우(timestamp, status code 등) 노드 수만큼 메모리를 쓰고 트리도 그만큼 높아진다. RedBlackMultiset은 서로 다른 element마다 노드를 하나만 두고, 노드에 추가된 _multiplicity 자리에 그 element가 몇 번 들어있는지를 저장한다.
+이미 있는 element를 넣거나 여러 개 중 하나를 지우는 경우에는 노드의 _multiplicity만 바꾸므로 트리의 구조나 색상은 전혀 바뀌지 않는다. 새로운 element를 넣는 경우에는 먼저 _find_node로 찾아본 뒤 RedBlackTree와 같이 노드를 넣는다.
+len()은 중복을 포함한 element의 개수이고, 순회(iter, reversed, irange, inorder_traverse)는 각 element를 들어있는 횟수만큼 반복하여 돌려준다. cursor는 서로 다른 element 단위로 움직인다. 노드에 key만 저장되므로 RedBlackTree의 key 함수는 사용하지 않는다.
+
+:param RedBlackTree: 상위 클래스인 RedBlackTree를 가리킨다.
+"""
+class RedBlackMultiset(RedBlackTree):
+    """Sorted multiset storing one red-black tree node per distinct element."""
+
+    #-------------------------- nested _Node class --------------------------
+    class _Node(RedBlackTree._Node):
+        """Red-black tree node that also stores how many copies it represents."""
+        __slots__ = '_multiplicity',
+
+        def __init__(self, element, parent=None, left=None, right=None, color=RedBlackTree._Node.RED, multiplicity=1):
+            super().__init__(element, parent, left, right, color)
+            self._multiplicity = multiplicity
+
+    def __init__(self):
+        """Create an initially empty multiset."""
+        super().__init__()
+        self._total = 0     # 중복을 포함한 element의 개수 (self._size는 노드의 개수)
+
+    def __len__(self):
+        if not self._size_known:
+            self._recount()
+        return self._total
+
+    """
+    _recount(self)는 split/join 뒤 크기를 모르는 트리를 한번 순회하여 노드 수와 중복을 포함한 element의 개수를 함께 다시 정한다.
+    """
+    def _recount(self):
+        nodes = total = 0
+        for node in self._iter_nodes(self._root):
+            nodes += 1
+            total += node._multiplicity
+        self._size, self._total = nodes, total
+        self._size_known = True
+
+    """
+    _copy_element(self, dst, src)는 delete에서 successor의 element를 target으로 옮길 때 개수도 함께 옮겨준다.
+    """
+    def _copy_element(self, dst, src):
+        dst._element = src._element
+        dst._multiplicity = src._multiplicity
+
+    """
+    _augmentation_error(self, node)는 validate에서 node의 _multiplicity가 1 이상의 정수인지 검사한다.
+
+    :param node: 검사할 노드
+    :return: 올바르지 않으면 설명 문자열, 올바르면 None
+    """
+    def _augmentation_error(self, node):
+        if not isinstance(node._multiplicity, int) or node._multiplicity < 1:
+            return f'_multiplicity is {node._multiplicity!r}'
+        return None
+
+    """
+    _load_sorted(self, items)는 정렬된 items에서 연속으로 같은 element들을 노드 하나로 묶은 뒤 self._load_nodes로 트리를 만든다. from_sorted, from_iterable, load가 이 함수를 사용한다.
+
+    :param items: 오름차순으로 정렬된 element들의 리스트
+    """
+    def _load_sorted(self, items):
+        self._load_nodes(self._group_nodes(items))
+        self._total = len(items)
+
+    def _group_nodes(self, items):
+        nodes = []
+        for element in items:
+            if nodes and not nodes[-1]._element < element:
+                nodes[-1]._multiplicity += 1
+            else:
+                nodes.append(self._Node(element))
+        return nodes
+
+    """
+    insert(self, element, copies=1)는 element를 copies개 넣는다. element가 이미 있다면 그 노드의 개수만 늘린다.
+
+    :param element: 넣을 element
+    :param copies: 넣을 개수
+    :raises ValueError: copies가 1보다 작은 경우
+    """
+    def insert(self, element, copies=1):
+        if copies < 1:
+            raise ValueError('copies must be positive')
+        node = self._find_node(element)
+        if node is None:
+            self._insert_node(self._Node(element, multiplicity=copies))
+        else:
+            node._multiplicity += copies
+        self._total += copies
+
+    """
+    delete(self, element)는 element를 하나 지우고 지워진 element를 반환한다. 같은 element가 여러 개라면 개수만 줄이고, 마지막 하나를 지우는 경우에만 노드를 트리에서 지운다. element가 없다면 None을 반환한다.
+
+    :param element: 지우고자 하는 element
+    :return: 지워진 element 또는 None
+    """
+    def delete(self, element):
+        node = self._find_node(element)
+        if node is None:
+            return None
+        return self._pop_node(node)
+
+    """
+    _pop_node(self, node)는 delete, pop_min, pop_max에서 node의 element를 하나 지운다. 개수가 하나 남은 경우에만 노드를 트리에서 지운다.
+    """
+    def _pop_node(self, node):
+        found = node._element
+        if node._multiplicity > 1:
+            node._multiplicity -= 1
+        else:
+            self._delete_node(node)
+        self._total -= 1
+        return found
+
+    """
+    remove_all(self, element)는 element를 모두 지우고 지워진 개수를 반환한다.
+
+    :param element: 지우고자 하는 element
+    :return: 지워진 개수 (없었다면 0)
+    """
+    def remove_all(self, element):
+        node = self._find_node(element)
+        if node is None:
+            return 0
+        copies = node._multiplicity
+        self._delete_node(node)
+        self._total -= copies
+        return copies
+
+    """
+    count(self, element)는 element가 몇 개 들어있는지를 O(log n)에 반환한다.
+
+    :param element: 개수를 알고 싶은 element
+    :return: element의 개수 (없다면 0)
+    """
+    def count(self, element):
+        node = self._find_node(element)
+        return 0 if node is None else node._multiplicity
+
+    """
+    items(self)는 서로 다른 element와 그 개수의 tuple (element, 개수)를 element의 오름차순으로 yield한다.
+    """
+    def items(self):
+        for node in self._iter_nodes(self._root):
+            yield node._element, node._multiplicity
+
+    #-------------------------- iteration --------------------------
+    """
+    _repeat(nodes)는 노드들의 element를 각 노드의 개수만큼 반복하여 yield한다. iter_inorder, __reversed__, irange, inorder_traverse에서 사용한다.
+    """
+    @staticmethod
+    def _repeat(nodes):
+        for node in nodes:
+            element = node._element
+            for _ in range(node._multiplicity):
+                yield element
+
+    def iter_inorder(self):
+        return self._repeat(self._iter_nodes(self._root))
+
+    def __reversed__(self):
+        return self._repeat(self._iter_nodes_reversed(self._root))
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        return self._repeat(self._irange_nodes(lo, hi, inclusive, reverse))
+
+    def _inorder_traverse(self, node):
+        return list(self._repeat(self._iter_nodes(node)))
+
+    #-------------------------- bulk operations --------------------------
+    """
+    update(self, iterable)는 iterable의 element들을 모두 넣는다. 정렬한 뒤 같은 element들을 묶어 서로 다른 element마다 insert를 한번씩 하고, 서로 다른 element가 트리 크기에 비해 많으면 기존 노드들과 새 노드들을 정렬 순서대로 합쳐(같은 element는 개수를 더해서) self._load_nodes로 트리를 다시 만든다.
+
+    :param iterable: 넣을 element들의 iterable
+    """
+    def update(self, iterable):
+        items = sorted(iterable)
+        runs = self._group_nodes(items)
+        if not self._rebuild_pays_off(len(runs)):
+            for run in runs:
+                self.insert(run._element, run._multiplicity)
+            return
+        merged = []
+        old = self._iter_nodes(self._root)
+        current = next(old, None)
+        for run in runs:
+            while current is not None and current._element < run._element:
+                merged.append(current)
+                current = next(old, None)
+            if current is not None and not run._element < current._element:
+                current._multiplicity += run._multiplicity
+            else:
+                merged.append(run)
+        while current is not None:
+            merged.append(current)
+            current = next(old, None)
+        self._load_nodes(merged)
+        self._total += len(items)
+
+    """
+    delete_many(self, elements)는 elements에 있는 element들을 지우고 실제로 지워진 개수를 반환한다. elements에 같은 element가 여러번 있으면 (들어있는 개수를 넘지 않는 한) 그 횟수만큼 지운다. 서로 다른 element마다 한번씩만 찾는다.
+
+    :param elements: 지우고자 하는 element들의 iterable
+    :return: 지워진 element의 개수
+    """
+    def delete_many(self, elements):
+        removed = 0
+        for run in self._group_nodes(sorted(elements)):
+            node = self._find_node(run._element)
+            if node is None:
+                continue
+            if run._multiplicity < node._multiplicity:
+                node._multiplicity -= run._multiplicity
+                removed += run._multiplicity
+            else:
+                removed += node._multiplicity
+                self._delete_node(node)
+        self._total -= removed
+        return removed
+
+    """
+    delete_range(self, lo, hi, inclusive=(True, True))는 범위 안의 element들을 개수와 상관없이 모두 지우고 중복을 포함하여 지워진 개수를 반환한다. 범위 안의 노드들의 개수를 더한 뒤 RedBlackTree.delete_range로 노드들을 지운다.
+    """
+    def delete_range(self, lo=None, hi=None, inclusive=(True, True)):
+        copies = sum(node._multiplicity for node in self._irange_nodes(lo, hi, inclusive))
+        super().delete_range(lo, hi, inclusive)
+        self._total -= copies
+        return copies
+
+    """
+    split(self, key)와 join(cls, left, right)는 RedBlackTree와 같다. RedBlackTree.split은 나누어진 트리들의 크기를 세지 않으므로 중복을 포함한 크기도 노드 수와 함께 다음 len()에서 _recount로 센다. join은 두 트리의 크기를 모두 알 때만 그 합이 결과의 크기가 된다.
+    """
+    def split(self, key):
+        left, right = super().split(key)
+        self._total = 0
+        return left, right
+
+    @classmethod
+    def join(cls, left, right):
+        # 크기를 모르는 빈 트리의 self._total은 의미가 없으므로 더하지 않는다.
+        total = sum(tree._total for tree in (left, right) if tree._root is not None)
+        result = super().join(left, right)
+        result._total = total
+        left._total = right._total = 0
+        return result
+
+    def _empty_like(self):
+        tree = super()._empty_like()
+        tree._total = 0
+        return tree
@@ -0,0 +1,241 @@
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+"""
+redblack_storage 모듈은 RedBlackTree를 파일에 저장하는 binary format과, 파일을 memory-map하여 트리를 만들지 않고 바로 search할 수 있는 MappedRedBlackTree를 제공한다.
+파일에는 element들을 정렬 순서대로 저장한다. 노드의 색상이나 모양(shape)은 저장하지 않는다. RedBlackTree.from_sorted는 정렬된 element들로부터 O(n)에 올바른 색상을 가진 균형잡힌 트리를 만들기 때문에 색상 정보가 없어도 선형 시간에 다시 만들 수 있고, 정렬된 배열은 그 자체로 binary search가 가능하므로 mmap 모드에서 그대로 사용할 수 있다.
+
+파일 형식 (little-endian):
+    header (16 bytes): magic b'RBT1', typecode 1 byte, padding 3 bytes, element 개수 8 bytes
+    typecode 'q' (64bit 정수) 또는 'd' (실수): element 개수 * 8 bytes의 element 배열
+    typecode 'u' (문자열): (element 개수 + 1) * 8 bytes의 offset 배열, 그 뒤에 UTF-8로 encode된 문자열들을 이어 붙인 데이터
+"""
+
+_MAGIC = b'RBT1'
+_HEADER = struct.Struct('<4sc3xQ')
+# array는 이 컴퓨터의 byte order를 사용하므로 big-endian이라면 읽고 쓸 때 byte 순서를 뒤집는다.
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+"""
+_typecode_of(elements)는 element들을 저장할 typecode를 정한다. bool이 아닌 int만 있으면 'q', float만 있으면 'd', str만 있으면 'u'이다.
+
+:param elements: 저장할 element들의 리스트
+:return: typecode 문자
+:raises TypeError: 지원하지 않는 타입이 있거나 타입이 섞여 있는 경우
+"""
+def _typecode_of(elements):
+    if all(type(e) is int for e in elements):
+        return 'q'
+    if all(type(e) is float for e in elements):
+        return 'd'
+    if all(type(e) is str for e in elements):
+        return 'u'
+    raise TypeError('only trees of int, float or str elements can be dumped')
+
+"""
+write_sorted(path, elements)는 정렬된 element들을 위의 형식으로 path에 저장한다. 정수와 실수는 array의 tobytes로 한번에 쓴다.
+
+:param path: 저장할 파일의 경로
+:param elements: 오름차순으로 정렬된 element들의 iterable
+:raises TypeError: 지원하지 않는 element 타입인 경우
+:raises OverflowError: 정수가 64bit 범위를 벗어나는 경우
+"""
+def write_sorted(path, elements):
+    elements = list(elements)
+    typecode = _typecode_of(elements)
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, typecode.encode(), len(elements)))
+        if typecode == 'u':
+            data = [e.encode('utf-8') for e in elements]
+            offsets = array('Q', [0])
+            total = 0
+            for d in data:
+                total += len(d)
+                offsets.append(total)
+            _write_array(f, offsets)
+            f.write(b''.join(data))
+        else:
+            _write_array(f, array(typecode, elements))
+
+def _write_array(f, values):
+    if values.itemsize != 8:
+        raise TypeError('unsupported array item size')
+    if _BIG_ENDIAN:
+        values.byteswap()
+    f.write(values.tobytes())
+
+"""
+_read_header(buffer)는 buffer의 앞부분에서 header를 읽어 typecode와 element 개수를 반환한다.
+
+:raises ValueError: RedBlackTree의 파일이 아니거나 typecode를 알 수 없는 경우
+"""
+def _read_header(buffer):
+    if len(buffer) < _HEADER.size:
+        raise ValueError('file is too short to be a dumped RedBlackTree')
+    magic, typecode, count = _HEADER.unpack_from(buffer, 0)
+    typecode = typecode.decode()
+    if magic != _MAGIC or typecode not in ('q', 'd', 'u'):
+        raise ValueError('not a dumped RedBlackTree file')
+    return typecode, count
+
+def _to_array(typecode, buffer):
+    values = array(typecode)
+    values.frombytes(buffer)
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values
+
+"""
+read_sorted(path)는 write_sorted로 저장된 파일 전체를 읽어 정렬된 element들의 리스트를 반환한다.
+
+:param path: 읽을 파일의 경로
+:return: element들의 리스트
+:raises ValueError: 파일 형식이 올바르지 않은 경우
+"""
+def read_sorted(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    typecode, count = _read_header(data)
+    start = _HEADER.size
+    if typecode != 'u':
+        return _to_array(typecode, data[start:start + 8 * count]).tolist()
+    offsets = _to_array('Q', data[start:start + 8 * (count + 1)])
+    blob = data[start + 8 * (count + 1):].decode('utf-8')
+    if len(blob) == offsets[-1]:
+        # 모든 문자가 ASCII라면 byte offset이 곧 문자 index이다.
+        return [blob[offsets[i]:offsets[i + 1]] for i in range(count)]
+    raw = data[start + 8 * (count + 1):]
+    return [raw[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(count)]
+
+
+"""
+Class _StringKeys는 mmap된 문자열 영역을 i번째 문자열을 돌려주는 sequence처럼 보이게 해준다. bisect가 이 객체 위에서 바로 binary search를 할 수 있도록 __len__과 __getitem__만 제공한다.
+"""
+class _StringKeys:
+    """Sequence view of the UTF-8 strings stored in a mapped file."""
+
+    def __init__(self, buffer, offsets, start):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._start = start
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        start = self._start
+        return self._buffer[start + self._offsets[i]:start + self._offsets[i + 1]].decode('utf-8')
+
+
+"""
+Class MappedRedBlackTree는 write_sorted(RedBlackTree.dump)로 저장된 파일을 mmap으로 열어 읽기 전용으로 사용하는 객체이다. 파일을 읽어 노드를 만들지 않고 파일 안의 정렬된 배열에서 바로 binary search를 하므로, 여는 데에는 크기와 상관없이 O(1)이 들고 search는 O(log n)번 파일의 해당 위치만 읽는다. 필요한 page만 운영체제가 읽어오므로 큰 파일도 바로 사용할 수 있다.
+정수와 실수는 mmap 위의 memoryview를 cast하여 bisect가 C 수준에서 바로 비교하도록 하였다. 다 사용한 뒤에는 close를 호출하거나 with 문을 사용한다.
+
+:param path: RedBlackTree.dump로 저장된 파일의 경로
+"""
+class MappedRedBlackTree:
+    """Read-only red-black tree contents served directly from a mapped file."""
+
+    def __init__(self, path):
+        """Open path and map it read-only."""
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            typecode, count = _read_header(self._mmap)
+        except ValueError:
+            self._mmap.close()
+            raise
+        self._views = []
+        start = _HEADER.size
+        if typecode == 'u':
+            offsets = self._cast(start, count + 1, 'Q')
+            self._keys = _StringKeys(self._mmap, offsets, start + 8 * (count + 1))
+        else:
+            self._keys = self._cast(start, count, typecode)
+        self._size = count
+
+    """
+    _cast(self, start, count, typecode)는 mmap의 start 위치부터 count개의 8byte 값을 typecode의 memoryview로 반환한다. 이 컴퓨터가 big-endian이라면 cast를 할 수 없으므로 값을 읽어 array로 만든다. close에서 release할 수 있도록 만든 memoryview들을 기억해둔다.
+    """
+    def _cast(self, start, count, typecode):
+        raw = memoryview(self._mmap)[start:start + 8 * count]
+        self._views.append(raw)
+        if _BIG_ENDIAN:
+            return _to_array(typecode, raw)
+        view = raw.cast(typecode)
+        self._views.append(view)
+        return view
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._keys = ()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self._size
+
+    """
+    search(self, element)는 파일 안의 정렬된 배열에서 binary search로 element를 찾아 반환하고, 없으면 None을 반환한다.
+
+    :param element: 찾고자 하는 element
+    :return: 찾은 element 또는 None
+    """
+    def search(self, element):
+        keys = self._keys
+        i = bisect_left(keys, element)
+        if i < self._size:
+            current = keys[i]
+            if not element < current:
+                return current
+        return None
+
+    def __contains__(self, element):
+        return self.search(element) is not None
+
+    def __iter__(self):
+        keys = self._keys
+        for i in range(self._size):
+            yield keys[i]
+
+    def __reversed__(self):
+        keys = self._keys
+        for i in range(self._size - 1, -1, -1):
+            yield keys[i]
+
+    """
+    irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False)는 RedBlackTree.irange와 같은 범위 규칙으로 element들을 yield한다. 시작과 끝 위치를 bisect로 찾은 뒤 그 사이를 읽는다.
+    """
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        keys = self._keys
+        lo_inclusive, hi_inclusive = inclusive
+        if lo is None:
+            start = 0
+        elif lo_inclusive:
+            start = bisect_left(keys, lo)
+        else:
+            start = bisect_right(keys, lo)
+        if hi is None:
+            stop = self._size
+        elif hi_inclusive:
+            stop = bisect_right(keys, hi)
+        else:
+            stop = bisect_left(keys, hi)
+        indices = range(start, stop)
+        if reverse:
+            indices = reversed(indices)
+        for i in indices:
+            yield keys[i]
+
+    def inorder_traverse(self):
+        return list(self)
@@ -1,3 +1,9 @@
+import copy
+import random
+import time
+from operator import attrgetter
+import redblack_storage
+
 class RedBlackTree():
     # Node class - DO NOT MODIFY
     class _Node:
@@ -13,49 +19,666 @@ class RedBlackTree():
             self._right = right
             self._color = color
 
-    def __init__(self):
+    #-------------------------- nested Cursor class --------------------------
+    """
+    Class Cursor는 트리 안의 한 노드를 가리키며 정렬 순서대로 앞뒤로 움직일 수 있는 객체이다. 처음 위치를 잡을 때(seek)만 root에서 O(log n)으로 내려가고, 그 뒤의 next()/prev()는 _parent link를 이용하여 이웃 노드로 이동하므로 k개의 element를 훑는 비용은 O(log n + k)이다.
+    cursor가 트리의 범위를 벗어나면(가장 큰 element에서 next를 호출하는 등) 더 이상 노드를 가리키지 않게 되고, 이 경우 valid()는 False를 반환한다. cursor를 사용하는 도중에 트리가 insert/delete로 바뀌면 다시 seek을 해야 한다.
+    """
+    class Cursor:
+        """A movable reference to a node of the red-black tree."""
+
+        def __init__(self, container, node):
+            """Constructor should not be invoked by user."""
+            self._container = container
+            self._node = node
+
+        """
+        valid(self)는 cursor가 현재 노드를 가리키고 있는지를 반환한다.
+
+        :return: cursor가 노드를 가리키고 있으면 True, 범위를 벗어났으면 False
+        """
+        def valid(self):
+            return self._node is not None
+
+        """
+        element(self)는 cursor가 가리키는 노드의 element를 반환한다.
+
+        :return: cursor가 가리키는 노드의 element
+        :raises ValueError: cursor가 범위를 벗어나 노드를 가리키지 않는 경우
+        """
+        def element(self):
+            if self._node is None:
+                raise ValueError('cursor is out of range')
+            return self._container._item_of(self._node)
+
+        """
+        next(self)와 prev(self)는 cursor를 정렬 순서상 바로 다음/이전 노드로 옮기고 옮겨진 위치의 element를 반환한다. 더 이상 움직일 노드가 없으면 cursor는 범위를 벗어나고 None을 반환한다.
+
+        :return: 이동한 위치의 element, 범위를 벗어났다면 None
+        """
+        def next(self):
+            if self._node is not None:
+                self._node = self._container._next_node(self._node)
+            return None if self._node is None else self._container._item_of(self._node)
+
+        def prev(self):
+            if self._node is not None:
+                self._node = self._container._prev_node(self._node)
+            return None if self._node is None else self._container._item_of(self._node)
+
+        """
+        seek(self, key)는 cursor를 key 이상인 element 중 가장 작은 element를 가진 노드로 옮긴다. root에서 한번 내려가므로 O(log n)이다.
+
+        :param key: 찾고자 하는 위치의 기준이 되는 key
+        :return: 이동한 위치의 element, key 이상인 element가 없다면 None
+        """
+        def seek(self, key):
+            self._node = self._container._lower_bound(key)
+            return None if self._node is None else self._container._item_of(self._node)
+
+    #-------------------------- nested Violation class --------------------------
+    """
+    Class Violation은 validate, validate_path, validate_sample이 찾아낸 red-black tree 성질의 위반 하나를 나타내는 객체이다. 출력하지 않고 객체로 돌려주므로 호출한 쪽에서 기록하거나 검사할 수 있다.
+    kind는 위반의 종류('parent_link', 'bst_order', 'root_color', 'double_red', 'black_height', 'size', 'augmentation' 중 하나), element는 문제가 발견된 노드의 element(트리 전체에 대한 위반이면 None), detail은 사람이 읽을 수 있는 설명이다.
+    """
+    class Violation:
+        """A single red-black tree invariant violation."""
+        __slots__ = 'kind', 'element', 'detail'
+
+        def __init__(self, kind, element, detail):
+            self.kind = kind
+            self.element = element
+            self.detail = detail
+
+        def __repr__(self):
+            return f'Violation({self.kind!r}, {self.element!r}, {self.detail!r})'
+
+    # subclass에서 노드에 subtree 정보(크기 등)를 저장하는 경우 True로 바꾸고 _update를 구현한다.
+    _augmented = False
+
+    # enable_instrumentation이 켜져 있을 때의 통계 dict와, 그때 instance에 설치한 wrapper들의 이름
+    _stats = None
+    _instrumented = ()
+
+    # 노드에서 밖으로 돌려줄 값을 꺼내는 함수. key 함수가 주어진 트리에서는 instance에서 _item을 꺼내는 함수로 바뀐다.
+    _item_of = attrgetter('_element')
+    # 노드 class -> 그 class에 _item 자리를 추가한 class (key 함수가 주어진 트리에서 사용)
+    _keyed_node_classes = {}
+
+    """
+    __init__(self, key=None)은 빈 트리를 만든다. key가 주어지면 sorted()의 key처럼 element 대신 key(element)의 순서로 정렬하는 트리가 된다.
+    key 함수는 element를 넣을 때 한번만 호출되고, 그 결과는 노드의 _element 자리에 저장된다. element 자체는 노드에 추가된 _item 자리에 저장된다. 트리 내부의 탐색, rebalancing, 검사는 모두 _element만 비교하므로 element가 Python으로 작성된 __lt__를 가진 객체라도 비교는 저장된 key(정수, tuple 등)끼리 C 수준에서 이루어진다.
+    key가 주어진 트리에서 element를 받는 함수(insert, search, delete, update, delete_many, search_many, contains_many)는 받은 element에 key 함수를 적용하여 찾고, 위치나 범위를 나타내는 인자(irange의 lo와 hi, delete_range, split, cursor, Cursor.seek)는 이미 계산된 key로 받는다. element를 돌려주는 함수는 모두 _item에 저장된 원래 element를 돌려준다.
+
+    :param key: element로부터 비교에 사용할 key를 계산하는 함수, None이면 element끼리 비교한다.
+    """
+    def __init__(self, key=None):
         """Create an initially empty binary tree."""
         self._root = None
         self._size = 0
+        self._size_known = True     # False이면 self._size는 의미가 없고, 다음 len()에서 노드를 세어 다시 정한다.
+        self._last_touched = None   # 마지막 insert/delete로 구조가 바뀐 위치의 노드 (validate_path에서 사용)
+        self._key = key
+        if key is not None:
+            self._Node = self._keyed_node_class()
+            self._item_of = attrgetter('_item')
 
+    """
+    __len__(self)는 트리의 노드 수를 반환한다. split과 join은 O(log n)을 유지하기 위해 결과 트리의 크기를 세지 않고 모르는 상태(self._size_known이 False)로 남겨두는데(_split_sizes 참고), 이 경우 처음 len()을 호출할 때 O(n)으로 한번 세고 그 뒤로는 insert/delete가 다시 정확하게 유지한다. 크기를 모르는 동안의 insert/delete도 self._size를 바꾸지만 그 값은 사용되지 않는다.
+    """
     def __len__(self):
+        if not self._size_known:
+            self._recount()
         return self._size
 
+    """
+    _recount(self)는 크기를 모르는 트리의 노드 수를 세어 self._size를 다시 정하고 크기를 아는 상태로 바꾼다. 노드 수 외에 크기 정보를 따로 유지하는 subclass(RedBlackMultiset)는 이 함수를 override하여 같은 순회에서 함께 다시 정한다.
+    """
+    def _recount(self):
+        self._size = self._subtree_size(self._root)
+        self._size_known = True
+
+    """
+    from_sorted(cls, iterable)는 정렬된 iterable로부터 red-black tree를 한번에 만들어주는 class method이다. insert를 원소마다 호출하면 매번 root에서부터 위치를 찾고 double red를 처리해야 하지만, 정렬된 입력은 가운데 원소를 root로 두고 양쪽을 재귀적으로 나누어 O(n)에 균형잡힌 트리를 만들 수 있다.
+    색상은 depth에 따라 정해진다. 가운데 원소를 기준으로 나누면 양쪽 subtree의 크기 차이가 1 이하이므로 모든 빈 자리(None)는 depth가 floor(log2(n+1)) 또는 그보다 1 큰 곳에만 생긴다. 따라서 depth가 floor(log2(n+1)) 이상인 노드만 red로 칠하고 나머지는 black으로 칠하면 모든 경로의 black height이 같아지고, red 노드는 가장 아래 level에만 있으므로 double red도 생기지 않는다.
+
+    :param iterable: 오름차순(key가 주어지면 key의 오름차순)으로 정렬된 element들의 iterable
+    :param key: 트리에서 사용할 key 함수 (__init__ 참고)
+    :param kwargs: subclass의 생성자에 그대로 넘길 인자 (예: AggregateTree의 combine, identity, measure)
+    :return: 해당 element들을 담은 새로운 RedBlackTree
+    :raises ValueError: iterable이 정렬되어 있지 않은 경우
+    """
+    @classmethod
+    def from_sorted(cls, iterable, key=None, **kwargs):
+        items = list(iterable)
+        keys = items if key is None else [key(element) for element in items]
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i-1]:
+                raise ValueError('elements must be sorted')
+        tree = cls(**kwargs) if key is None else cls(key=key, **kwargs)
+        tree._load_sorted(items)
+        return tree
+
+    """
+    from_iterable(cls, iterable)는 정렬되지 않은 iterable을 먼저 정렬한 뒤 from_sorted와 같은 방법으로 트리를 만든다. 정렬에 O(n log n)이 들고 트리를 만드는 데에는 O(n)이 든다.
+
+    :param iterable: 트리에 넣을 element들의 iterable (순서 상관 없음)
+    :param key: 트리에서 사용할 key 함수 (__init__ 참고)
+    :param kwargs: subclass의 생성자에 그대로 넘길 인자 (from_sorted 참고)
+    :return: 해당 element들을 담은 새로운 RedBlackTree
+    """
+    @classmethod
+    def from_iterable(cls, iterable, key=None, **kwargs):
+        tree = cls(**kwargs) if key is None else cls(key=key, **kwargs)
+        tree._load_sorted(sorted(iterable, key=key))
+        return tree
+
+    """
+    dump(self, path)는 트리의 element들을 redblack_storage의 binary format으로 path에 저장한다. element들을 정렬 순서대로 저장하기만 하므로 노드마다 재귀적으로 객체를 저장하는 pickle보다 파일이 작고 빠르다. element는 int, float, str 중 한 가지 타입이어야 하며, subclass의 노드에 추가로 저장된 정보(예: RedBlackMap의 value)는 저장되지 않는다.
+    load(cls, path, key=None, **kwargs)는 dump로 저장된 파일을 읽어 from_sorted로 O(n)에 트리를 다시 만든다. key 함수를 사용한 트리를 저장했다면 같은 key 함수를 넘겨야 하고, 생성자에 인자가 필요한 subclass(AggregateTree 등)는 그 인자도 kwargs로 넘긴다. 트리를 만들지 않고 파일에서 바로 search하려면 redblack_storage.MappedRedBlackTree를 사용한다.
+
+    :param path: 저장하거나 읽을 파일의 경로
+    :param key: load에서 만들 트리의 key 함수
+    :param kwargs: load에서 subclass의 생성자에 넘길 인자
+    :return: load의 경우 파일의 element들을 담은 새로운 트리
+    :raises TypeError: dump에서 지원하지 않는 element 타입인 경우
+    :raises ValueError: load에서 파일 형식이 올바르지 않은 경우
+    """
+    def dump(self, path):
+        redblack_storage.write_sorted(path, self.iter_inorder())
+
+    @classmethod
+    def load(cls, path, key=None, **kwargs):
+        return cls.from_sorted(redblack_storage.read_sorted(path), key, **kwargs)
+
+    """
+    _load_sorted(self, items)는 정렬된 리스트 items로 현재 트리의 내용을 통째로 교체한다. 각 element로 self._new_node를 사용하여 노드를 만든 뒤 self._load_nodes로 트리를 만든다.
+
+    :param items: 오름차순으로 정렬된 element들의 리스트
+    """
+    def _load_sorted(self, items):
+        self._load_nodes([self._new_node(element) for element in items])
+
+    """
+    _load_nodes(self, nodes)는 정렬 순서대로 나열된 노드들의 리스트로 현재 트리를 다시 만든다. 노드 객체를 새로 만들지 않고 link와 색상만 다시 정하므로, 노드에 element 외에 저장된 정보(예: RedBlackMap의 value)도 그대로 유지된다. red로 칠할 depth를 먼저 계산한 뒤 self._link_sorted로 트리를 만든다.
+
+    :param nodes: element의 오름차순으로 나열된 노드들의 리스트
+    """
+    def _load_nodes(self, nodes):
+        red_depth = (len(nodes) + 1).bit_length() - 1
+        self._root = self._link_sorted(nodes, 0, len(nodes), 0, red_depth, None)
+        self._size = len(nodes)
+        self._size_known = True
+        self._last_touched = None
+
+    """
+    _link_sorted(self, nodes, lo, hi, depth, red_depth, parent)는 nodes[lo:hi]로 이루어진 subtree를 만들고 그 root 노드를 반환한다. 가운데 노드를 subtree의 root로 두고 왼쪽 구간과 오른쪽 구간에 대해 재귀적으로 호출하여 자식으로 연결한다. 재귀의 깊이는 O(log n)이다.
+
+    :param nodes: 정렬 순서대로 나열된 노드들의 리스트
+    :param lo: subtree에 들어갈 구간의 시작 index
+    :param hi: subtree에 들어갈 구간의 끝 index (포함하지 않음)
+    :param depth: 만들어질 subtree root의 depth
+    :param red_depth: 이 depth 이상의 노드는 red로 칠한다.
+    :param parent: 만들어질 subtree root의 부모 노드
+    :return: 만들어진 subtree의 root 노드, 구간이 비어있다면 None
+    """
+    def _link_sorted(self, nodes, lo, hi, depth, red_depth, parent):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node._parent = parent
+        node._color = self._Node.RED if depth >= red_depth else self._Node.BLACK
+        node._left = self._link_sorted(nodes, lo, mid, depth+1, red_depth, node)
+        node._right = self._link_sorted(nodes, mid+1, hi, depth+1, red_depth, node)
+        if self._augmented:
+            self._update(node)
+        return node
+
+    """
+    _rebuild_pays_off(self, count)는 count개의 element를 한번에 넣거나 지울 때, 하나씩 insert/delete하는 것보다 트리 전체를 다시 만드는 것이 더 빠를지를 판단한다. 하나씩 처리하면 element마다 root에서 내려가고 rebalancing을 해야 하므로 O(count log n)이 들고, 다시 만들면 순회와 _load_nodes로 O(n + count)가 든다. 실제로 측정했을 때 rebalancing을 포함한 delete 한번의 비용이 노드 하나를 다시 연결하는 비용의 약 _BULK_REBUILD_FACTOR배였으므로 이를 기준으로 한다.
+
+    :param count: 한번에 처리할 element의 개수
+    :return: 트리를 다시 만드는 것이 유리하면 True
+    """
+    _BULK_REBUILD_FACTOR = 8
+
+    def _rebuild_pays_off(self, count):
+        return count * self._BULK_REBUILD_FACTOR >= RedBlackTree.__len__(self)
+
+    """
+    update(self, iterable)는 iterable의 element들을 모두 트리에 넣는다. 넣을 element가 트리 크기에 비해 적으면 하나씩 insert하고, 많으면 기존 노드들(정렬 순서)과 새 노드들(정렬 후)을 하나의 리스트로 합쳐 정렬한 뒤 self._load_nodes로 트리를 다시 만든다. Python의 정렬은 이미 정렬된 두 구간을 합치는 경우 O(n + k)에 끝나므로 전체 비용은 새 element를 정렬하는 O(k log k)와 O(n + k)이다.
+
+    :param iterable: 트리에 넣을 element들의 iterable
+    """
+    def update(self, iterable):
+        items = sorted(iterable, key=self._key)
+        if not self._rebuild_pays_off(len(items)):
+            for element in items:
+                self.insert(element)
+            return
+        nodes = list(self._iter_nodes(self._root))
+        nodes.extend(self._new_node(element) for element in items)
+        nodes.sort(key=attrgetter('_element'))
+        self._load_nodes(nodes)
+
+    """
+    delete_many(self, elements)는 elements에 있는 element들을 트리에서 지우고 실제로 지워진 개수를 반환한다. elements에 같은 element가 여러번 있으면 그 횟수만큼 지운다. 지울 element가 트리 크기에 비해 많으면 트리를 한번 순회하면서 정렬된 elements와 비교하여 남길 노드만 모은 뒤 self._load_nodes로 다시 만든다. 이 경우 element마다 double black을 처리할 필요가 없다.
+
+    :param elements: 지우고자 하는 element들의 iterable
+    :return: 지워진 element의 개수
+    """
+    def delete_many(self, elements):
+        elements = sorted(elements if self._key is None else map(self._key, elements))
+        if not self._rebuild_pays_off(len(elements)):
+            removed = 0
+            for element in elements:
+                node = self._find_node(element)
+                if node is not None:
+                    self._delete_node(node)
+                    removed += 1
+            return removed
+        kept = []
+        i = 0
+        total = 0
+        for node in self._iter_nodes(self._root):
+            total += 1
+            current = node._element
+            while i < len(elements) and elements[i] < current:
+                i += 1
+            if i < len(elements) and not current < elements[i]:
+                i += 1
+            else:
+                kept.append(node)
+        removed = total - len(kept)
+        self._load_nodes(kept)
+        return removed
+
+    """
+    delete_range(self, lo, hi, inclusive=(True, True))는 lo와 hi 사이(irange와 같은 범위 규칙)에 있는 element들을 모두 지우고 지워진 개수를 반환한다. element를 하나씩 지우는 대신 트리를 lo와 hi에서 self._split_root로 세 조각(범위 아래, 범위 안, 범위 위)으로 자르고 범위 아래와 위의 조각을 self._join_nodes로 다시 붙인다. 자르고 붙이는 데에는 O(log n)이 들고, 지워진 개수를 세는 데 범위 안 조각의 크기만큼(OrderStatisticTree는 O(1)) 시간이 든다.
+
+    :param lo: 범위의 하한, None이면 하한이 없다.
+    :param hi: 범위의 상한, None이면 상한이 없다.
+    :param inclusive: (하한 포함 여부, 상한 포함 여부)
+    :return: 지워진 element의 개수
+    """
+    def delete_range(self, lo=None, hi=None, inclusive=(True, True)):
+        lo_inclusive, hi_inclusive = inclusive
+        if self._root is None:
+            return 0
+        below, below_bh = None, 0
+        rest, rest_bh = self._root, self._black_height(self._root)
+        if lo is not None:
+            below, below_bh, rest, rest_bh = self._split_root(rest, rest_bh, lo, not lo_inclusive)
+        above, above_bh = None, 0
+        doomed = rest
+        if hi is not None:
+            doomed, _, above, above_bh = self._split_root(rest, rest_bh, hi, hi_inclusive)
+        removed = self._subtree_size(doomed)
+        size = self._size - removed
+        if below is None or above is None:
+            self._root = above if below is None else below
+        else:
+            # above에서 가장 작은 노드를 떼어내어 below와 above를 붙이는 pivot으로 사용한다.
+            self._root = above
+            pivot = self._first(above)
+            element = pivot._element
+            self._delete_node(pivot)
+            pivot._element = element
+            above = self._root
+            self._root, _ = self._join_nodes(below, below_bh, pivot, above, self._black_height(above))
+        self._size = size
+        self._last_touched = None
+        return removed
+
+    """
+    split(self, key)는 트리를 key보다 작은 element들의 트리와 key 이상인 element들의 트리 두 개로 나누어 반환한다. 노드를 새로 만들거나 복사하지 않고, root에서 key를 찾아 내려가는 경로를 따라 잘린 subtree들을 self._join_nodes로 붙여 나가므로 구조를 바꾸는 데 O(log n)이 든다. 나누어진 두 트리의 크기는 self._split_sizes로 구하며, 기본 RedBlackTree에서는 세지 않고 다음 len()까지 미룬다(__len__ 참고). 원래 트리는 비어있게 된다.
+
+    :param key: 나누는 기준이 되는 key
+    :return: (key보다 작은 element들의 트리, key 이상인 element들의 트리)
+    """
+    def split(self, key):
+        left_root, _, right_root, _ = self._split_root(self._root, self._black_height(self._root), key, False)
+        left = self._empty_like()
+        right = self._empty_like()
+        left._root = left_root
+        right._root = right_root
+        sizes = self._split_sizes(left_root, right_root, self._size if self._size_known else None)
+        if sizes is None:
+            left._size_known = right._size_known = False
+        else:
+            left._size, right._size = sizes
+        self._root = None
+        self._size = 0
+        self._size_known = True
+        self._last_touched = None
+        return left, right
+
+    """
+    join(cls, left, right)는 left의 모든 element가 right의 모든 element 이하일 때 두 트리를 하나로 합친 트리를 반환한다. left에서 가장 큰 노드를 떼어내어 pivot으로 사용하고 self._join_nodes로 합치므로 O(log n)이 든다. 두 트리 중 하나라도 크기를 모르는 상태(split의 결과 등)이면 결과의 크기도 다음 len()까지 세지 않는다. left와 right는 비어있게 된다.
+
+    :param left: 작은 쪽 element들의 트리
+    :param right: 큰 쪽 element들의 트리
+    :return: 두 트리를 합친 트리
+    :raises ValueError: left에 right의 가장 작은 element보다 큰 element가 있거나 두 트리의 key 함수가 다른 경우
+    """
+    @classmethod
+    def join(cls, left, right):
+        if left._key is not right._key:
+            raise ValueError('left and right must use the same key function')
+        result = left._empty_like()
+        if left._root is None or right._root is None:
+            source = right if left._root is None else left
+            result._root, result._size, result._size_known = source._root, source._size, source._size_known
+        else:
+            if right._first(right._root)._element < left._last(left._root)._element:
+                raise ValueError('elements of left must not be greater than elements of right')
+            pivot = left._last(left._root)
+            element = pivot._element
+            left._delete_node(pivot)
+            pivot._element = element
+            result._root, _ = result._join_nodes(left._root, left._black_height(left._root),
+                                                 pivot, right._root, right._black_height(right._root))
+            result._size = left._size + right._size + 1
+            result._size_known = left._size_known and right._size_known
+        left._root, left._size, left._size_known, left._last_touched = None, 0, True, None
+        right._root, right._size, right._size_known, right._last_touched = None, 0, True, None
+        return result
+
+    """
+    _empty_like(self)는 현재 트리와 같은 종류(subclass와 설정 포함)의 빈 트리를 만들어 반환한다. split과 join의 결과를 담는 데 사용한다.
+
+    :return: 비어있는 같은 종류의 트리
+    """
+    def _empty_like(self):
+        tree = copy.copy(self)
+        tree._root = None
+        tree._size = 0
+        tree._size_known = True
+        tree._last_touched = None
+        # copy.copy는 instance에 설치된 instrumentation wrapper도 복사하는데, 그 wrapper들은 원래 트리를 가리키므로 지운다.
+        for name in self._instrumented:
+            del tree.__dict__[name]
+        tree._instrumented = ()
+        tree._stats = None
+        return tree
+
+    """
+    _black_height(self, node)는 node를 root로 하는 subtree의 black height(node에서 leaf까지 가는 경로에 있는 black 노드의 수, node 포함)를 구한다. red-black tree에서는 모든 경로의 black 노드 수가 같으므로 가장 왼쪽 경로만 세면 된다. None의 black height은 0이다.
+
+    :param node: black height을 구할 subtree의 root
+    :return: subtree의 black height
+    """
+    def _black_height(self, node):
+        height = 0
+        while node is not None:
+            if node._color == self._Node.BLACK:
+                height += 1
+            node = node._left
+        return height
+
+    """
+    _detach_subtree(self, node, black_height)는 부모에서 떨어져 나온 subtree의 root를 독립된 트리의 root로 만든다. root는 black이어야 하므로 red였다면 black으로 바꾸고 black height을 1 늘린다.
+
+    :param node: 떨어져 나온 subtree의 root (None일 수 있다.)
+    :param black_height: 색을 바꾸기 전 subtree의 black height
+    :return: (subtree의 root, 새로운 black height)
+    """
+    def _detach_subtree(self, node, black_height):
+        if node is None:
+            return None, 0
+        node._parent = None
+        if node._color == self._Node.RED:
+            node._color = self._Node.BLACK
+            black_height += 1
+        return node, black_height
+
+    """
+    _split_root(self, node, black_height, key, key_goes_left)는 node를 root로 하는 subtree를 key를 기준으로 두 개의 red-black tree로 나누고 (왼쪽 root, 왼쪽 black height, 오른쪽 root, 오른쪽 black height)를 반환한다. key_goes_left가 False이면 key보다 작은 element들이 왼쪽으로 가고, True이면 key 이하인 element들이 왼쪽으로 간다.
+    node가 왼쪽으로 가야 한다면 node의 왼쪽 subtree도 모두 왼쪽으로 가므로, 오른쪽 subtree만 재귀적으로 나눈 뒤 그 왼쪽 조각을 node를 pivot으로 하여 node의 왼쪽 subtree와 붙인다. 반대의 경우도 좌우만 바꾸어 같은 방법으로 처리한다. 각 단계에서 붙이는 비용은 두 조각의 black height 차이에 비례하고, 그 합은 트리의 높이로 제한되므로 전체 비용은 O(log n)이다.
+
+    :param node: 나눌 subtree의 root
+    :param black_height: subtree의 black height
+    :param key: 나누는 기준이 되는 key
+    :param key_goes_left: True이면 key와 같은 element도 왼쪽으로 보낸다.
+    :return: (왼쪽 root, 왼쪽 black height, 오른쪽 root, 오른쪽 black height)
+    """
+    def _split_root(self, node, black_height, key, key_goes_left):
+        if node is None:
+            return None, 0, None, 0
+        child_height = black_height - (1 if node._color == self._Node.BLACK else 0)
+        left, left_height = self._detach_subtree(node._left, child_height)
+        right, right_height = self._detach_subtree(node._right, child_height)
+        node._left = node._right = node._parent = None
+        if node._element < key or (key_goes_left and not key < node._element):
+            low, low_height, high, high_height = self._split_root(right, right_height, key, key_goes_left)
+            root, height = self._join_nodes(left, left_height, node, low, low_height)
+            return root, height, high, high_height
+        else:
+            low, low_height, high, high_height = self._split_root(left, left_height, key, key_goes_left)
+            root, height = self._join_nodes(high, high_height, node, right, right_height)
+            return low, low_height, root, height
+
+    """
+    _join_nodes(self, left, left_height, pivot, right, right_height)는 left의 element <= pivot의 element <= right의 element인 두 트리(root가 black)와 pivot 노드를 하나의 red-black tree로 합치고 (root, black height)를 반환한다. self._root는 합치는 동안 작업 공간으로 사용된다.
+    두 트리의 black height이 같으면 pivot을 black root로 하고 두 트리를 자식으로 연결한다. left가 더 높다면 left의 오른쪽 경로를 따라 내려가다가 black height이 right와 같은 black 노드(또는 None)를 만나면 그 자리에 red pivot을 넣고 잘린 노드와 right를 pivot의 자식으로 연결한다. 이렇게 하면 black height은 그대로이고 pivot과 그 부모 사이에서만 double red가 생길 수 있으므로 insert와 같이 self._process_double_red로 처리한다. right가 더 높은 경우는 좌우만 바꾸어 같게 처리한다. 내려가는 거리는 두 black height의 차이에 비례한다.
+    결과의 black height은 낮은 쪽 트리의 root(구조가 바뀌지 않음)에서 root까지 올라가며 black 노드를 세어 구한다. 이 거리도 내려간 거리와 비슷하므로 높이 전체를 다시 셀 필요가 없다.
+
+    :param left: 작은 쪽 트리의 root (None일 수 있다.)
+    :param left_height: left의 black height
+    :param pivot: 두 트리 사이에 들어갈 떨어진 노드
+    :param right: 큰 쪽 트리의 root (None일 수 있다.)
+    :param right_height: right의 black height
+    :return: (합쳐진 트리의 root, 합쳐진 트리의 black height)
+    """
+    def _join_nodes(self, left, left_height, pivot, right, right_height):
+        pivot._parent = None
+        if left_height == right_height:
+            pivot._left, pivot._right = left, right
+            if left is not None:
+                left._parent = pivot
+            if right is not None:
+                right._parent = pivot
+            pivot._color = self._Node.BLACK
+            if self._augmented:
+                self._update(pivot)
+            return pivot, left_height + 1
+
+        if left_height > right_height:
+            self._root = left
+            parent, node, height = None, left, left_height
+            while not (height == right_height and self._is_black(node)):
+                if node._color == self._Node.BLACK:
+                    height -= 1
+                parent, node = node, node._right
+            pivot._left, pivot._right = node, right
+            parent._right = pivot
+            anchor = right
+        else:
+            self._root = right
+            parent, node, height = None, right, right_height
+            while not (height == left_height and self._is_black(node)):
+                if node._color == self._Node.BLACK:
+                    height -= 1
+                parent, node = node, node._left
+            pivot._left, pivot._right = left, node
+            parent._left = pivot
+            anchor = left
+        pivot._parent = parent
+        pivot._color = self._Node.RED
+        if pivot._left is not None:
+            pivot._left._parent = pivot
+        if pivot._right is not None:
+            pivot._right._parent = pivot
+        if self._augmented:
+            self._update(pivot)
+        if parent._color == self._Node.RED:
+            self._process_double_red(pivot)
+        if self._augmented:
+            self._update_path(pivot)
+
+        # 결과의 black height = anchor의 black height + anchor 위에 있는 black 노드의 수
+        if anchor is None:
+            anchor = node
+        if anchor is None:
+            anchor = pivot
+            height = self._black_height(pivot)
+        else:
+            height = min(left_height, right_height)
+        ancestor = anchor._parent
+        while ancestor is not None:
+            if ancestor._color == self._Node.BLACK:
+                height += 1
+            ancestor = ancestor._parent
+        return self._root, height
+
+    """
+    _subtree_size(self, node)는 node를 root로 하는 subtree의 노드 수를 순회하여 센다. 노드에 subtree 크기를 저장하는 subclass는 이 함수를 override하여 O(1)에 반환할 수 있다.
+
+    :param node: 노드 수를 셀 subtree의 root
+    :return: subtree의 노드 수
+    """
+    def _subtree_size(self, node):
+        count = 0
+        for _ in self._iter_nodes(node):
+            count += 1
+        return count
+
+    """
+    _split_sizes(self, left, right, total)는 총 total개(모르면 None)의 노드를 두 트리(root가 left, right)로 나누었을 때 각 트리의 크기를 (왼쪽, 오른쪽)으로 반환하는 hook이다. 기본 RedBlackTree는 노드에 subtree 크기를 저장하지 않아 크기를 구하려면 적어도 한쪽을 순회해야 하므로(O(n)), split이 O(log n)이 되도록 None을 반환하여 크기를 세는 것을 다음 len()으로 미룬다. 노드에 subtree 크기를 저장하는 subclass(OrderStatisticTree)는 O(1)에 정확한 크기를 반환한다.
+
+    :param left: 왼쪽 트리의 root
+    :param right: 오른쪽 트리의 root
+    :param total: 두 트리의 노드 수의 합, 모르면 None
+    :return: (왼쪽 트리의 크기, 오른쪽 트리의 크기), 세지 않는다면 None
+    """
+    def _split_sizes(self, left, right, total):
+        return None
+
     # Search for the element in the red-black tree.
     # return: _Node object, or None if it's non-existing
     
     """
-    search(self,element)는 root가 none인 경우, 즉 tree가 비어있는 경우에 None을 리턴하고 그 외의 경우에는 self._search_sub에 element를 넘겨 해당 함수를 실행시키는 함수이다.
+    search(self,element)는 self._find_node로 element를 가진 노드를 찾아서 그 노드의 element를 반환하는 함수이다. tree가 비어있거나 element가 없는 경우에는 None을 리턴한다.
     
     :param element: 찾고자하는 element를 의미한다.
     :return: 찾고자 하는 element를 가진 노드의 element를 리턴하거나 찾지 못한 경우 None을 리턴하게 된다.
     """
     def search(self, element):
-        if self._root == None:
+        node = self._find_node(self._key_of(element))
+        if node is None:
             return None
-        else:
-            return self._search_sub(self._root, element)
-    
+        return self._item_of(node)
+
+    """
+    floor(self, key), ceiling(self, key), lower(self, key), higher(self, key)는 key 이하인 가장 큰 element, key 이상인 가장 작은 element, key보다 작은 가장 큰 element, key보다 큰 가장 작은 element를 반환한다. key 함수가 주어진 트리에서는 irange와 마찬가지로 key를 받는다.
+    각각 _floor_node, _lower_bound, _lower_node, _upper_bound로 root에서 한번만 내려가므로 O(log n)이다.
+
+    :param key: 기준이 되는 key
+    :return: 조건을 만족하는 element, 없다면 None
+    """
+    def floor(self, key):
+        node = self._floor_node(key)
+        return None if node is None else self._item_of(node)
+
+    def ceiling(self, key):
+        node = self._lower_bound(key)
+        return None if node is None else self._item_of(node)
+
+    def lower(self, key):
+        node = self._lower_node(key)
+        return None if node is None else self._item_of(node)
+
+    def higher(self, key):
+        node = self._upper_bound(key)
+        return None if node is None else self._item_of(node)
+
+    """
+    min(self)와 max(self)는 가장 작은/큰 element를 반환하고, pop_min(self)와 pop_max(self)는 그 element를 트리에서 지운 뒤 반환한다. 모두 root에서 가장 왼쪽/오른쪽으로 한번 내려가며, 트리가 비어있으면 None을 반환한다.
+
+    :return: 가장 작은/큰 element, 트리가 비어있다면 None
     """
-    _search_sub(self,node,element)는 search(self,element)에서 호출되어 각 노드간의 element를 비교하며 root에서 element를 찾을때까지 재귀적으로 호출되고 만약 찾으면 그 노드의 element를 return, 찾지 못하면 None을 리턴한다.
+    def min(self):
+        return None if self._root is None else self._item_of(self._first(self._root))
+
+    def max(self):
+        return None if self._root is None else self._item_of(self._last(self._root))
+
+    def pop_min(self):
+        return None if self._root is None else self._pop_node(self._first(self._root))
+
+    def pop_max(self):
+        return None if self._root is None else self._pop_node(self._last(self._root))
+
+    """
+    _find_node(self, element)는 search와 delete가 함께 사용하는 탐색 함수로, root에서부터 반복문으로 내려가며 element를 가진 노드를 찾아 그 노드를 반환한다. 재귀 호출을 하지 않으므로 level마다 함수 호출 비용이 들지 않고, 각 level에서는 element < 노드의 element, 노드의 element < element 두 번의 비교만 한다. 두 비교가 모두 거짓이면 두 값이 같은 것이므로 == 비교는 따로 하지 않는다.
     
-    :param node: 이 노드는 검색 시점에 있는 노드이며 이 노드의 element와 찾고자 하는 element와의 비교를 통해 찾고자 하는 노드를 찾아간다.
-    :return: node를 찾으면 node._element를 return, 찾지 못하면 None을 return
-    """
-    def _search_sub(self, node, element):
-        if node._element == element:
-            return node._element
-        elif node._element < element:
-            if node._right == None:
-                return None
+    :param element: 찾고자 하는 노드의 element
+    :return: 노드를 찾는다면 노드를 return, 찾지 못한다면(트리가 비어있는 경우 포함) None을 return
+    """
+    def _find_node(self, element):
+        node = self._root
+        while node is not None:
+            current = node._element
+            if element < current:
+                node = node._left
+            elif current < element:
+                node = node._right
             else:
-                return self._search_sub(node._right, element)
-        elif node._element > element:
-            if node._left == None:
-                return None
+                return node
+        return None
+
+    """
+    search_many(self, elements)는 여러 element를 한번에 search하여 각 결과를 입력과 같은 순서의 리스트로 반환한다. contains_many(self, elements)는 각 element가 트리에 있는지를 bool의 리스트로 반환한다. 두 함수 모두 self._find_nodes를 사용한다.
+
+    :param elements: 찾고자 하는 element들의 iterable
+    :return: 입력 순서대로 찾은 element(없으면 None) 또는 bool의 리스트
+    """
+    def search_many(self, elements):
+        item_of = self._item_of
+        return [None if node is None else item_of(node) for node in self._find_nodes(elements)]
+
+    def contains_many(self, elements):
+        return [node is not None for node in self._find_nodes(elements)]
+
+    """
+    _find_nodes(self, elements)는 element들을 정렬한 뒤 작은 것부터 차례로 찾으면서, 바로 전에 찾을 때 내려갔던 경로(path)를 재사용하는 finger search 방식으로 노드들을 찾는다.
+    path에는 직전 탐색에서 지나온 노드들과, 각 노드를 root로 하는 subtree에 들어있는 element의 상한(bounds, 그 노드로 가는 길에 마지막으로 왼쪽으로 꺾은 조상의 element이며 None이면 상한이 없음)을 함께 저장한다. 다음 element는 이전 element 이상이므로 하한은 항상 만족하고, 상한이 다음 element 이하인 노드들만 path에서 빼낸 뒤 남은 가장 아래 노드에서부터 다시 내려가면 된다. 그래서 서로 가까운 element들은 root부터 다시 내려가지 않고 공통 경로를 함께 사용한다.
+    결과는 입력의 원래 순서대로 돌려준다.
+
+    :param elements: 찾고자 하는 element들의 iterable
+    :return: 입력 순서대로 찾은 노드(없으면 None)의 리스트
+    """
+    def _find_nodes(self, elements):
+        elements = list(elements) if self._key is None else list(map(self._key, elements))
+        result = [None] * len(elements)
+        path = []
+        bounds = []
+        for index in sorted(range(len(elements)), key=elements.__getitem__):
+            element = elements[index]
+            while bounds and bounds[-1] is not None and not element < bounds[-1]:
+                path.pop()
+                bounds.pop()
+            if path:
+                node = path.pop()
+                bound = bounds.pop()
             else:
-                return self._search_sub(node._left, element)
-    
+                node = self._root
+                bound = None
+            while node is not None:
+                path.append(node)
+                bounds.append(bound)
+                current = node._element
+                if element < current:
+                    bound = current
+                    node = node._left
+                elif current < element:
+                    node = node._right
+                else:
+                    result[index] = node
+                    break
+        return result
+
     """
     insert(self, element)는 우선 root가 없는, 즉 트리에 아무 노드도 없을때 insert를 해주는 경우와 그렇지 않을때 insert를 해주는 경우로 나눈다. 첫 경우에서는, insert하고자 하는 element를 가지는 node를 만들어주고 나서 해당 노드를 루트 노드로 지정하고 self._size에 1을 더해준다. 두번째 경우에서는 insert하고자 하는 element를 가지는 노드를 만들어주고 나서 노드가 들어가야할 위치를 찾고 노드를 insert해주는 self._search_n_add_for_insert를 호출하고 그 뒤에 double red 상황이 발생할시 이를 self._process_double_red를 호출하여 해결해주고 self._size를 1 더해준다.
     추가적으로, 이 insert function의 경우 자료구조 강의에서의 설명에 따라 넣어주는 위치가 root인 경우에는 black node를 넣어주고 그 외의 경우에는 red node를 넣어주게 된다.
@@ -63,77 +686,97 @@ class RedBlackTree():
     :param element: 트리에 insert 해주고자 하는 element를 의미한다.
     """
     def insert(self, element):
+        self._insert_node(self._new_node(element))
+
+    """
+    _insert_node(self, node)는 insert의 실제 과정을 수행하는 함수로, 이미 만들어진 노드를 받아서 트리에 넣어준다. element 외에 다른 정보(예: RedBlackMap의 value)를 가진 노드를 넣어야 하는 subclass에서 노드를 직접 만든 뒤 이 함수를 호출할 수 있도록 insert에서 분리하였다. 노드의 색상은 위치에 따라 이 함수에서 정해진다.
+
+    :param node: 트리에 넣을 노드
+    """
+    def _insert_node(self, node):
         if self._root == None:
-            sub1 = self._Node(element, color=self._Node.BLACK)
+            sub1 = node
+            sub1._color = self._Node.BLACK
             self._root = sub1
             self._size +=1
+            if self._augmented:
+                self._update(sub1)
             
         else:
-            sub2 = self._Node(element, color=self._Node.RED)
+            sub2 = node
+            sub2._color = self._Node.RED
             self._search_n_add_for_insert(sub2)
             if sub2._parent._color == self._Node.RED and sub2._color == self._Node.RED:
                 self._process_double_red(sub2)
             self._size +=1
+            if self._augmented:
+                self._update_path(sub2)
+        self._last_touched = node
                 
     """
-    _search_n_add_for_insert(self, node)의 경우에는 해당하는 노드가 들어가야할 위치를 찾아주고 그 위치에 노드를 넣어주는 기능을 하는 함수로, 먼저 search 부분부터 설명하자면, search_point는 위에서 진행하였던 search에서처럼 처음에 self._root로 잡아주고 tmp_parent라는 변수를 만들게 된다. 이 변수를 만드는 이유는 위에서 진행했던 search처럼만 진행하게 된다면 넣어줄 위치를 찾게 되는 것이라 결국 없는 노드에 대한 search가 이루어지게 되어서 None이 리턴될 것이기 때문에 넣어주기 직전의 위치를 찾는다고 생각하면 쉽다. 그래서 처음에는 tmp_parent의 초기값을 None으로 설정해주고 while문과 그 안의 내용이 돌아가면서 tmp_parent를 node._element가 들어가야할 노드의 직전 노드로 업데이트 해준다. while문 뒤에 node._parent를 tmp_parent로 업데이트 해주고 이 node._parent의 element와 넣고자 하는 element와의 비교를 통해 node._parent의 왼쪽과 오른쪽 중 어디에 들어가야 할지를 알아낸 뒤에 그 자리에 node를 넣어준다. (node._parent의 child로 연결시켜준다.)
+    _search_n_add_for_insert(self, node)의 경우에는 해당하는 노드가 들어가야할 위치를 찾아주고 그 위치에 노드를 넣어주는 기능을 하는 함수로, 먼저 search 부분부터 설명하자면, search_point는 위에서 진행하였던 search에서처럼 처음에 self._root로 잡아주고 tmp_parent라는 변수를 만들게 된다. 이 변수를 만드는 이유는 위에서 진행했던 search처럼만 진행하게 된다면 넣어줄 위치를 찾게 되는 것이라 결국 없는 노드에 대한 search가 이루어지게 되어서 None이 리턴될 것이기 때문에 넣어주기 직전의 위치를 찾는다고 생각하면 쉽다. 그래서 처음에는 tmp_parent의 초기값을 None으로 설정해주고 while문과 그 안의 내용이 돌아가면서 tmp_parent를 node._element가 들어가야할 노드의 직전 노드로 업데이트 해준다. while문 뒤에 node._parent를 tmp_parent로 업데이트 해주고, 마지막으로 내려간 방향(go_left)에 따라 node._parent의 왼쪽 또는 오른쪽 자리에 node를 넣어준다. (node._parent의 child로 연결시켜준다.) 마지막 방향을 기억해두므로 element를 다시 비교할 필요가 없고, 같은 element가 이미 있는 경우에도 내려간 방향(오른쪽)과 같은 자리에 연결된다. 각 level에서는 < 비교를 한번만 한다.
     
     :param node: insert 하고자하는 노드를 의미한다.
     """
     def _search_n_add_for_insert(self, node):
         search_point = self._root
         tmp_parent = None
-        while search_point:
+        go_left = False
+        while search_point is not None:
             tmp_parent = search_point
-            if search_point._element > node._element:
+            go_left = node._element < search_point._element
+            if go_left:
                 search_point = search_point._left
             else:
                 search_point = search_point._right
         node._parent = tmp_parent
-        if node._parent._element < node._element:
-            node._parent._right = node
+        if go_left:
+            tmp_parent._left = node
         else:
-            node._parent._left = node
+            tmp_parent._right = node
 
     """
-    _process_double_red의 경우 node를 넣음으로써 발생한 double red 상황을 처리하기 위한 함수로 parent의 형제 노드의 색상에 따라서 경우의 수가 우선 나뉜다. 부모의 형제 노드의 색상이 black인 경우(none인 경우를 포함) 단지 구조가 맞지 않는 케이스인 것이기 때문에 reconstruct를 하는 작업이 요구된다. 이때, node._parent와 node._parent._parent간의 연결 관계, node와 node._parent간의 연결 관계, 즉 왼쪽 자식인지 오른쪽 자식인지에 따라 경우의 수가 나뉘고 그 경우에 따라 reconstruct 하기 전 색상을 바꾸어 주어야 하는 위치가 달라지게 된다. node._parent와 node._parent._parent간의 연결 관계가 node와 node._parent간의 연결 관계에서도 유지되는 경우(right-right, left-left)에는 node color는 red, parent color는 black, parent의 parent 컬러는 red로 바꾸어주고 reconstruct를 진행해주게 되고, 그 연결관계가 유지되지 않는 경우(right-left, left-right)에는 node color는 black, node parent color는 red, node parent의 parent color는 red로 하여서 reconstruct를 진행해주게 된다. 만약 부모의 형제 노드의 색상이 red인 경우는 overflow에 해당하는 경우로 split에 해당하는 recoloring 작업이 이루어져야 한다. 따라서 self._recoloring_for_insert를 해주고 이에 따라 node의 parent의 parent가 red가 되었을텐데 node의 parent의 parent의 parent가 다시 red의 경우 다시 double red의 상황이므로 다시 self._process_double_red를 node의 parent의 parent 자리에서 진행한다. 여기서 node._parent._parent._parent가 None인 경우 그 색깔이 없어서 오류가 나올수도 있으므로 그 이전에 node._parent._parent._parent가 None인지 아닌지를 확인해준다.
+    _process_double_red의 경우 node를 넣음으로써 발생한 double red 상황을 처리하기 위한 함수로 parent의 형제 노드의 색상에 따라서 경우의 수가 우선 나뉜다. 부모의 형제 노드의 색상이 black인 경우(none인 경우를 포함) 단지 구조가 맞지 않는 케이스인 것이기 때문에 reconstruct를 하는 작업이 요구된다. 이때, node._parent와 node._parent._parent간의 연결 관계, node와 node._parent간의 연결 관계, 즉 왼쪽 자식인지 오른쪽 자식인지에 따라 경우의 수가 나뉘고 그 경우에 따라 reconstruct 하기 전 색상을 바꾸어 주어야 하는 위치가 달라지게 된다. node._parent와 node._parent._parent간의 연결 관계가 node와 node._parent간의 연결 관계에서도 유지되는 경우(right-right, left-left)에는 node color는 red, parent color는 black, parent의 parent 컬러는 red로 바꾸어주고 reconstruct를 진행해주게 되고, 그 연결관계가 유지되지 않는 경우(right-left, left-right)에는 node color는 black, node parent color는 red, node parent의 parent color는 red로 하여서 reconstruct를 진행해주게 된다. 만약 부모의 형제 노드의 색상이 red인 경우는 overflow에 해당하는 경우로 split에 해당하는 recoloring 작업이 이루어져야 한다. 따라서 self._recoloring_for_insert를 해주고 이에 따라 node의 parent의 parent가 red가 되었을텐데 node의 parent의 parent의 parent가 다시 red의 경우 다시 double red의 상황이므로 node의 parent의 parent 자리에서 같은 과정을 반복한다. 재귀 호출 대신 node를 node의 parent의 parent로 바꾸고 while문을 다시 도는 방식으로 구현하여 트리가 깊어도 호출 stack이 쌓이지 않는다. 여기서 node._parent._parent._parent가 None인 경우 그 색깔이 없어서 오류가 나올수도 있으므로 그 이전에 node._parent._parent._parent가 None인지 아닌지를 확인해준다. 부모의 형제 노드는 반복마다 한번만 구해서 uncle에 저장해둔다.
     
     :param node: double red가 발생한 위치의 노드를 이야기한다. (double red 노드 둘 중 아래에 위치하게 되는 노드)
     """
     def _process_double_red(self, node):
-        if self._sibiling(node._parent) == None or self._sibiling(node._parent)._color == self._Node.BLACK:
-            if node._parent._right == node and node._parent._parent._right == node._parent:
-                node._color = self._Node.RED
-                node._parent._color = self._Node.BLACK
-                node._parent._parent._color = self._Node.RED
-                self._reconstruct(node)
-                
-            elif node._parent._left == node and node._parent._parent._left == node._parent:
-                node._color = self._Node.RED
-                node._parent._color = self._Node.BLACK
-                node._parent._parent._color = self._Node.RED
-                self._reconstruct(node)
-                
-            elif node._parent._right == node and node._parent._parent._left == node._parent:
-                node._color = self._Node.BLACK
-                node._parent._color = self._Node.RED
-                node._parent._parent._color = self._Node.RED
-                self._reconstruct(node)
+        while True:
+            uncle = self._sibiling(node._parent)
+            if uncle == None or uncle._color == self._Node.BLACK:
+                if node._parent._right == node and node._parent._parent._right == node._parent:
+                    node._color = self._Node.RED
+                    node._parent._color = self._Node.BLACK
+                    node._parent._parent._color = self._Node.RED
+                    self._reconstruct(node)
+                    
+                elif node._parent._left == node and node._parent._parent._left == node._parent:
+                    node._color = self._Node.RED
+                    node._parent._color = self._Node.BLACK
+                    node._parent._parent._color = self._Node.RED
+                    self._reconstruct(node)
+                    
+                elif node._parent._right == node and node._parent._parent._left == node._parent:
+                    node._color = self._Node.BLACK
+                    node._parent._color = self._Node.RED
+                    node._parent._parent._color = self._Node.RED
+                    self._reconstruct(node)
+                    
+                elif node._parent._left == node and node._parent._parent._right == node._parent:
+                    node._color = self._Node.BLACK
+                    node._parent._color = self._Node.RED
+                    node._parent._parent._color = self._Node.RED
+                    self._reconstruct(node)
+                return
                 
-            elif node._parent._left == node and node._parent._parent._right == node._parent:
-                node._color = self._Node.BLACK
-                node._parent._color = self._Node.RED
-                node._parent._parent._color = self._Node.RED
-                self._reconstruct(node)
-            
-        elif self._sibiling(node._parent)._color == self._Node.RED:
             self._recoloring_for_insert(node)
-            if node._parent._parent._parent != None:
-                if node._parent._parent._parent._color == self._Node.RED:
-                    self._process_double_red(node._parent._parent)
+            grandparent = node._parent._parent
+            if grandparent._parent == None or grandparent._parent._color != self._Node.RED:
+                return
+            node = grandparent
         
     """
-    delete(self, element)는 element에 해당하는 노드를 트리에서 끊어주는 기능을 하는 함수이다. 즉, 트리에서 해당 element를 remove한다. 그 기능을 수행하기 위해서, 먼저 self._search_for_delete(element)를 통해 지우고자 하는 target 노드를 잡아준다. 여기서 새로운 search를 또 구현한 이유는 이전 search는 element를 return 했기 때문이다. 그리고 나서 지워진 element를 리턴하는 기능도 구현해야되기 때문에 A 변수에 target 노드의 element를 담아주고 지워주는 기능을 모두 수행한 뒤에 이를 return 한다.
+    delete(self, element)는 element에 해당하는 노드를 트리에서 끊어주는 기능을 하는 함수이다. 즉, 트리에서 해당 element를 remove한다. 그 기능을 수행하기 위해서, 먼저 self._find_node(element)를 통해 지우고자 하는 target 노드를 잡아준다. (search는 element를 return하므로 노드를 return하는 self._find_node를 사용한다.) target이 없다면 None을 return한다. 그리고 나서 지워진 element를 리턴하는 기능도 구현해야되기 때문에 A 변수에 target 노드의 element를 담아주고 지워주는 기능을 모두 수행한 뒤에 이를 return 한다.
     본격적으로 지워지는 기능 수행 과정을 보면, 먼저 지워지는 노드의 자식이 모두 없는 경우(case1), 자식이 모두 있는 경우(case2), 한쪽 자식만 있는 경우(case3)로 나뉘게 된다.
     
     case1: target 노드의 자식이 모두 없는 경우에서 target 노드가 루트인 경우에는 target의 element는 None으로 바꾸어주고 self._root도 None으로 바꾸어준다. 그리고 self._size를 1 빼준다. target의 color가 black인 경우에는 먼저 target 노드를 지우기 전에 self._process_double_black을 호출하여 target이 지워진 이후 상황에서 발생하는 double black을 처리해주고 그 뒤에 target이 parent의 왼쪽인지 오른쪽인지에 따라 케이스를 나누고 parent의 child자리에서 제외시킨다.(None 처리) 그 뒤에 self._size를 1 빼준다. 만약 target의 color가 red인 경우에는 앞선 경우에서 self_process_double black을 하는 단계를 제외한 나머지 단계를 진행해주면 된다.
@@ -150,7 +793,29 @@ class RedBlackTree():
     :return: 지운 target 노드의 element
     """
     def delete(self, element):        
-        target = self._search_for_delete(element)
+        target = self._find_node(self._key_of(element))
+        if target is None:
+            return None
+        return self._pop_node(target)
+
+    """
+    _pop_node(self, node)는 delete, pop_min, pop_max가 이미 찾아둔 node를 지우고 그 element를 반환할 때 사용한다.
+    """
+    def _pop_node(self, node):
+        if self._key is None:
+            return self._delete_node(node)
+        # _delete_node는 node에 successor의 내용을 복사할 수 있으므로 지우기 전에 element를 꺼내둔다.
+        item = node._item
+        self._delete_node(node)
+        return item
+
+    """
+    _delete_node(self, target)는 delete의 실제 과정(위에서 설명한 case1, case2, case3)을 수행하는 함수로, 이미 찾아둔 target 노드를 트리에서 지우고 그 element를 반환한다. 노드를 이미 알고 있는 경우(예: RedBlackMap.pop) 다시 탐색하지 않도록 delete에서 분리하였다.
+
+    :param target: 지우고자 하는 노드
+    :return: 지운 노드의 element
+    """
+    def _delete_node(self, target):
         A = target._element
         if target._right == None and target._left == None:
             if target == self._root:
@@ -179,7 +844,7 @@ class RedBlackTree():
             if self._successor(target)._color == self._Node.BLACK:
                 if self._successor(target) == self._successor(target)._parent._right:
                     if self._successor(target)._right == None:
-                        target._element = self._successor(target)._element
+                        self._copy_element(target, self._successor(target))
                         target = self._successor(target)
                         self._process_double_black(target)
                         if target == target._parent._left:
@@ -188,7 +853,7 @@ class RedBlackTree():
                             target._parent._right = None
                         self._size -= 1 
                     elif self._successor(target)._right != None:
-                        target._element = self._successor(target)._element
+                        self._copy_element(target, self._successor(target))
                         target = self._successor(target)
                         target._right._parent = target._parent
                         target._parent._right = target._right
@@ -197,7 +862,7 @@ class RedBlackTree():
                         
                 elif self._successor(target) == self._successor(target)._parent._left:
                     if self._successor(target)._right == None:
-                        target._element = self._successor(target)._element
+                        self._copy_element(target, self._successor(target))
                         target = self._successor(target)
                         self._process_double_black(target)
                         if target == target._parent._left:
@@ -206,7 +871,7 @@ class RedBlackTree():
                             target._parent._right = None
                         self._size -= 1 
                     elif self._successor(target)._right != None:
-                        target._element = self._successor(target)._element
+                        self._copy_element(target, self._successor(target))
                         target = self._successor(target)
                         target._right._parent = target._parent
                         target._parent._left = target._right
@@ -216,24 +881,24 @@ class RedBlackTree():
             elif self._successor(target)._color == self._Node.RED:
                 if self._successor(target) == self._successor(target)._parent._right:
                     if self._successor(target)._right == None:
-                        target._element = self._successor(target)._element
+                        self._copy_element(target, self._successor(target))
                         target = self._successor(target)
                         target._parent._right = None
                         self._size -= 1 
                     elif self._successor(target)._right != None:
-                        target._element = self._successor(target)._element
+                        self._copy_element(target, self._successor(target))
                         target = self._successor(target)
                         target._right._parent = target._parent
                         target._parent._right = target._right
                         self._size -= 1 
                 elif self._successor(target) == self._successor(target)._parent._left:
                     if self._successor(target)._right == None:
-                        target._element = self._successor(target)._element
+                        self._copy_element(target, self._successor(target))
                         target = self._successor(target)
                         target._parent._left = None
                         self._size -= 1 
                     elif self._successor(target)._right != None:
-                        target._element = self._successor(target)._element
+                        self._copy_element(target, self._successor(target))
                         target = self._successor(target)
                         target._right._parent = target._parent
                         target._parent._left = target._right
@@ -319,42 +984,15 @@ class RedBlackTree():
                 else:
                     target._parent._left = target._left
                     self._size -= 1
+
+        # target은 이제 트리에서 실제로 빠진 노드이므로, 그 부모부터 root까지의 subtree 정보를 다시 계산한다.
+        if self._augmented:
+            self._update_path(target._parent)
+        self._last_touched = target._parent
         
         return A
     
     """
-    _search_for_delete(self,element)는 기존 search(self,element)와 유사한 구조를 가지고 있지만 element가 아닌 노드를 return하기 위한 목적으로 구현된 self._sub_search_for_delete과 연결되어 있다는 점에서 다르다. 결론적으로 이 함수 역시 루트가 None, 즉 트리가 비어있다면 None을 return하고 그렇지 않은 경우에 self._sub_search_for_delete을 호출한다.
-    
-    :param element: 지우기 이전에 찾는 단계에서 찾고자 하는 노드의 element를 의미한다.
-    :return: 노드를 찾지 못한다면 None을 return, self._sub_search_for_delete에 의해서 노드를 찾는다면 해당 노드를 return 한다.
-    """
-    def _search_for_delete(self, element):
-        if self._root == None:
-            return None
-        else:
-            return self._sub_search_for_delete(self._root, element)
-    
-    """
-    _sub_search_for_delete(self,node,element)는 _search_sub과 그 과정이 거의 동일하나 찾은 노드의 element가 아닌 노드를 return 한다는 점에서 차이가 있다. (따라서 과정에 대한 설명은 _search_sub을 참고하면 이해할 수 있다.)
-    
-    :param node: search 시점의 노드
-    :param element: 찾고자 하는 노드의 element
-    :return: 노드를 찾는다면 노드를 return, 찾지 못한다면 None을 return
-    """
-    def _sub_search_for_delete(self, node, element):
-        if node._element == element:
-            return node
-        elif node._element < element:
-            if node._right == None:
-                return None
-            else:
-                return self._sub_search_for_delete(node._right, element)
-        elif node._element > element:
-            if node._left == None:
-                return None
-            else:
-                return self._sub_search_for_delete(node._left, element)
-    """
     _process_double_black(self, node)는 node 자리에서 발생한 double black을 처리하기 위한 함수이다. 우선 이 노드에서 처음 조건문으로 self._sibiling이 None인지를 확인하는데 만약 None인 경우에는 node를 포함한 subtree의 반대편 subtree에 노드가 없음을 의미하므로 double black 처리가 필요해지지 않는 상황이 되어서 pass 처리를 해준다.
     노드의 형제노드가 None이 아니라면 그 형제노드의 색상이 블랙인지 레드인지에 따라 나누고 블랙인 경우에는 그 형제노드의 자식이 모두 블랙인지(여기선, 블랙인 경우에는 None인 경우를 포함) 아니면 그 자식들 중 레드가 있는지에 따라서 경우를 다시 나누어 처리를 하게 된다. 여기서 이 경우의 수에 따른 처리에 따라 형제노드의 색상이 블랙이며 형제 노드가 red 자식을 가지는 경우를 _process_double_black_01로 처리하였으며 형제노드의 색상이 블랙이며 형제 노드의 자식이 모두 black인 경우에 대해서 _process_double_black_02로 처리하였다. 그리고 형제노드의 색상이 red인 경우에는 _process_double_black 내부에서 처리하였다.
     
@@ -528,6 +1166,9 @@ class RedBlackTree():
             
             child._right = parent
             parent._parent = child
+            if self._augmented:
+                self._update(parent)
+                self._update(child)
             
         elif self._node_is_right(node):
             child = node
@@ -552,6 +1193,9 @@ class RedBlackTree():
                 
             child._left = parent
             parent._parent = child
+            if self._augmented:
+                self._update(parent)
+                self._update(child)
             
     """
     _node_is_right(self, node)의 경우 rotate에서 node가 node의 parent의 왼쪽 자식인지 오른쪽 자식인지 쉽게 구분하는데 사용하기 위해 만든 함수로, node가 node의 parent의 오른쪽 자식이면 True, 그렇지 않으면 False를 return 한다.
@@ -581,6 +1225,157 @@ class RedBlackTree():
         
          
         
+    """
+    iter_inorder(self)는 트리의 element들을 오름차순으로 yield하는 lazy generator이다. 리스트를 만들지 않으므로 큰 트리도 O(n) 시간, O(1) 추가 메모리로 훑을 수 있다. __iter__도 이 함수를 그대로 사용한다.
+
+    :yield: 트리의 element들을 오름차순으로 yield한다.
+    """
+    def iter_inorder(self):
+        return map(self._item_of, self._iter_nodes(self._root))
+
+    def __iter__(self):
+        return self.iter_inorder()
+
+    """
+    __reversed__(self)는 트리의 element들을 내림차순으로 yield한다. reversed(tree)로 사용한다.
+
+    :yield: 트리의 element들을 내림차순으로 yield한다.
+    """
+    def __reversed__(self):
+        return map(self._item_of, self._iter_nodes_reversed(self._root))
+
+    """
+    irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False)는 lo와 hi 사이에 있는 element들을 정렬 순서대로 yield하는 generator이다. 시작 위치를 찾을 때만 root에서 한번 내려가고(O(log n)) 그 뒤로는 _parent link를 따라 이웃 노드로 이동하므로, 범위 안에 k개의 element가 있다면 전체 비용은 O(log n + k)이다.
+    lo나 hi가 None이면 해당 방향으로는 범위 제한이 없는 것으로 본다. reverse가 True라면 hi 쪽에서 시작하여 내림차순으로 yield한다.
+
+    :param lo: 범위의 하한, None이면 하한이 없다.
+    :param hi: 범위의 상한, None이면 상한이 없다.
+    :param inclusive: (하한 포함 여부, 상한 포함 여부)
+    :param reverse: True이면 내림차순으로 yield한다.
+    :yield: 범위 안에 있는 element들을 yield한다.
+    """
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        return map(self._item_of, self._irange_nodes(lo, hi, inclusive, reverse))
+
+    """
+    _irange_nodes(self, lo, hi, inclusive, reverse)는 irange와 같은 방식으로 범위 안의 element를 가진 노드들을 yield한다. irange와 delete_range 등에서 사용한다.
+
+    :yield: 범위 안에 있는 노드들을 yield한다.
+    """
+    def _irange_nodes(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        lo_inclusive, hi_inclusive = inclusive
+        if not reverse:
+            if lo is None:
+                node = None if self._root is None else self._first(self._root)
+            elif lo_inclusive:
+                node = self._lower_bound(lo)
+            else:
+                node = self._upper_bound(lo)
+            while node is not None:
+                if hi is not None:
+                    if hi_inclusive and hi < node._element:
+                        return
+                    if not hi_inclusive and not node._element < hi:
+                        return
+                yield node
+                node = self._next_node(node)
+        else:
+            if hi is None:
+                node = None if self._root is None else self._last(self._root)
+            elif hi_inclusive:
+                node = self._floor_node(hi)
+            else:
+                node = self._lower_node(hi)
+            while node is not None:
+                if lo is not None:
+                    if lo_inclusive and node._element < lo:
+                        return
+                    if not lo_inclusive and not lo < node._element:
+                        return
+                yield node
+                node = self._prev_node(node)
+
+    """
+    cursor(self, key=None)는 트리 위를 움직일 수 있는 Cursor 객체를 만들어 반환한다. key가 주어지면 key 이상인 가장 작은 element에, key가 None이면 가장 작은 element에 위치한 cursor를 만든다.
+
+    :param key: cursor의 시작 위치를 정할 key, None이면 가장 작은 element에서 시작한다.
+    :return: Cursor 객체
+    """
+    def cursor(self, key=None):
+        if key is None:
+            node = None if self._root is None else self._first(self._root)
+        else:
+            node = self._lower_bound(key)
+        return self.Cursor(self, node)
+
+    """
+    _update(self, node)는 node의 두 자식에 저장된 정보로부터 node에 저장할 subtree 정보(예: subtree의 크기)를 다시 계산하는 hook이다. 기본 RedBlackTree는 아무 정보도 저장하지 않으므로 아무 일도 하지 않고, _augmented가 True인 subclass에서 구현한다.
+    _rotate는 자리가 바뀐 두 노드에 대해, insert와 delete는 구조가 바뀐 위치부터 root까지의 경로에 대해 이 함수를 호출하므로 정보가 항상 O(log n)개의 노드에 대해서만 다시 계산된다.
+
+    :param node: subtree 정보를 다시 계산할 노드
+    """
+    def _update(self, node):
+        pass
+
+    """
+    _update_path(self, node)는 node부터 root까지 올라가면서 각 노드에 대해 self._update를 호출한다. 자식의 정보가 먼저 계산되어야 하므로 아래에서 위로 올라간다.
+
+    :param node: 정보를 다시 계산하기 시작할 노드, None이면 아무 일도 하지 않는다.
+    """
+    def _update_path(self, node):
+        while node is not None:
+            self._update(node)
+            node = node._parent
+
+    """
+    _copy_element(self, dst, src)는 delete에서 target을 successor의 element로 바꾸어줄 때 사용하는 함수로 src 노드의 element를 dst 노드로 복사한다. 노드에 element 외의 정보(예: RedBlackMap의 value)를 저장하는 subclass는 이 함수를 override하여 그 정보도 함께 복사한다.
+
+    :param dst: element를 받을 노드
+    :param src: element를 줄 노드
+    """
+    def _copy_element(self, dst, src):
+        dst._element = src._element
+        if self._key is not None:
+            dst._item = src._item
+
+    """
+    _new_node(self, element)는 element를 저장할 새 노드를 만든다. key 함수가 주어진 트리라면 key를 한번 계산하여 _element에, element는 _item에 저장한다.
+
+    :param element: 노드에 저장할 element
+    :return: 만들어진 노드
+    """
+    def _new_node(self, element):
+        if self._key is None:
+            return self._Node(element)
+        node = self._Node(self._key(element))
+        node._item = element
+        return node
+
+    """
+    _key_of(self, element)는 트리 안에서 element를 찾을 때 비교에 사용할 값(key 함수가 없으면 element 그대로)을 반환한다.
+    """
+    def _key_of(self, element):
+        return element if self._key is None else self._key(element)
+
+    """
+    _keyed_node_class(cls)는 cls._Node에 _item 자리를 추가한 노드 class를 반환한다. subclass마다 노드 class가 다르므로(예: OrderStatisticTree의 _count) 처음 요청될 때 만들어 _keyed_node_classes에 저장해둔다.
+
+    :return: _item 자리를 가진 노드 class
+    """
+    @classmethod
+    def _keyed_node_class(cls):
+        base = cls._Node
+        node_class = RedBlackTree._keyed_node_classes.get(base)
+        if node_class is None:
+            node_class = type('_KeyedNode', (base,), {
+                '__slots__': ('_item',),
+                '__doc__': 'Node that also stores the element whose key is kept in _element.',
+                '__qualname__': base.__qualname__ + '._KeyedNode',
+                '__module__': base.__module__,
+            })
+            RedBlackTree._keyed_node_classes[base] = node_class
+        return node_class
+
     # BONUS FUNCTIONS -- use them freely if you want
     def _is_black(self, node):
         return node == None or node._color == self._Node.BLACK
@@ -599,6 +1394,505 @@ class RedBlackTree():
         else:
             return parent._left
 
+    """
+    _first(self, node)와 _last(self, node)는 node를 root로 하는 subtree에서 가장 작은 element를 가진 노드(가장 왼쪽 노드)와 가장 큰 element를 가진 노드(가장 오른쪽 노드)를 반환한다.
+
+    :param node: 탐색을 시작할 subtree의 root 노드
+    :return: subtree의 가장 왼쪽/오른쪽 노드
+    """
+    def _first(self, node):
+        while node._left is not None:
+            node = node._left
+        return node
+
+    def _last(self, node):
+        while node._right is not None:
+            node = node._right
+        return node
+
+    """
+    _next_node(self, node)와 _prev_node(self, node)는 트리 전체에서 node의 바로 다음/이전 노드를 반환한다. 오른쪽(왼쪽) 자식이 있을 때만 동작하는 _successor와 달리, 자식이 없으면 _parent link를 따라 올라가서 찾는다. 다음/이전 노드가 없으면 None을 반환한다.
+
+    :param node: 기준이 되는 노드
+    :return: 정렬 순서상 바로 다음/이전 노드, 없다면 None
+    """
+    def _next_node(self, node):
+        if node._right is not None:
+            return self._first(node._right)
+        parent = node._parent
+        while parent is not None and node is parent._right:
+            node = parent
+            parent = parent._parent
+        return parent
+
+    def _prev_node(self, node):
+        if node._left is not None:
+            return self._last(node._left)
+        parent = node._parent
+        while parent is not None and node is parent._left:
+            node = parent
+            parent = parent._parent
+        return parent
+
+    """
+    _lower_bound(self, key)는 element가 key 이상인 노드 중 가장 왼쪽 노드를, _upper_bound(self, key)는 element가 key보다 큰 노드 중 가장 왼쪽 노드를 반환한다. root에서 한번만 내려가며, 조건을 만족하는 노드를 만나면 후보로 기억해두고 왼쪽으로, 그렇지 않으면 오른쪽으로 내려간다.
+
+    :param key: 기준이 되는 key
+    :return: 조건을 만족하는 가장 왼쪽 노드, 없다면 None
+    """
+    def _lower_bound(self, key):
+        node = self._root
+        found = None
+        while node is not None:
+            if node._element < key:
+                node = node._right
+            else:
+                found = node
+                node = node._left
+        return found
+
+    def _upper_bound(self, key):
+        node = self._root
+        found = None
+        while node is not None:
+            if key < node._element:
+                found = node
+                node = node._left
+            else:
+                node = node._right
+        return found
+
+    """
+    _floor_node(self, key)는 element가 key 이하인 노드 중 가장 오른쪽 노드를, _lower_node(self, key)는 element가 key보다 작은 노드 중 가장 오른쪽 노드를 반환한다. _lower_bound/_upper_bound와 좌우만 반대이다.
+
+    :param key: 기준이 되는 key
+    :return: 조건을 만족하는 가장 오른쪽 노드, 없다면 None
+    """
+    def _floor_node(self, key):
+        node = self._root
+        found = None
+        while node is not None:
+            if key < node._element:
+                node = node._left
+            else:
+                found = node
+                node = node._right
+        return found
+
+    def _lower_node(self, key):
+        node = self._root
+        found = None
+        while node is not None:
+            if node._element < key:
+                found = node
+                node = node._right
+            else:
+                node = node._left
+        return found
+
+    """
+    _iter_nodes(self, node)는 node를 root로 하는 subtree의 노드들을 in-order 순서로 yield하는 generator이다. 재귀나 별도의 stack 없이 _parent link를 따라 올라가는 방식으로 다음 노드를 찾기 때문에 추가 메모리는 O(1)이고, 각 edge를 내려갈 때 한번, 올라갈 때 한번만 지나므로 전체 순회는 O(n)이다.
+    다음 노드를 찾는 방법은 다음과 같다. 현재 노드에 오른쪽 자식이 있다면 오른쪽 subtree의 가장 왼쪽 노드가 다음 노드이다. 오른쪽 자식이 없다면 부모를 따라 올라가다가 처음으로 왼쪽 자식 쪽에서 올라오게 되는 조상이 다음 노드이다. subtree의 root의 부모(stop)에 도달하면 순회가 끝난다.
+    순회 도중에 트리가 insert/delete로 바뀌는 경우의 동작은 보장하지 않는다.
+
+    :param node: 순회할 subtree의 root 노드
+    :yield: subtree의 노드들을 in-order 순서로 yield한다.
+    """
+    def _iter_nodes(self, node):
+        if node is None:
+            return
+        stop = node._parent
+        node = self._first(node)
+        while node is not stop:
+            yield node
+            if node._right is not None:
+                node = self._first(node._right)
+            else:
+                child = node
+                node = node._parent
+                while node is not stop and child is node._right:
+                    child = node
+                    node = node._parent
+
+    """
+    _iter_nodes_reversed(self, node)는 _iter_nodes와 좌우만 반대로 하여 subtree의 노드들을 역순(reverse in-order)으로 yield한다.
+
+    :param node: 순회할 subtree의 root 노드
+    :yield: subtree의 노드들을 역순으로 yield한다.
+    """
+    def _iter_nodes_reversed(self, node):
+        if node is None:
+            return
+        stop = node._parent
+        node = self._last(node)
+        while node is not stop:
+            yield node
+            if node._left is not None:
+                node = self._last(node._left)
+            else:
+                child = node
+                node = node._parent
+                while node is not stop and child is node._left:
+                    child = node
+                    node = node._parent
+
+    """
+    validate(self, limit=None)는 트리의 모든 성질(parent-child link, BST 순서, root black, double red, black height, 노드 수, subclass의 subtree 정보)을 한번의 순회로 검사하고 찾아낸 위반들을 Violation 객체의 리스트로 반환한다. 아무것도 출력하지 않는다.
+    재귀 대신 명시적인 stack으로 post-order 순회를 하므로 트리가 망가져 아주 깊어졌더라도 호출 stack이 넘치지 않는다. BST 순서는 노드마다 조상들로부터 정해지는 하한과 상한 노드를 함께 stack에 넣어 검사하므로 부모와 자식 사이뿐 아니라 subtree 전체의 순서를 확인한다. 자식의 black height은 stack(heights)에 쌓아 두었다가 부모를 방문할 때 꺼내어 비교한다. 잘못된 link로 cycle이 생긴 경우를 대비하여 root에서 닿는 노드가 self._size보다 많아지면 멈춘다. split/join 뒤라 크기를 모르는 경우에는 노드 수를 비교하지 않고, 대신 방문한 노드를 기억해 두었다가 같은 노드에 다시 닿으면 멈춘다.
+
+    :param limit: 이 개수만큼 위반을 찾으면 검사를 멈춘다. None이면 끝까지 검사한다.
+    :return: Violation 객체들의 리스트, 트리가 올바르다면 빈 리스트
+    """
+    def validate(self, limit=None):
+        Violation = self.Violation
+        violations = self._root_violations()
+        root = self._root
+        if root is None:
+            return violations
+        heights = []
+        count = 0
+        size = self._size if self._size_known else None
+        reached = set() if size is None else None
+        stack = [(root, None, None, False)]
+        while stack:
+            node, lo, hi, visited = stack.pop()
+            left, right = node._left, node._right
+            if not visited:
+                count += 1
+                if size is None:
+                    if id(node) in reached:
+                        violations.append(Violation('size', node._element, 'the node is reachable from the root more than once'))
+                        break
+                    reached.add(id(node))
+                elif count > size:
+                    violations.append(Violation('size', None, f'more than {size} nodes are reachable from the root'))
+                    break
+                element = node._element
+                if (lo is not None and element < lo._element) or (hi is not None and hi._element < element):
+                    violations.append(Violation('bst_order', element, 'element is out of the range allowed by its ancestors'))
+                self._local_violations(node, violations, False)
+                if limit is not None and len(violations) >= limit:
+                    break
+                stack.append((node, lo, hi, True))
+                if right is not None:
+                    stack.append((right, node, hi, False))
+                if left is not None:
+                    stack.append((left, lo, node, False))
+                continue
+            right_height = heights.pop() if right is not None else 0
+            left_height = heights.pop() if left is not None else 0
+            if left_height != right_height:
+                violations.append(Violation('black_height', node._element, f'left black height {left_height}, right black height {right_height}'))
+                if limit is not None and len(violations) >= limit:
+                    break
+            heights.append(max(left_height, right_height) + (0 if node._color == self._Node.RED else 1))
+        else:
+            if size is not None and count != size:
+                violations.append(Violation('size', None, f'{count} nodes are reachable from the root but size is {size}'))
+        return violations if limit is None else violations[:limit]
+
+    """
+    validate_path(self, node=None)는 마지막 insert/delete로 구조가 바뀐 위치(self._last_touched)에서 root까지의 O(log n)개 노드와 그 자식들만 검사하여 위반들을 반환한다. insert와 delete의 rebalancing은 이 경로와 그 바로 옆의 노드들만 바꾸므로, 매 쓰기 뒤에 실행해도 쓰기 한번과 비슷한 비용으로 그 쓰기가 망가뜨린 부분을 찾을 수 있다.
+    경로 위의 각 노드에 대해 parent-child link, 자식과의 순서, double red, subtree 정보를 검사하고, 두 자식의 black height을 각각 가장 왼쪽 경로로 세어 비교한다(O(log^2 n)). 처음 노드는 정렬 순서상 이웃 노드와의 순서도 확인한다. 트리 전체를 보지 않으므로 경로 밖의 위반은 찾지 못한다.
+
+    :param node: 검사를 시작할 노드, None이면 마지막 insert/delete의 위치를 사용한다.
+    :return: Violation 객체들의 리스트
+    """
+    def validate_path(self, node=None):
+        Violation = self.Violation
+        violations = self._root_violations()
+        if node is None:
+            node = self._last_touched
+        if node is None:
+            return violations
+        path = []
+        on_path = set()
+        while node is not None:
+            if id(node) in on_path:
+                violations.append(Violation('parent_link', node._element, 'parent links form a cycle'))
+                return violations
+            on_path.add(id(node))
+            path.append(node)
+            node = node._parent
+        if path[-1] is not self._root:
+            # 마지막으로 바뀐 노드가 더 이상 이 트리에 없다.
+            return violations
+        seen = set()
+        for node in path:
+            for current in (node, node._left, node._right):
+                if current is not None and id(current) not in seen:
+                    seen.add(id(current))
+                    self._local_violations(current, violations, True)
+            left_height = self._black_height(node._left)
+            right_height = self._black_height(node._right)
+            if left_height != right_height:
+                violations.append(Violation('black_height', node._element, f'left black height {left_height}, right black height {right_height}'))
+        first = path[0]
+        before, after = self._prev_node(first), self._next_node(first)
+        if before is not None and first._element < before._element:
+            violations.append(Violation('bst_order', first._element, f'previous element {before._element!r} is greater'))
+        if after is not None and after._element < first._element:
+            violations.append(Violation('bst_order', first._element, f'next element {after._element!r} is smaller'))
+        return violations
+
+    """
+    validate_sample(self, paths=8, rng=None)는 root에서 무작위로 왼쪽 또는 오른쪽을 골라 leaf까지 내려가는 경로를 paths개 골라 그 위의 노드들만 검사한다. 각 노드는 조상들로부터 정해지는 범위, parent-child link, double red, subtree 정보를 검사하고, 모든 경로의 black 노드 수가 같은지도 비교한다. 비용은 O(paths * log n)이므로 N번째 쓰기마다 실행할 수 있을 만큼 싸고, 여러 번 실행하면 트리의 서로 다른 부분을 확률적으로 검사하게 된다.
+
+    :param paths: 검사할 경로의 수
+    :param rng: 방향을 고를 때 사용할 random.Random 객체, None이면 random 모듈을 사용한다.
+    :return: Violation 객체들의 리스트
+    """
+    def validate_sample(self, paths=8, rng=None):
+        Violation = self.Violation
+        RED = self._Node.RED
+        if rng is None:
+            rng = random
+        violations = self._root_violations()
+        expected = None
+        seen = set()
+        for _ in range(paths if self._root is not None else 0):
+            node = self._root
+            lo = hi = None
+            black = 0
+            on_path = set()
+            while node is not None:
+                if id(node) in on_path:
+                    violations.append(Violation('size', node._element, 'a path from the root reaches the same node twice'))
+                    return violations
+                on_path.add(id(node))
+                if id(node) not in seen:
+                    seen.add(id(node))
+                    element = node._element
+                    if (lo is not None and element < lo._element) or (hi is not None and hi._element < element):
+                        violations.append(Violation('bst_order', element, 'element is out of the range allowed by its ancestors'))
+                    self._local_violations(node, violations, False)
+                if node._color != RED:
+                    black += 1
+                if rng.random() < 0.5:
+                    hi, node = node, node._left
+                else:
+                    lo, node = node, node._right
+            if expected is None:
+                expected = black
+            elif black != expected:
+                violations.append(Violation('black_height', None, f'sampled paths have {expected} and {black} black nodes'))
+        return violations
+
+    """
+    _root_violations(self)는 root의 parent가 None인지, root가 black인지, 빈 트리의 크기가 0인지를 검사한다.
+
+    :return: Violation 객체들의 리스트
+    """
+    def _root_violations(self):
+        violations = []
+        root = self._root
+        if root is None:
+            if self._size_known and self._size != 0:
+                violations.append(self.Violation('size', None, f'the tree is empty but size is {self._size}'))
+        else:
+            if root._parent is not None:
+                violations.append(self.Violation('parent_link', root._element, 'root has a parent'))
+            if root._color == self._Node.RED:
+                violations.append(self.Violation('root_color', root._element, 'root is red'))
+        return violations
+
+    """
+    _local_violations(self, node, violations, check_order)는 node와 그 자식들 사이의 성질(자식의 _parent가 node인지, double red, check_order가 True이면 자식과의 순서)과 subclass가 저장하는 subtree 정보를 검사하여 찾은 위반을 violations에 추가한다.
+
+    :param node: 검사할 노드
+    :param violations: 위반을 추가할 리스트
+    :param check_order: 자식과의 BST 순서도 검사할지 여부
+    """
+    def _local_violations(self, node, violations, check_order):
+        Violation = self.Violation
+        RED = self._Node.RED
+        element = node._element
+        for child in (node._left, node._right):
+            if child is None:
+                continue
+            if child._parent is not node:
+                violations.append(Violation('parent_link', child._element, f'does not point back to its parent {element!r}'))
+            if node._color == RED and child._color == RED:
+                violations.append(Violation('double_red', child._element, f'red child of red node {element!r}'))
+        if check_order:
+            if node._left is not None and element < node._left._element:
+                violations.append(Violation('bst_order', node._left._element, f'left child is greater than {element!r}'))
+            if node._right is not None and node._right._element < element:
+                violations.append(Violation('bst_order', node._right._element, f'right child is smaller than {element!r}'))
+        if self._augmented:
+            detail = self._augmentation_error(node)
+            if detail is not None:
+                violations.append(Violation('augmentation', element, detail))
+
+    """
+    _augmentation_error(self, node)는 node에 저장된 subtree 정보가 자식들로부터 계산한 값과 같은지 검사하는 hook이다. 다르면 설명 문자열을, 같으면 None을 반환한다. _augmented가 True인 subclass에서 구현한다.
+
+    :param node: 검사할 노드
+    :return: 위반 설명 또는 None
+    """
+    def _augmentation_error(self, node):
+        return None
+
+    """
+    enable_instrumentation(self, trace=None)는 rebalancing에 대한 통계를 세기 시작한다. 클래스의 함수는 바꾸지 않고 이 트리 객체에만 같은 이름의 wrapper 함수(_rotate, _recoloring_for_insert, _process_double_red 등)를 attribute로 설치하는 방식이다. 메소드를 찾을 때 instance의 attribute가 클래스보다 먼저 사용되므로 트리 내부의 self._rotate(...) 같은 호출이 모두 wrapper를 거치게 된다. 꺼져 있을 때에는 wrapper가 없으므로 insert/delete의 비용이 전혀 늘지 않는다.
+    세는 값들은 다음과 같다.
+        comparisons: _find_node(search, delete 등)와 _search_n_add_for_insert(insert)에서 한 element 비교의 횟수
+        rotations: _rotate의 호출 횟수, restructures: _reconstruct(insert의 회전)의 호출 횟수
+        recolorings: _recoloring_for_insert의 호출 횟수
+        double_red_fixups, double_red_depth_total, double_red_max_depth: _process_double_red의 호출 횟수와, 한번의 호출에서 위로 올라간 단계 수(recoloring과 reconstruct의 횟수)의 합과 최댓값
+        double_black_fixups, double_black_max_depth: delete에서 _process_double_black을 (재귀가 아닌) 처음 호출한 횟수와, 재귀로 위로 올라간 가장 깊은 단계 수
+        double_black_red_sibling, double_black_red_nephew, double_black_black_nephews: 형제가 red인 경우(_process_double_black 안의 회전), 형제의 자식 중 red가 있는 경우(_process_double_black_01), 형제의 자식이 모두 black인 경우(_process_double_black_02)의 횟수
+        inserts, deletes: _insert_node와 _delete_node의 호출 횟수
+    trace가 주어지면 insert와 delete가 끝날 때마다 trace(연산 이름, element, 그 연산 동안 바뀐 통계들의 dict, 걸린 시간(초))를 호출하므로(element는 key 함수가 주어진 트리에서도 search 등과 같이 사용자가 넣은 원래 element이다), 느린 연산과 연쇄적인 rebalancing을 연결지어 볼 수 있다. delete의 경우 _delete_node를 기준으로 하므로 지울 노드를 찾는 비교 횟수는 포함되지 않는다. 이미 켜져 있는 경우에는 통계를 0으로 되돌리고 다시 설치한다.
+
+    :param trace: 연산마다 호출할 함수, None이면 호출하지 않는다.
+    """
+    _STAT_NAMES = ('comparisons', 'rotations', 'restructures', 'recolorings',
+                   'double_red_fixups', 'double_red_depth_total', 'double_red_max_depth',
+                   'double_black_fixups', 'double_black_max_depth', 'double_black_red_sibling',
+                   'double_black_red_nephew', 'double_black_black_nephews', 'inserts', 'deletes')
+
+    def enable_instrumentation(self, trace=None):
+        self.disable_instrumentation()
+        stats = dict.fromkeys(self._STAT_NAMES, 0)
+        cls = type(self)
+        RED = self._Node.RED
+        nesting = [0]    # _process_double_black의 재귀 깊이
+
+        def _rotate(node):
+            stats['rotations'] += 1
+            cls._rotate(self, node)
+
+        def _reconstruct(node):
+            stats['restructures'] += 1
+            cls._reconstruct(self, node)
+
+        def _recoloring_for_insert(node):
+            stats['recolorings'] += 1
+            cls._recoloring_for_insert(self, node)
+
+        def _process_double_red(node):
+            before = stats['recolorings'] + stats['restructures']
+            cls._process_double_red(self, node)
+            depth = stats['recolorings'] + stats['restructures'] - before
+            stats['double_red_fixups'] += 1
+            stats['double_red_depth_total'] += depth
+            if depth > stats['double_red_max_depth']:
+                stats['double_red_max_depth'] = depth
+
+        def _process_double_black(node):
+            if nesting[0] == 0:
+                stats['double_black_fixups'] += 1
+            nesting[0] += 1
+            if nesting[0] > stats['double_black_max_depth']:
+                stats['double_black_max_depth'] = nesting[0]
+            sibling = self._sibiling(node)
+            if sibling is not None and sibling._color == RED:
+                stats['double_black_red_sibling'] += 1
+            try:
+                cls._process_double_black(self, node)
+            finally:
+                nesting[0] -= 1
+
+        def _process_double_black_01(node):
+            stats['double_black_red_nephew'] += 1
+            cls._process_double_black_01(self, node)
+
+        def _process_double_black_02(node):
+            stats['double_black_black_nephews'] += 1
+            cls._process_double_black_02(self, node)
+
+        def _insert_node(node):
+            stats['inserts'] += 1
+            if trace is None:
+                cls._insert_node(self, node)
+                return
+            before = dict(stats)
+            start = time.perf_counter()
+            cls._insert_node(self, node)
+            elapsed = time.perf_counter() - start
+            trace('insert', self._item_of(node), self._stats_delta(before), elapsed)
+
+        def _delete_node(target):
+            stats['deletes'] += 1
+            if trace is None:
+                return cls._delete_node(self, target)
+            # _delete_node는 target에 successor의 내용을 복사할 수 있으므로 지우기 전에 element를 꺼내둔다.
+            item = self._item_of(target)
+            before = dict(stats)
+            start = time.perf_counter()
+            element = cls._delete_node(self, target)
+            elapsed = time.perf_counter() - start
+            trace('delete', item, self._stats_delta(before), elapsed)
+            return element
+
+        def _search_n_add_for_insert(node):
+            cls._search_n_add_for_insert(self, node)
+            # 내려간 level마다 비교를 한번 하므로 새 노드의 조상 수가 곧 비교 횟수이다.
+            ancestor = node._parent
+            while ancestor is not None:
+                stats['comparisons'] += 1
+                ancestor = ancestor._parent
+
+        wrappers = {
+            '_rotate': _rotate,
+            '_reconstruct': _reconstruct,
+            '_recoloring_for_insert': _recoloring_for_insert,
+            '_process_double_red': _process_double_red,
+            '_process_double_black': _process_double_black,
+            '_process_double_black_01': _process_double_black_01,
+            '_process_double_black_02': _process_double_black_02,
+            '_insert_node': _insert_node,
+            '_delete_node': _delete_node,
+            '_search_n_add_for_insert': _search_n_add_for_insert,
+            '_find_node': self._find_node_counting,
+        }
+        self._stats = stats
+        self.__dict__.update(wrappers)
+        self._instrumented = tuple(wrappers)
+
+    """
+    disable_instrumentation(self)는 enable_instrumentation이 설치한 wrapper들을 지워서 트리를 원래의 비용으로 되돌린다. 지금까지 센 통계는 stats()로 계속 볼 수 있다.
+    """
+    def disable_instrumentation(self):
+        for name in self._instrumented:
+            del self.__dict__[name]
+        self._instrumented = ()
+
+    """
+    stats(self)는 지금까지 센 통계의 사본을 dict로 반환한다.
+
+    :return: 통계 이름과 값의 dict
+    :raises ValueError: enable_instrumentation이 한번도 호출되지 않은 경우
+    """
+    def stats(self):
+        if self._stats is None:
+            raise ValueError('instrumentation is not enabled')
+        return dict(self._stats)
+
+    def _stats_delta(self, before):
+        return {name: value - before[name] for name, value in self._stats.items() if value != before[name]}
+
+    """
+    _find_node_counting(self, element)는 instrumentation이 켜져 있을 때 _find_node 대신 사용되는 함수로, _find_node와 같은 방식으로 내려가면서 한 element 비교의 횟수를 self._stats['comparisons']에 더한다.
+    """
+    def _find_node_counting(self, element):
+        node = self._root
+        count = 0
+        while node is not None:
+            current = node._element
+            count += 1
+            if element < current:
+                node = node._left
+                continue
+            count += 1
+            if current < element:
+                node = node._right
+            else:
+                break
+        self._stats['comparisons'] += count
+        return node
+
     # Supporting functions -- DO NOT MODIFY BELOW
     def display(self):
         print('--------------')
@@ -633,10 +1927,7 @@ class RedBlackTree():
         return self._inorder_traverse(self._root)
 
     def _inorder_traverse(self, node):
-        if node == None:
-            return []
-        else:
-            return self._inorder_traverse(node._left) + [node._element] + self._inorder_traverse(node._right)
+        return list(map(self._item_of, self._iter_nodes(node)))
 
     def check_tree_property_silent(self):
         if self._root == None:
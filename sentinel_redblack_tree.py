@@ -0,0 +1,1139 @@
+import random
+import time
+from operator import attrgetter
+
+import redblack_storage
+from redblack_tree import RedBlackTree
+
+"""
+Class SentinelRedBlackTree는 RedBlackTree와 같은 public API를 제공하지만 insert/delete의 rebalancing을 다른 방식으로 구현한 red-black tree이다.
+첫째, 빈 자식과 root의 부모를 None 대신 모든 트리가 함께 사용하는 black NIL 노드(sentinel, _NIL)로 나타낸다. NIL도 색상과 link를 가진 노드이므로 자식의 색상을 볼 때 None 검사를 할 필요가 없다. NIL은 만든 뒤로 한번도 바뀌지 않는다. 탐색은 NIL에 찾는 key를 써넣지 않고 node is nil로 끝을 확인하므로 동시에 여러 thread가 읽어도 안전하고(ConcurrentRedBlackTree의 read lock), delete는 double black 자리의 부모를 NIL의 _parent에 적어두는 대신 인자로 넘긴다. 그래서 split과 join이 노드들을 다른 트리로 옮길 때 빈 자식의 link를 고칠 필요가 없다.
+둘째, double red와 double black의 처리는 색상(RED는 1, BLACK은 0)만으로 정해지는 경우의 표(insert와 _fix_double_black의 설명 참고)를 그대로 따른다. 형제는 level마다 한번만 찾고, 좌우가 대칭인 경우는 같은 표를 좌우만 바꾸어 적용한다. 방향을 index로 하는 [왼쪽, 오른쪽] 리스트에 자식을 저장하면 표를 한번만 쓸 수 있지만, 측정해보니 리스트 indexing이 slot 접근보다 느려 탐색까지 느려졌으므로 자식은 _left와 _right에 저장한다.
+delete는 successor의 element를 target으로 복사하지 않고 successor 노드를 target의 자리로 옮기므로(transplant), 지워지지 않은 노드는 항상 자기 element를 그대로 가진다.
+split과 join, enable_instrumentation, validate_path, validate_sample도 RedBlackTree와 같이 동작한다. subclass용 hook(_update 등)은 없다.
+
+:param key: element로부터 비교에 사용할 key를 계산하는 함수 (RedBlackTree.__init__ 참고)
+"""
+class SentinelRedBlackTree:
+    """Red-black tree with a shared NIL sentinel and case-table rebalancing."""
+
+    RED = 1
+    BLACK = 0
+
+    #-------------------------- nested _Node class --------------------------
+    class _Node:
+        """Lightweight, nonpublic class for storing a node."""
+        __slots__ = '_element', '_item', '_parent', '_left', '_right', '_color'
+
+        def __init__(self, element, item, nil, color):
+            self._element = element     # 비교에 사용하는 key (key 함수가 없으면 element 자체)
+            self._item = item           # 밖으로 돌려줄 원래 element
+            self._parent = nil
+            self._left = nil
+            self._right = nil
+            self._color = color
+
+    # 모든 트리가 함께 사용하는 NIL 노드. 자기 자신만 가리키며 바뀌지 않는다.
+    _NIL = _Node(None, None, None, BLACK)
+    _NIL._parent = _NIL._left = _NIL._right = _NIL
+
+    # enable_instrumentation이 켜져 있을 때의 통계 dict와, 그때 instance에 설치한 wrapper들의 이름
+    _stats = None
+    _instrumented = ()
+    _STAT_NAMES = RedBlackTree._STAT_NAMES
+
+    # RedBlackTree의 Cursor는 container의 _next_node, _prev_node, _lower_bound, _item_of만 사용하므로 그대로 쓴다.
+    Cursor = RedBlackTree.Cursor
+    Violation = RedBlackTree.Violation
+
+    _item_of = attrgetter('_item')
+
+    def __init__(self, key=None):
+        """Create an initially empty tree."""
+        self._nil = self._NIL
+        self._root = self._nil
+        self._size = 0
+        self._size_known = True     # False이면 self._size는 의미가 없고, 다음 len()에서 노드를 세어 다시 정한다.
+        self._last_touched = None   # 마지막 insert/delete로 구조가 바뀐 위치의 노드 (validate_path에서 사용)
+        self._key = key
+
+    """
+    __len__(self)는 RedBlackTree와 같이 split/join 뒤에는 처음 호출될 때 노드를 한번 세고, 그 뒤로는 insert/delete가 유지하는 크기를 반환한다.
+    """
+    def __len__(self):
+        if not self._size_known:
+            self._size = sum(1 for _ in self._iter_nodes())
+            self._size_known = True
+        return self._size
+
+    def _key_of(self, element):
+        return element if self._key is None else self._key(element)
+
+    #-------------------------- construction --------------------------
+    """
+    from_sorted, from_iterable, dump, load는 RedBlackTree와 같다. 정렬된 element들로 가운데 element를 root로 하는 균형잡힌 트리를 O(n)에 만든다.
+    """
+    @classmethod
+    def from_sorted(cls, iterable, key=None):
+        items = list(iterable)
+        keys = items if key is None else [key(element) for element in items]
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i-1]:
+                raise ValueError('elements must be sorted')
+        tree = cls(key)
+        tree._load_sorted(items)
+        return tree
+
+    @classmethod
+    def from_iterable(cls, iterable, key=None):
+        tree = cls(key)
+        tree._load_sorted(sorted(iterable, key=key))
+        return tree
+
+    def dump(self, path):
+        redblack_storage.write_sorted(path, self.iter_inorder())
+
+    @classmethod
+    def load(cls, path, key=None):
+        return cls.from_sorted(redblack_storage.read_sorted(path), key)
+
+    def _load_sorted(self, items):
+        nil = self._nil
+        key = self._key
+        if key is None:
+            nodes = [self._Node(element, element, nil, self.RED) for element in items]
+        else:
+            nodes = [self._Node(key(element), element, nil, self.RED) for element in items]
+        self._load_nodes(nodes)
+
+    """
+    _load_nodes(self, nodes)는 정렬 순서대로 나열된 노드들로 트리를 다시 만든다. RedBlackTree._load_nodes와 같이 depth가 floor(log2(n+1)) 이상인 노드만 red로 칠한다.
+    """
+    def _load_nodes(self, nodes):
+        red_depth = (len(nodes) + 1).bit_length() - 1
+        self._root = self._link_sorted(nodes, 0, len(nodes), 0, red_depth, self._nil)
+        self._size = len(nodes)
+        self._size_known = True
+        self._last_touched = None
+
+    def _link_sorted(self, nodes, lo, hi, depth, red_depth, parent):
+        if lo >= hi:
+            return self._nil
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node._parent = parent
+        node._color = self.RED if depth >= red_depth else self.BLACK
+        node._left = self._link_sorted(nodes, lo, mid, depth+1, red_depth, node)
+        node._right = self._link_sorted(nodes, mid+1, hi, depth+1, red_depth, node)
+        return node
+
+    _BULK_REBUILD_FACTOR = RedBlackTree._BULK_REBUILD_FACTOR
+
+    def _rebuild_pays_off(self, count):
+        return count * self._BULK_REBUILD_FACTOR >= len(self)
+
+    """
+    update, delete_many, delete_range는 RedBlackTree와 같이 처리할 element가 트리 크기에 비해 많으면 노드들을 정렬 순서대로 모아 트리를 다시 만들고, 적으면 하나씩 insert/delete한다.
+    """
+    def update(self, iterable):
+        items = sorted(iterable, key=self._key)
+        if not self._rebuild_pays_off(len(items)):
+            for element in items:
+                self.insert(element)
+            return
+        nil = self._nil
+        key = self._key
+        nodes = list(self._iter_nodes())
+        nodes.extend(self._Node(element if key is None else key(element), element, nil, self.RED) for element in items)
+        nodes.sort(key=attrgetter('_element'))
+        self._load_nodes(nodes)
+
+    def delete_many(self, elements):
+        elements = sorted(elements if self._key is None else map(self._key, elements))
+        if not self._rebuild_pays_off(len(elements)):
+            removed = 0
+            for element in elements:
+                node = self._find_node(element)
+                if node is not None:
+                    self._delete_node(node)
+                    removed += 1
+            return removed
+        total = len(self)
+        kept = []
+        i = 0
+        for node in self._iter_nodes():
+            current = node._element
+            while i < len(elements) and elements[i] < current:
+                i += 1
+            if i < len(elements) and not current < elements[i]:
+                i += 1
+            else:
+                kept.append(node)
+        removed = total - len(kept)
+        self._load_nodes(kept)
+        return removed
+
+    def delete_range(self, lo=None, hi=None, inclusive=(True, True)):
+        doomed = list(self._irange_nodes(lo, hi, inclusive))
+        if not self._rebuild_pays_off(len(doomed)):
+            for node in doomed:
+                self._delete_node(node)
+            return len(doomed)
+        doomed = set(map(id, doomed))
+        self._load_nodes([node for node in self._iter_nodes() if id(node) not in doomed])
+        return len(doomed)
+
+    """
+    split(self, key)는 트리를 key보다 작은 element들의 트리와 key 이상인 element들의 트리로 나누고, join(cls, left, right)는 left의 모든 element가 right의 element 이하인 두 트리를 하나로 합친다. RedBlackTree와 같이 key를 찾아 내려가는 경로를 따라 잘린 subtree들을 _join_nodes로 붙이므로 O(log n)이 든다. 모든 트리가 같은 NIL을 사용하므로 노드들을 옮길 때 빈 자식의 link는 그대로 둔다. split한 트리들의 크기는 다음 len()에서 센다. 원래 트리(들)는 비어있게 된다.
+
+    :raises ValueError: join에서 left에 right의 가장 작은 element보다 큰 element가 있거나 두 트리의 key 함수가 다른 경우
+    """
+    def split(self, key):
+        left_root, _, right_root, _ = self._split_root(self._root, self._black_height(self._root), key)
+        left = type(self)(self._key)
+        right = type(self)(self._key)
+        left._root, right._root = left_root, right_root
+        left._size_known = right._size_known = False
+        self._root = self._nil
+        self._size = 0
+        self._size_known = True
+        self._last_touched = None
+        return left, right
+
+    @classmethod
+    def join(cls, left, right):
+        if left._key is not right._key:
+            raise ValueError('left and right must use the same key function')
+        nil = left._nil
+        tree = cls(left._key)
+        if left._root is nil or right._root is nil:
+            source = right if left._root is nil else left
+            tree._root, tree._size, tree._size_known = source._root, source._size, source._size_known
+        else:
+            if right._first(right._root)._element < left._last(left._root)._element:
+                raise ValueError('elements of left must not be greater than elements of right')
+            pivot = left._last(left._root)
+            left._delete_node(pivot)
+            tree._root, _ = tree._join_nodes(left._root, left._black_height(left._root),
+                                             pivot, right._root, right._black_height(right._root))
+            tree._size = left._size + right._size + 1
+            tree._size_known = left._size_known and right._size_known
+        for old in (left, right):
+            old._root = nil
+            old._size = 0
+            old._size_known = True
+            old._last_touched = None
+        return tree
+
+    """
+    _black_height(node), _split_root(node, black_height, key), _join_nodes(left, left_height, pivot, right, right_height)는 RedBlackTree의 같은 이름의 함수와 같다. 빈 트리는 None 대신 NIL로 나타내고, 잘린 subtree의 root가 red이면 black으로 바꾸어 독립된 트리로 만든다.
+    """
+    def _black_height(self, node):
+        nil = self._nil
+        height = 0
+        while node is not nil:
+            if node._color == self.BLACK:
+                height += 1
+            node = node._left
+        return height
+
+    def _split_root(self, node, black_height, key):
+        nil = self._nil
+        if node is nil:
+            return nil, 0, nil, 0
+        child_height = black_height - (1 if node._color == self.BLACK else 0)
+        pieces = []
+        for child in (node._left, node._right):
+            height = child_height
+            if child is not nil:
+                child._parent = nil
+                if child._color == self.RED:
+                    child._color = self.BLACK
+                    height += 1
+            pieces.append((child, height))
+        (left, left_height), (right, right_height) = pieces
+        node._left = node._right = node._parent = nil
+        if node._element < key:
+            low, low_height, high, high_height = self._split_root(right, right_height, key)
+            root, height = self._join_nodes(left, left_height, node, low, low_height)
+            return root, height, high, high_height
+        low, low_height, high, high_height = self._split_root(left, left_height, key)
+        root, height = self._join_nodes(high, high_height, node, right, right_height)
+        return low, low_height, root, height
+
+    def _join_nodes(self, left, left_height, pivot, right, right_height):
+        RED, BLACK = self.RED, self.BLACK
+        nil = self._nil
+        pivot._parent = nil
+        if left_height == right_height:
+            pivot._left, pivot._right = left, right
+            for child in (left, right):
+                if child is not nil:
+                    child._parent = pivot
+            pivot._color = BLACK
+            return pivot, left_height + 1
+
+        if left_height > right_height:
+            self._root = left
+            parent, node, height = nil, left, left_height
+            while not (height == right_height and node._color == BLACK):
+                if node._color == BLACK:
+                    height -= 1
+                parent, node = node, node._right
+            pivot._left, pivot._right = node, right
+            parent._right = pivot
+            anchor = right
+        else:
+            self._root = right
+            parent, node, height = nil, right, right_height
+            while not (height == left_height and node._color == BLACK):
+                if node._color == BLACK:
+                    height -= 1
+                parent, node = node, node._left
+            pivot._left, pivot._right = left, node
+            parent._left = pivot
+            anchor = left
+        pivot._parent = parent
+        pivot._color = RED
+        for child in (pivot._left, pivot._right):
+            if child is not nil:
+                child._parent = pivot
+        if parent._color == RED:
+            self._fix_double_red(pivot)
+
+        # 결과의 black height = anchor의 black height + anchor 위에 있는 black 노드의 수
+        if anchor is nil:
+            anchor = node
+        if anchor is nil:
+            anchor = pivot
+            height = self._black_height(pivot)
+        else:
+            height = min(left_height, right_height)
+        ancestor = anchor._parent
+        while ancestor is not nil:
+            if ancestor._color == BLACK:
+                height += 1
+            ancestor = ancestor._parent
+        return self._root, height
+
+    #-------------------------- search --------------------------
+    """
+    _find_node(self, key)는 root에서 반복문으로 내려가며 key를 가진 노드를 찾고, 찾지 못하면 None을 반환한다. 트리의 어떤 것도 바꾸지 않으므로 여러 thread가 동시에 호출해도 안전하다.
+    """
+    def _find_node(self, key):
+        nil = self._nil
+        node = self._root
+        while node is not nil:
+            current = node._element
+            if key < current:
+                node = node._left
+            elif current < key:
+                node = node._right
+            else:
+                return node
+        return None
+
+    def search(self, element):
+        node = self._find_node(self._key_of(element))
+        return None if node is None else node._item
+
+    def search_many(self, elements):
+        find, key_of = self._find_node, self._key_of
+        return [None if node is None else node._item for node in (find(key_of(element)) for element in elements)]
+
+    def contains_many(self, elements):
+        find, key_of = self._find_node, self._key_of
+        return [find(key_of(element)) is not None for element in elements]
+
+    """
+    floor, ceiling, lower, higher, min, max, pop_min, pop_max는 RedBlackTree와 같다. 조건을 만족하는 element가 없으면 None을 반환한다.
+    """
+    def floor(self, key):
+        node = self._floor_node(key)
+        return None if node is None else node._item
+
+    def ceiling(self, key):
+        node = self._lower_bound(key)
+        return None if node is None else node._item
+
+    def lower(self, key):
+        node = self._lower_node(key)
+        return None if node is None else node._item
+
+    def higher(self, key):
+        node = self._upper_bound(key)
+        return None if node is None else node._item
+
+    def min(self):
+        return None if self._root is self._nil else self._first(self._root)._item
+
+    def max(self):
+        return None if self._root is self._nil else self._last(self._root)._item
+
+    def pop_min(self):
+        if self._root is self._nil:
+            return None
+        node = self._first(self._root)
+        self._delete_node(node)
+        return node._item
+
+    def pop_max(self):
+        if self._root is self._nil:
+            return None
+        node = self._last(self._root)
+        self._delete_node(node)
+        return node._item
+
+    """
+    _lower_bound(key), _upper_bound(key), _floor_node(key), _lower_node(key)는 RedBlackTree의 같은 이름의 함수와 같이 한번 내려가며 조건을 만족하는 노드를 찾는다. Cursor와 irange에서 함께 사용하므로 찾지 못하면 NIL 대신 None을 반환한다.
+    """
+    def _lower_bound(self, key):
+        nil = self._nil
+        node = self._root
+        found = None
+        while node is not nil:
+            if node._element < key:
+                node = node._right
+            else:
+                found = node
+                node = node._left
+        return found
+
+    def _upper_bound(self, key):
+        nil = self._nil
+        node = self._root
+        found = None
+        while node is not nil:
+            if key < node._element:
+                found = node
+                node = node._left
+            else:
+                node = node._right
+        return found
+
+    def _floor_node(self, key):
+        nil = self._nil
+        node = self._root
+        found = None
+        while node is not nil:
+            if key < node._element:
+                node = node._left
+            else:
+                found = node
+                node = node._right
+        return found
+
+    def _lower_node(self, key):
+        nil = self._nil
+        node = self._root
+        found = None
+        while node is not nil:
+            if node._element < key:
+                found = node
+                node = node._right
+            else:
+                node = node._left
+        return found
+
+    #-------------------------- navigation --------------------------
+    """
+    _first(node)와 _last(node)는 node를 root로 하는 subtree의 가장 왼쪽/오른쪽 노드를 반환한다. _next_node(node)와 _prev_node(node)는 정렬 순서상 바로 다음/이전 노드를 반환한다. 이웃이 없으면 None을 반환한다.
+    """
+    def _first(self, node):
+        nil = self._nil
+        while node._left is not nil:
+            node = node._left
+        return node
+
+    def _last(self, node):
+        nil = self._nil
+        while node._right is not nil:
+            node = node._right
+        return node
+
+    def _next_node(self, node):
+        nil = self._nil
+        child = node._right
+        if child is not nil:
+            while child._left is not nil:
+                child = child._left
+            return child
+        parent = node._parent
+        while parent is not nil and parent._right is node:
+            node = parent
+            parent = parent._parent
+        return None if parent is nil else parent
+
+    def _prev_node(self, node):
+        nil = self._nil
+        child = node._left
+        if child is not nil:
+            while child._right is not nil:
+                child = child._right
+            return child
+        parent = node._parent
+        while parent is not nil and parent._left is node:
+            node = parent
+            parent = parent._parent
+        return None if parent is nil else parent
+
+    def _iter_nodes(self, reverse=False):
+        if self._root is self._nil:
+            return
+        node = self._last(self._root) if reverse else self._first(self._root)
+        step = self._prev_node if reverse else self._next_node
+        while node is not None:
+            yield node
+            node = step(node)
+
+    #-------------------------- iteration --------------------------
+    """
+    iter_inorder, __iter__, __reversed__, irange, cursor, inorder_traverse는 RedBlackTree와 같다.
+    """
+    def iter_inorder(self):
+        return map(self._item_of, self._iter_nodes())
+
+    def __iter__(self):
+        return self.iter_inorder()
+
+    def __reversed__(self):
+        return map(self._item_of, self._iter_nodes(True))
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        return map(self._item_of, self._irange_nodes(lo, hi, inclusive, reverse))
+
+    def _irange_nodes(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        lo_inclusive, hi_inclusive = inclusive
+        empty = self._root is self._nil
+        if not reverse:
+            if lo is None:
+                node = None if empty else self._first(self._root)
+            elif lo_inclusive:
+                node = self._lower_bound(lo)
+            else:
+                node = self._upper_bound(lo)
+            while node is not None:
+                if hi is not None:
+                    if hi_inclusive and hi < node._element:
+                        return
+                    if not hi_inclusive and not node._element < hi:
+                        return
+                yield node
+                node = self._next_node(node)
+        else:
+            if hi is None:
+                node = None if empty else self._last(self._root)
+            elif hi_inclusive:
+                node = self._floor_node(hi)
+            else:
+                node = self._lower_node(hi)
+            while node is not None:
+                if lo is not None:
+                    if lo_inclusive and node._element < lo:
+                        return
+                    if not lo_inclusive and not lo < node._element:
+                        return
+                yield node
+                node = self._prev_node(node)
+
+    def cursor(self, key=None):
+        if key is None:
+            node = None if self._root is self._nil else self._first(self._root)
+        else:
+            node = self._lower_bound(key)
+        return self.Cursor(self, node)
+
+    def inorder_traverse(self):
+        return list(self.iter_inorder())
+
+    #-------------------------- insert --------------------------
+    """
+    _rotate_left(self, x)와 _rotate_right(self, x)는 x를 왼쪽/오른쪽 아래로 내리고 x의 오른쪽/왼쪽 자식을 x의 자리로 올리는 회전이다. x의 부모가 NIL이면 올라온 노드가 root가 된다. 옮겨지는 안쪽 subtree가 NIL이면 그 _parent는 고치지 않는다. NIL은 모든 트리가 함께 사용하므로 바뀌면 안 된다.
+
+    :param x: 내려갈 노드
+    """
+    def _rotate_left(self, x):
+        nil = self._nil
+        y = x._right
+        inner = y._left
+        x._right = inner
+        if inner is not nil:
+            inner._parent = x
+        parent = x._parent
+        y._parent = parent
+        if parent is nil:
+            self._root = y
+        elif parent._left is x:
+            parent._left = y
+        else:
+            parent._right = y
+        y._left = x
+        x._parent = y
+
+    def _rotate_right(self, x):
+        nil = self._nil
+        y = x._left
+        inner = y._right
+        x._left = inner
+        if inner is not nil:
+            inner._parent = x
+        parent = x._parent
+        y._parent = parent
+        if parent is nil:
+            self._root = y
+        elif parent._right is x:
+            parent._right = y
+        else:
+            parent._left = y
+        y._right = x
+        x._parent = y
+
+    """
+    insert(self, element)는 RedBlackTree와 같이 element를 가진 red 노드를 만들어 _insert_node로 넣을 자리를 찾아 넣는다. 같은 element가 이미 있으면 오른쪽으로 내려간다. 부모가 red이면 _fix_double_red로 부모가 red인 동안 double red를 다음 표에 따라 처리한다. 부모가 조부모의 오른쪽 자식이면 표의 왼쪽과 오른쪽을 바꾸어 적용한다.
+        삼촌이 red: 부모와 삼촌을 black, 조부모를 red로 바꾸고(recoloring) 조부모에서 다시 검사한다.
+        삼촌이 black이고 node가 부모의 오른쪽 자식: 부모를 left rotation하여 아래 경우로 바꾼다.
+        삼촌이 black이고 node가 부모의 왼쪽 자식: 부모를 black, 조부모를 red로 바꾸고 조부모를 right rotation한 뒤 끝낸다.
+    root의 부모는 black인 NIL이고 빈 자식도 black인 NIL이므로, 부모나 삼촌이 없는 경우를 따로 검사하지 않고 색상 비교만으로 경우가 정해진다. 마지막에 root를 black으로 칠한다. _fix_double_red는 위로 올라간 recoloring의 횟수를 반환한다(enable_instrumentation에서 사용).
+
+    :param element: 트리에 넣을 element
+    """
+    def insert(self, element):
+        self._insert_node(self._Node(element if self._key is None else self._key(element), element, self._nil, self.RED))
+
+    def _insert_node(self, node):
+        key = node._element
+        nil = self._nil
+        parent = nil
+        current = self._root
+        go_left = False
+        while current is not nil:
+            parent = current
+            go_left = key < current._element
+            current = current._left if go_left else current._right
+        node._parent = parent
+        if parent is nil:
+            self._root = node
+            node._color = self.BLACK
+        else:
+            if go_left:
+                parent._left = node
+            else:
+                parent._right = node
+            if parent._color == self.RED:
+                self._fix_double_red(node)
+        self._size += 1
+        self._last_touched = node
+
+    def _fix_double_red(self, node):
+        RED, BLACK = self.RED, self.BLACK
+        parent = node._parent
+        recolorings = 0
+        while parent._color == RED:
+            grand = parent._parent
+            if parent is grand._left:
+                uncle = grand._right
+                if uncle._color == RED:
+                    parent._color = uncle._color = BLACK
+                    grand._color = RED
+                    node = grand
+                    parent = node._parent
+                    recolorings += 1
+                    continue
+                if node is parent._right:
+                    self._rotate_left(parent)
+                    parent = node
+                parent._color = BLACK
+                grand._color = RED
+                self._rotate_right(grand)
+            else:
+                uncle = grand._left
+                if uncle._color == RED:
+                    parent._color = uncle._color = BLACK
+                    grand._color = RED
+                    node = grand
+                    parent = node._parent
+                    recolorings += 1
+                    continue
+                if node is parent._left:
+                    self._rotate_right(parent)
+                    parent = node
+                parent._color = BLACK
+                grand._color = RED
+                self._rotate_left(grand)
+            break
+        self._root._color = BLACK
+        return recolorings
+
+    #-------------------------- delete --------------------------
+    """
+    delete(self, element)는 _find_node와 같은 방법으로 element를 가진 노드를 찾아 지우고 그 element를 반환한다. element가 없으면 None을 반환한다. 가장 자주 쓰이는 경로이므로 탐색을 함수 호출 없이 직접 한다.
+    """
+    def delete(self, element):
+        key = element if self._key is None else self._key(element)
+        nil = self._nil
+        node = self._root
+        while node is not nil:
+            current = node._element
+            if key < current:
+                node = node._left
+            elif current < key:
+                node = node._right
+            else:
+                self._delete_node(node)
+                return node._item
+        return None
+
+    """
+    _delete_node(self, target)는 target을 트리에서 지운다. 자식이 하나 이하면 그 자식(NIL일 수 있음)을 target의 자리로 옮기고, 자식이 둘이면 successor 노드를 떼어내어 target의 자리로 옮기고 target의 색상을 물려준다. 실제로 트리에서 빠진 자리의 색상이 black이었다면 그 자리에 들어온 노드 x가 double black이 되므로 self._fix_double_black(x, x의 부모)로 처리한다. x가 NIL일 수 있으므로 x의 부모는 NIL에 적지 않고 따로 넘긴다.
+    RedBlackTree.delete와 달리 target이 root인지, 자식이 None인지, successor가 부모의 어느 쪽인지에 따라 경우를 나누지 않는다. 빈 자식도 NIL 노드이므로 위의 세 경우만으로 모든 위치가 처리된다.
+
+    :param target: 지울 노드
+    """
+    def _delete_node(self, target):
+        nil = self._nil
+        left = target._left
+        right = target._right
+        removed_color = target._color
+        if left is nil or right is nil:
+            x = replacement = left if right is nil else right
+            x_parent = target._parent
+        else:
+            successor = right
+            while successor._left is not nil:
+                successor = successor._left
+            removed_color = successor._color
+            x = successor._right
+            if successor._parent is target:
+                x_parent = successor
+            else:
+                # successor는 부모의 왼쪽 자식이므로 그 자리에 successor의 오른쪽 자식 x를 옮긴다.
+                x_parent = successor._parent
+                x_parent._left = x
+                if x is not nil:
+                    x._parent = x_parent
+                successor._right = right
+                right._parent = successor
+            successor._left = left
+            left._parent = successor
+            successor._color = target._color
+            replacement = successor
+        # target의 부모가 target 대신 replacement를 가리키게 한다.
+        parent = target._parent
+        if parent is nil:
+            self._root = replacement
+        elif parent._left is target:
+            parent._left = replacement
+        else:
+            parent._right = replacement
+        if replacement is not nil:
+            replacement._parent = parent
+        self._size -= 1
+        self._last_touched = None if x_parent is nil else x_parent
+        if removed_color == self.BLACK:
+            self._fix_double_black(x, x_parent)
+
+    """
+    _fix_double_black(self, x, parent)는 black 노드가 빠진 자리에 들어온 x(부모는 parent)에서 시작하여 double black을 다음 표에 따라 처리한다. x가 부모의 오른쪽 자식이면 표의 왼쪽과 오른쪽을 바꾸어 적용한다. w는 x의 형제이며 level마다 한번만 찾는다. x가 NIL이고 parent의 두 자식이 모두 NIL인 경우는 없으므로(형제의 black height이 1 이상이다) x is parent._left로 방향을 정할 수 있다.
+        w가 red: w를 black, 부모를 red로 바꾸고 부모를 left rotation하여 형제가 black인 경우로 바꾼다.
+        w의 두 자식이 black: w를 red로 바꾸고 부모에서 다시 검사한다. (부모가 red였다면 반복이 끝나고 black으로 칠해진다)
+        w의 오른쪽(먼 쪽) 자식만 black: 왼쪽 자식을 black, w를 red로 바꾸고 w를 right rotation하여 아래 경우로 바꾼다.
+        w의 오른쪽(먼 쪽) 자식이 red: w가 부모의 색상을 물려받고 부모와 먼 쪽 자식을 black으로 바꾼 뒤 부모를 left rotation하고 끝낸다.
+    x가 red이거나 root에 도달하면 x를 black으로 칠하고 끝낸다. NIL의 자식은 NIL이고 색상은 black이므로 w의 자식이 없는 경우도 색상 비교로 처리된다.
+    enable_instrumentation에서 사용하도록 (두 자식이 black인 형제를 만나 위로 올라간 횟수, 형제가 red였던 횟수, 먼 쪽 자식이 red인 경우로 끝났는지)를 반환한다.
+
+    :param x: double black이 된 노드 (NIL일 수 있음)
+    :param parent: x의 부모
+    :return: (위로 올라간 횟수, red 형제의 수, red nephew로 끝났으면 1 아니면 0)
+    """
+    def _fix_double_black(self, x, parent):
+        RED, BLACK = self.RED, self.BLACK
+        nil = self._nil
+        black_nephews = red_siblings = red_nephew = 0
+        while x is not self._root and x._color == BLACK:
+            if x is parent._left:
+                w = parent._right
+                if w._color == RED:
+                    w._color = BLACK
+                    parent._color = RED
+                    self._rotate_left(parent)
+                    w = parent._right
+                    red_siblings += 1
+                if w._left._color == BLACK and w._right._color == BLACK:
+                    w._color = RED
+                    x = parent
+                    parent = x._parent
+                    black_nephews += 1
+                    continue
+                if w._right._color == BLACK:
+                    w._left._color = BLACK
+                    w._color = RED
+                    self._rotate_right(w)
+                    w = parent._right
+                w._color = parent._color
+                parent._color = BLACK
+                w._right._color = BLACK
+                self._rotate_left(parent)
+            else:
+                w = parent._left
+                if w._color == RED:
+                    w._color = BLACK
+                    parent._color = RED
+                    self._rotate_right(parent)
+                    w = parent._left
+                    red_siblings += 1
+                if w._left._color == BLACK and w._right._color == BLACK:
+                    w._color = RED
+                    x = parent
+                    parent = x._parent
+                    black_nephews += 1
+                    continue
+                if w._left._color == BLACK:
+                    w._right._color = BLACK
+                    w._color = RED
+                    self._rotate_left(w)
+                    w = parent._left
+                w._color = parent._color
+                parent._color = BLACK
+                w._left._color = BLACK
+                self._rotate_right(parent)
+            red_nephew = 1
+            break
+        if x is not nil:
+            x._color = BLACK
+        return black_nephews, red_siblings, red_nephew
+
+    #-------------------------- validation --------------------------
+    """
+    validate(self, limit=None)는 RedBlackTree.validate와 같이 트리의 성질(parent-child link, BST 순서, root black, double red, black height, 노드 수)을 명시적인 stack으로 한번 순회하며 검사하고 Violation 객체의 리스트를 반환한다. 추가로 NIL이 black이고 자기 자신만 가리키는지도 검사한다(kind 'sentinel'). split/join 뒤라 크기를 모르는 경우에는 노드 수를 비교하지 않고, 같은 노드에 두번 닿으면 멈춘다.
+
+    :param limit: 이 개수만큼 위반을 찾으면 검사를 멈춘다. None이면 끝까지 검사한다.
+    :return: Violation 객체들의 리스트, 트리가 올바르다면 빈 리스트
+    """
+    def validate(self, limit=None):
+        Violation = self.Violation
+        nil = self._nil
+        violations = self._root_violations()
+        root = self._root
+        if root is nil:
+            return violations if limit is None else violations[:limit]
+        heights = []
+        count = 0
+        size = self._size if self._size_known else None
+        reached = set() if size is None else None
+        stack = [(root, None, None, False)]
+        while stack:
+            node, lo, hi, visited = stack.pop()
+            left, right = node._left, node._right
+            if not visited:
+                count += 1
+                if size is None:
+                    if id(node) in reached:
+                        violations.append(Violation('size', node._element, 'the node is reachable from the root more than once'))
+                        break
+                    reached.add(id(node))
+                elif count > size:
+                    violations.append(Violation('size', None, f'more than {size} nodes are reachable from the root'))
+                    break
+                element = node._element
+                if (lo is not None and element < lo._element) or (hi is not None and hi._element < element):
+                    violations.append(Violation('bst_order', element, 'element is out of the range allowed by its ancestors'))
+                self._local_violations(node, violations, False)
+                if limit is not None and len(violations) >= limit:
+                    break
+                stack.append((node, lo, hi, True))
+                if right is not nil:
+                    stack.append((right, node, hi, False))
+                if left is not nil:
+                    stack.append((left, lo, node, False))
+                continue
+            right_height = heights.pop() if right is not nil else 0
+            left_height = heights.pop() if left is not nil else 0
+            if left_height != right_height:
+                violations.append(Violation('black_height', node._element, f'left black height {left_height}, right black height {right_height}'))
+                if limit is not None and len(violations) >= limit:
+                    break
+            heights.append(max(left_height, right_height) + (0 if node._color == self.RED else 1))
+        else:
+            if size is not None and count != size:
+                violations.append(Violation('size', None, f'{count} nodes are reachable from the root but size is {size}'))
+        return violations if limit is None else violations[:limit]
+
+    """
+    validate_path(self, node=None)와 validate_sample(self, paths=8, rng=None)는 RedBlackTree와 같다. validate_path는 마지막 insert/delete로 구조가 바뀐 위치(self._last_touched)에서 root까지의 경로와 그 자식들만, validate_sample은 root에서 무작위로 내려가는 paths개의 경로 위의 노드들만 검사한다.
+
+    :param node: 검사를 시작할 노드, None이면 마지막 insert/delete의 위치를 사용한다.
+    :param paths: 검사할 경로의 수
+    :param rng: 방향을 고를 때 사용할 random.Random 객체, None이면 random 모듈을 사용한다.
+    :return: Violation 객체들의 리스트
+    """
+    def validate_path(self, node=None):
+        Violation = self.Violation
+        nil = self._nil
+        violations = self._root_violations()
+        if node is None:
+            node = self._last_touched
+        if node is None:
+            return violations
+        path = []
+        on_path = set()
+        while node is not nil:
+            if id(node) in on_path:
+                violations.append(Violation('parent_link', node._element, 'parent links form a cycle'))
+                return violations
+            on_path.add(id(node))
+            path.append(node)
+            node = node._parent
+        if path[-1] is not self._root:
+            # 마지막으로 바뀐 노드가 더 이상 이 트리에 없다.
+            return violations
+        seen = set()
+        for node in path:
+            for current in (node, node._left, node._right):
+                if current is not nil and id(current) not in seen:
+                    seen.add(id(current))
+                    self._local_violations(current, violations, True)
+            left_height = self._black_height(node._left)
+            right_height = self._black_height(node._right)
+            if left_height != right_height:
+                violations.append(Violation('black_height', node._element, f'left black height {left_height}, right black height {right_height}'))
+        first = path[0]
+        before, after = self._prev_node(first), self._next_node(first)
+        if before is not None and first._element < before._element:
+            violations.append(Violation('bst_order', first._element, f'previous element {before._element!r} is greater'))
+        if after is not None and after._element < first._element:
+            violations.append(Violation('bst_order', first._element, f'next element {after._element!r} is smaller'))
+        return violations
+
+    def validate_sample(self, paths=8, rng=None):
+        Violation = self.Violation
+        nil = self._nil
+        if rng is None:
+            rng = random
+        violations = self._root_violations()
+        expected = None
+        seen = set()
+        for _ in range(paths if self._root is not nil else 0):
+            node = self._root
+            lo = hi = None
+            black = 0
+            on_path = set()
+            while node is not nil:
+                if id(node) in on_path:
+                    violations.append(Violation('size', node._element, 'a path from the root reaches the same node twice'))
+                    return violations
+                on_path.add(id(node))
+                if id(node) not in seen:
+                    seen.add(id(node))
+                    element = node._element
+                    if (lo is not None and element < lo._element) or (hi is not None and hi._element < element):
+                        violations.append(Violation('bst_order', element, 'element is out of the range allowed by its ancestors'))
+                    self._local_violations(node, violations, False)
+                if node._color != self.RED:
+                    black += 1
+                if rng.random() < 0.5:
+                    hi, node = node, node._left
+                else:
+                    lo, node = node, node._right
+            if expected is None:
+                expected = black
+            elif black != expected:
+                violations.append(Violation('black_height', None, f'sampled paths have {expected} and {black} black nodes'))
+        return violations
+
+    """
+    _root_violations(self)는 NIL이 black이고 자기 자신만 가리키는지, root의 parent가 NIL인지, root가 black인지, 빈 트리의 크기가 0인지를 검사한다. _local_violations(self, node, violations, check_order)는 node와 그 자식들 사이의 parent-child link, double red와 check_order가 True이면 자식과의 순서를 검사한다.
+    """
+    def _root_violations(self):
+        Violation = self.Violation
+        nil = self._nil
+        violations = []
+        if nil._color != self.BLACK or nil._parent is not nil or nil._left is not nil or nil._right is not nil:
+            violations.append(Violation('sentinel', None, 'NIL must be black and link only to itself'))
+        root = self._root
+        if root is nil:
+            if self._size_known and self._size != 0:
+                violations.append(Violation('size', None, f'tree is empty but size is {self._size}'))
+        else:
+            if root._parent is not nil:
+                violations.append(Violation('parent_link', root._element, 'root has a parent'))
+            if root._color != self.BLACK:
+                violations.append(Violation('root_color', root._element, 'root is red'))
+        return violations
+
+    def _local_violations(self, node, violations, check_order):
+        Violation = self.Violation
+        nil = self._nil
+        element = node._element
+        for child in (node._left, node._right):
+            if child is nil:
+                continue
+            if child._parent is not node:
+                violations.append(Violation('parent_link', child._element, f'does not point back to its parent {element!r}'))
+            if node._color == self.RED and child._color == self.RED:
+                violations.append(Violation('double_red', child._element, f'red child of red node {element!r}'))
+        if check_order:
+            if node._left is not nil and element < node._left._element:
+                violations.append(Violation('bst_order', node._left._element, f'left child is greater than {element!r}'))
+            if node._right is not nil and node._right._element < element:
+                violations.append(Violation('bst_order', node._right._element, f'right child is smaller than {element!r}'))
+
+    #-------------------------- instrumentation --------------------------
+    """
+    enable_instrumentation(self, trace=None)는 RedBlackTree.enable_instrumentation과 같은 이름의 통계를 세기 시작한다. 이 트리 객체에만 _rotate_left, _rotate_right, _fix_double_red, _fix_double_black, _insert_node, _delete_node, _find_node, delete의 wrapper를 attribute로 설치하므로, 꺼져 있을 때에는 insert/delete의 비용이 늘지 않는다. 이 엔진의 rebalancing은 함수 하나 안의 반복문이므로 recoloring과 double black의 경우별 횟수는 _fix_double_red와 _fix_double_black이 반환하는 값으로 센다. restructures는 회전으로 끝난 double red 처리의 횟수이다.
+    trace가 주어지면 insert와 delete가 끝날 때마다 trace(연산 이름, element, 그 연산 동안 바뀐 통계들의 dict, 걸린 시간(초))를 호출한다. element는 key 함수가 주어진 트리에서도 사용자가 넣은 원래 element이다. disable_instrumentation(self)는 wrapper들을 지우고, stats(self)는 지금까지 센 통계의 사본을 반환한다.
+
+    :param trace: 연산마다 호출할 함수, None이면 호출하지 않는다.
+    :raises ValueError: stats에서 enable_instrumentation이 한번도 호출되지 않은 경우
+    """
+    def enable_instrumentation(self, trace=None):
+        self.disable_instrumentation()
+        stats = dict.fromkeys(self._STAT_NAMES, 0)
+        cls = type(self)
+        nil = self._nil
+        inserting = [None]  # 비교 횟수를 아직 세지 않은, insert 중인 노드
+
+        def count_comparisons(node):
+            # 내려간 level마다 비교를 한번 하므로 새 노드의 조상 수가 곧 비교 횟수이다. 회전으로 조상이 바뀌기 전에 센다.
+            inserting[0] = None
+            ancestor = node._parent
+            while ancestor is not nil:
+                stats['comparisons'] += 1
+                ancestor = ancestor._parent
+
+        def _rotate_left(x):
+            stats['rotations'] += 1
+            cls._rotate_left(self, x)
+
+        def _rotate_right(x):
+            stats['rotations'] += 1
+            cls._rotate_right(self, x)
+
+        def _fix_double_red(node):
+            if inserting[0] is node:
+                count_comparisons(node)
+            rotations = stats['rotations']
+            recolorings = cls._fix_double_red(self, node)
+            restructured = 1 if stats['rotations'] != rotations else 0
+            stats['recolorings'] += recolorings
+            stats['restructures'] += restructured
+            stats['double_red_fixups'] += 1
+            stats['double_red_depth_total'] += recolorings + restructured
+            stats['double_red_max_depth'] = max(stats['double_red_max_depth'], recolorings + restructured)
+            return recolorings
+
+        def _fix_double_black(x, parent):
+            counts = cls._fix_double_black(self, x, parent)
+            black_nephews, red_siblings, red_nephew = counts
+            stats['double_black_fixups'] += 1
+            stats['double_black_max_depth'] = max(stats['double_black_max_depth'], black_nephews + 1)
+            stats['double_black_red_sibling'] += red_siblings
+            stats['double_black_red_nephew'] += red_nephew
+            stats['double_black_black_nephews'] += black_nephews
+            return counts
+
+        def _insert_node(node):
+            stats['inserts'] += 1
+            before = dict(stats) if trace is not None else None
+            inserting[0] = node
+            start = time.perf_counter()
+            cls._insert_node(self, node)
+            elapsed = time.perf_counter() - start
+            if inserting[0] is node:
+                count_comparisons(node)
+            if trace is not None:
+                trace('insert', node._item, self._stats_delta(before), elapsed)
+
+        def _delete_node(target):
+            stats['deletes'] += 1
+            if trace is None:
+                cls._delete_node(self, target)
+                return
+            before = dict(stats)
+            start = time.perf_counter()
+            cls._delete_node(self, target)
+            elapsed = time.perf_counter() - start
+            # transplant 방식이므로 target은 지운 뒤에도 자기 element를 가지고 있다.
+            trace('delete', target._item, self._stats_delta(before), elapsed)
+
+        def delete(element):
+            node = self._find_node(self._key_of(element))
+            if node is None:
+                return None
+            self._delete_node(node)
+            return node._item
+
+        wrappers = {
+            '_rotate_left': _rotate_left,
+            '_rotate_right': _rotate_right,
+            '_fix_double_red': _fix_double_red,
+            '_fix_double_black': _fix_double_black,
+            '_insert_node': _insert_node,
+            '_delete_node': _delete_node,
+            '_find_node': self._find_node_counting,
+            'delete': delete,
+        }
+        self._stats = stats
+        self.__dict__.update(wrappers)
+        self._instrumented = tuple(wrappers)
+
+    def disable_instrumentation(self):
+        for name in self._instrumented:
+            del self.__dict__[name]
+        self._instrumented = ()
+
+    def stats(self):
+        if self._stats is None:
+            raise ValueError('instrumentation is not enabled')
+        return dict(self._stats)
+
+    def _stats_delta(self, before):
+        return {name: value - before[name] for name, value in self._stats.items() if value != before[name]}
+
+    def _find_node_counting(self, key):
+        nil = self._nil
+        node = self._root
+        count = 0
+        while node is not nil:
+            current = node._element
+            count += 1
+            if key < current:
+                node = node._left
+                continue
+            count += 1
+            if current < key:
+                node = node._right
+            else:
+                self._stats['comparisons'] += count
+                return node
+        self._stats['comparisons'] += count
+        return None
+
+    def check_tree_property_silent(self):
+        violations = self.validate(1)
+        if violations:
+            print(violations[0].detail)
+            return False
+        return True
+
+    def check_tree_property(self):
+        if self._root is self._nil:
+            print('Empty tree')
+            return
+        violations = self.validate()
+        for violation in violations:
+            print(violation)
+        print('Done' if not violations else f'{len(violations)} violations')
+
+    def display(self):
+        print('--------------')
+        self._display(self._root, 0)
+        print('--------------')
+
+    def _display(self, node, depth):
+        if node is self._nil:
+            return
+        self._display(node._right, depth+1)
+        symbol = '>' if node is self._root else '*'
+        colorstr = 'R' if node._color == self.RED else 'B'
+        print(f'{"    "*depth}{symbol} {node._element}({colorstr})')
+        self._display(node._left, depth+1)
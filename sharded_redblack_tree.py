@@ -0,0 +1,263 @@
+import random
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+from redblack_tree import RedBlackTree
+
+"""
+_sort_partition(items), _search_shard(tree, keys), _validate_shard(tree)는 ShardedRedBlackTree가 executor에 넘기는 작업들이다. ProcessPoolExecutor에서도 실행될 수 있도록 module 수준의 함수로 두었다.
+"""
+def _sort_partition(items):
+    return sorted(items)
+
+def _search_shard(tree, keys):
+    return tree.search_many(keys)
+
+def _validate_shard(tree):
+    return tree.check_tree_property_silent()
+
+
+"""
+Class ShardedRedBlackTree는 key의 범위에 따라 element들을 여러 개의 독립적인 트리(shard)에 나누어 저장하는 트리이다. 경계값 리스트 self._bounds가 [b1, b2, ...]라면 shard 0에는 b1보다 작은 element, shard 1에는 b1 이상 b2 미만의 element가 들어가는 식이며, 어떤 element가 들어갈 shard는 bisect로 O(log N)에 정해진다.
+shard들이 key 범위 순서대로 나뉘어 있으므로 전체를 정렬 순서로 순회할 때 heap으로 merge할 필요 없이 shard들을 차례로 이어서 순회하면 된다.
+search_many, load(bulk load), check_tree_property_silent는 shard별 작업으로 나누어 executor에 넘긴다. 트리의 노드는 parent link와 identity로 비교하는 색상 객체를 가지고 있어서 다른 process로 보낼 수 없으므로, executor가 ProcessPoolExecutor인 경우에는 트리가 필요 없는 작업(bulk load에서 각 shard에 들어갈 element들을 정렬하는 것)만 process로 보내고, 트리를 읽는 작업은 현재 process에서 차례로 실행한다. ThreadPoolExecutor는 모든 작업을 받는다. executor가 None이면 모든 작업을 현재 thread에서 실행한다.
+한 shard의 크기가 shard 평균 크기의 max_skew배를 넘으면 rebalance로 경계값을 다시 정한다. 처음에는 경계값이 없어 shard가 하나뿐이지만, element가 쌓이면 rebalance가 shard_count개의 shard로 나누어준다.
+
+:param shard_count: 나눌 shard의 개수
+:param executor: shard별 작업을 실행할 concurrent.futures의 Executor, None이면 현재 thread에서 실행한다.
+:param max_skew: shard 하나가 평균 크기의 몇 배를 넘으면 rebalance할지
+:param tree_class: shard로 사용할 트리 클래스 (RedBlackTree 또는 그 subclass)
+"""
+class ShardedRedBlackTree:
+    """Range-partitioned collection of red-black trees."""
+
+    # shard의 평균 크기가 이보다 작으면 skew가 커도 rebalance하지 않는다.
+    _MIN_SHARD_SIZE = 64
+    # bulk load에서 경계값을 정할 때 shard 하나당 뽑는 sample의 개수
+    _SAMPLES_PER_SHARD = 32
+
+    def __init__(self, shard_count=4, executor=None, max_skew=2.0, tree_class=RedBlackTree):
+        """Create an initially empty sharded tree."""
+        if shard_count < 1:
+            raise ValueError('shard_count must be positive')
+        if max_skew <= 1:
+            raise ValueError('max_skew must be greater than 1')
+        self._shard_count = shard_count
+        self._executor = executor
+        self._max_skew = max_skew
+        self._tree_class = tree_class
+        self._bounds = []
+        self._shards = [tree_class()]
+        self._size = 0
+        self._skew_limit = 0
+
+    def __len__(self):
+        return self._size
+
+    """
+    from_iterable(cls, iterable, **kwargs)는 빈 ShardedRedBlackTree를 만들고 load로 element들을 넣는 class method이다.
+
+    :param iterable: 넣을 element들의 iterable
+    :param kwargs: __init__에 넘길 인자들
+    :return: 새로운 ShardedRedBlackTree
+    """
+    @classmethod
+    def from_iterable(cls, iterable, **kwargs):
+        tree = cls(**kwargs)
+        tree.load(iterable)
+        return tree
+
+    """
+    shard_sizes(self)는 각 shard의 element 개수를 경계값 순서대로 리스트로 반환한다.
+    """
+    def shard_sizes(self):
+        return [len(shard) for shard in self._shards]
+
+    """
+    _shard_for(self, element)는 element가 들어가야 하는 shard를 반환한다.
+    """
+    def _shard_for(self, element):
+        return self._shards[bisect_right(self._bounds, element)]
+
+    """
+    _map(self, fn, args, needs_tree)는 args의 각 항목에 대해 fn을 executor에서 실행하고 결과를 순서대로 리스트로 반환한다. needs_tree가 True인 작업은 ProcessPoolExecutor로 보낼 수 없으므로 현재 process에서 실행한다.
+
+    :param fn: 실행할 module 수준의 함수
+    :param args: fn에 넘길 인자 tuple들의 리스트
+    :param needs_tree: fn이 트리 객체를 인자로 받는지 여부
+    :return: 결과들의 리스트
+    """
+    def _map(self, fn, args, needs_tree):
+        executor = self._executor
+        if executor is None or len(args) <= 1 or (needs_tree and isinstance(executor, ProcessPoolExecutor)):
+            return [fn(*a) for a in args]
+        return list(executor.map(fn, *zip(*args)))
+
+    #-------------------------- reads --------------------------
+    def search(self, element):
+        return self._shard_for(element).search(element)
+
+    def __contains__(self, element):
+        return self.search(element) is not None
+
+    """
+    search_many(self, elements)는 elements를 shard별로 나눈 뒤 각 shard의 search_many를 executor에서 실행하고, 결과를 입력 순서대로 다시 모아 반환한다. contains_many는 각 결과가 None이 아닌지를 반환한다.
+
+    :param elements: 찾고자 하는 element들의 iterable
+    :return: 입력 순서대로 찾은 element(없으면 None) 또는 bool의 리스트
+    """
+    def search_many(self, elements):
+        elements = list(elements)
+        groups = [[] for _ in self._shards]
+        positions = [[] for _ in self._shards]
+        bounds = self._bounds
+        for index, element in enumerate(elements):
+            i = bisect_right(bounds, element)
+            groups[i].append(element)
+            positions[i].append(index)
+        work = [i for i in range(len(groups)) if groups[i]]
+        found = self._map(_search_shard, [(self._shards[i], groups[i]) for i in work], True)
+        result = [None] * len(elements)
+        for i, values in zip(work, found):
+            for index, value in zip(positions[i], values):
+                result[index] = value
+        return result
+
+    def contains_many(self, elements):
+        return [value is not None for value in self.search_many(elements)]
+
+    """
+    __iter__(self)와 __reversed__(self)는 모든 shard의 element들을 정렬 순서(또는 역순)로 yield한다. shard들은 key 범위 순서대로 나뉘어 있으므로 차례로 이어 붙이기만 하면 된다.
+    """
+    def __iter__(self):
+        return chain.from_iterable(self._shards)
+
+    def __reversed__(self):
+        return chain.from_iterable(reversed(shard) for shard in reversed(self._shards))
+
+    """
+    irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False)는 RedBlackTree.irange와 같은 범위 규칙으로 element들을 yield한다. 범위와 겹치는 shard들만 차례로 순회한다.
+    """
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        first = 0 if lo is None else bisect_right(self._bounds, lo)
+        last = len(self._shards) - 1 if hi is None else bisect_right(self._bounds, hi)
+        shards = self._shards[first:last + 1]
+        if reverse:
+            shards.reverse()
+        for shard in shards:
+            yield from shard.irange(lo, hi, inclusive, reverse)
+
+    def inorder_traverse(self):
+        return list(self)
+
+    """
+    check_tree_property_silent(self)는 각 shard의 red-black tree 성질을 executor에서 검사하고, 각 shard의 element들이 경계값 범위 안에 있는지, 전체 크기가 맞는지도 확인한다.
+
+    :return: 모든 검사를 통과하면 True, 아니면 False
+    """
+    def check_tree_property_silent(self):
+        if not all(self._map(_validate_shard, [(shard,) for shard in self._shards], True)):
+            return False
+        if sum(len(shard) for shard in self._shards) != self._size:
+            return False
+        for i, shard in enumerate(self._shards):
+            if len(shard) == 0:
+                continue
+            if i > 0 and next(iter(shard)) < self._bounds[i - 1]:
+                return False
+            if i < len(self._bounds) and not next(reversed(shard)) < self._bounds[i]:
+                return False
+        return True
+
+    #-------------------------- writes --------------------------
+    def insert(self, element):
+        shard = self._shard_for(element)
+        shard.insert(element)
+        self._size += 1
+        self._check_skew(shard)
+
+    def delete(self, element):
+        removed = self._shard_for(element).delete(element)
+        if removed is not None:
+            self._size -= 1
+        return removed
+
+    """
+    load(self, iterable)는 element들을 한번에 넣는다. 트리가 비어있다면 먼저 element들 중 일부를 무작위로 뽑아 정렬한 sample로부터 shard_count개로 고르게 나뉘는 경계값을 정한다. 그 다음 element들을 경계값에 따라 shard별로 나누고, 각 부분을 정렬하는 작업을 executor에서 동시에 실행한다. 정렬은 리스트만 주고받으므로 ProcessPoolExecutor에서도 실행된다. 마지막으로 정렬된 부분을 비어있는 shard에는 from_sorted로, 그렇지 않은 shard에는 update로 넣는다.
+
+    :param iterable: 넣을 element들의 iterable
+    """
+    def load(self, iterable):
+        items = list(iterable)
+        if not items:
+            return
+        if self._size == 0:
+            self._bounds = self._sample_bounds(items)
+            self._shards = [self._tree_class() for _ in range(len(self._bounds) + 1)]
+        parts = [[] for _ in self._shards]
+        bounds = self._bounds
+        for element in items:
+            parts[bisect_right(bounds, element)].append(element)
+        work = [i for i in range(len(parts)) if parts[i]]
+        for i, part in zip(work, self._map(_sort_partition, [(parts[i],) for i in work], False)):
+            if len(self._shards[i]) == 0:
+                self._shards[i] = self._tree_class.from_sorted(part)
+            else:
+                self._shards[i].update(part)
+        self._size += len(items)
+        self._check_skew(max(self._shards, key=len))
+
+    """
+    _sample_bounds(self, items)는 items에서 shard 하나당 _SAMPLES_PER_SHARD개씩 무작위로 뽑은 sample을 정렬하여 shard_count개로 고르게 나누는 경계값들을 반환한다. 같은 값이 경계값으로 여러번 뽑히면 한번만 사용한다.
+
+    :param items: 넣을 element들의 리스트
+    :return: 오름차순의 경계값 리스트
+    """
+    def _sample_bounds(self, items):
+        count = self._shard_count
+        sample = sorted(random.sample(items, min(len(items), count * self._SAMPLES_PER_SHARD)))
+        bounds = []
+        for i in range(1, count):
+            bound = sample[len(sample) * i // count]
+            if (not bounds or bounds[-1] < bound) and sample[0] < bound:
+                bounds.append(bound)
+        return bounds
+
+    """
+    _check_skew(self, shard)는 shard의 크기가 shard 평균 크기(전체 크기 / shard_count)의 max_skew배를 넘는 경우 rebalance를 호출한다. 평균 크기가 _MIN_SHARD_SIZE보다 작을 때는 rebalance하지 않는다.
+    같은 element가 아주 많으면 rebalance를 해도 한 shard가 클 수밖에 없으므로, 마지막 rebalance 직후 가장 큰 shard 크기의 max_skew배(self._skew_limit)를 넘을 때까지는 다시 rebalance하지 않는다.
+
+    :param shard: 방금 element가 들어간 shard
+    """
+    def _check_skew(self, shard):
+        average = self._size / self._shard_count
+        size = len(shard)
+        if average >= self._MIN_SHARD_SIZE and size > self._max_skew * average and size > self._skew_limit:
+            self.rebalance()
+
+    """
+    rebalance(self)는 shard들이 다시 고르게 shard_count개로 나뉘도록 경계값을 새로 정한다. 먼저 정렬 순서로 전체를 한번 훑어 (전체 크기 * i / shard_count)번째 element들을 새 경계값으로 고른다. 그 다음 shard들을 RedBlackTree.join으로 하나로 이어 붙이고 새 경계값에서 split으로 다시 자른다. 노드를 새로 만들지 않으므로 원래 노드에 저장된 정보(예: RedBlackMap의 value)는 그대로 유지된다.
+    """
+    def rebalance(self):
+        count = self._shard_count
+        bounds = []
+        elements = iter(self)
+        position = 0
+        for i in range(1, count):
+            target = self._size * i // count
+            bound = next(islice(elements, target - position, None), None)
+            position = target + 1
+            if bound is not None and (not bounds or bounds[-1] < bound):
+                bounds.append(bound)
+        tree = self._shards[0]
+        for shard in self._shards[1:]:
+            tree = self._tree_class.join(tree, shard)
+        shards = []
+        for bound in bounds:
+            left, tree = tree.split(bound)
+            shards.append(left)
+        shards.append(tree)
+        self._bounds = bounds
+        self._shards = shards
+        self._skew_limit = self._max_skew * max(len(shard) for shard in shards)
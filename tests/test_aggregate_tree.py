@@ -0,0 +1,42 @@
+import operator
+import os
+import tempfile
+import unittest
+
+from aggregate_tree import AggregateTree
+
+
+class AggregateTreeTest(unittest.TestCase):
+
+    def test_sum_over_ranges_after_writes(self):
+        tree = AggregateTree()
+        for element in range(1, 101):
+            tree.insert(element)
+        for element in range(2, 101, 2):
+            tree.delete(element)
+        self.assertEqual(tree.range_aggregate(), 2500)
+        self.assertEqual(tree.range_aggregate(10, 20), sum(range(11, 20, 2)))
+        self.assertFalse(tree.validate())
+
+    def test_bulk_constructors_keep_the_monoid(self):
+        tree = AggregateTree.from_iterable([5, 3, 9, 1], combine=max, identity=float('-inf'))
+        self.assertEqual(tree.range_aggregate(), 9)
+        self.assertEqual(tree.range_aggregate(2, 6), 5)
+
+        records = [(1, 'a'), (2, 'bb'), (3, 'ccc')]
+        tree = AggregateTree.from_sorted(records, key=operator.itemgetter(0), measure=lambda r: len(r[1]))
+        self.assertEqual(tree.range_aggregate(2, 3), 5)
+        self.assertFalse(tree.validate())
+
+    def test_load_keeps_the_monoid(self):
+        tree = AggregateTree.from_iterable([4, 8, 2])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tree.rbt')
+            tree.dump(path)
+            loaded = AggregateTree.load(path, combine=min, identity=float('inf'))
+        self.assertEqual(loaded.range_aggregate(), 2)
+        self.assertEqual(list(loaded), [2, 4, 8])
+
+
+if __name__ == '__main__':
+    unittest.main()
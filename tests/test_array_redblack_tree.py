@@ -0,0 +1,42 @@
+import random
+import unittest
+
+from array_redblack_tree import ArrayRedBlackTree
+
+
+class ArrayRedBlackTreeTest(unittest.TestCase):
+
+    def test_matches_a_sorted_list(self):
+        rng = random.Random(0)
+        tree = ArrayRedBlackTree()
+        expected = []
+        for _ in range(2000):
+            key = rng.randrange(500)
+            if rng.random() < 0.6:
+                tree.insert(key)
+                expected.append(key)
+            elif key in expected:
+                tree.delete(key)
+                expected.remove(key)
+        self.assertEqual(list(tree), sorted(expected))
+        self.assertEqual(len(tree), len(expected))
+        self.assertTrue(tree.check_tree_property_silent())
+
+    def test_rejected_key_does_not_lose_a_slot(self):
+        tree = ArrayRedBlackTree()
+        for key in range(10):
+            tree.insert(key)
+        for key in range(5):
+            tree.delete(key)
+        slots = len(tree._keys)
+        for bad in (1.5, 'x', 2 ** 70):
+            with self.assertRaises((TypeError, OverflowError)):
+                tree.insert(bad)
+        for key in range(5):
+            tree.insert(key)
+        self.assertEqual(len(tree._keys), slots)
+        self.assertEqual(list(tree), list(range(10)))
+
+
+if __name__ == '__main__':
+    unittest.main()
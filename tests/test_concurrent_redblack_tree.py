@@ -0,0 +1,83 @@
+import threading
+import unittest
+
+from concurrent_redblack_tree import ConcurrentRedBlackTree
+from redblack_map import RedBlackMap
+from redblack_tree import RedBlackTree
+
+
+class ConcurrentRedBlackTreeTest(unittest.TestCase):
+
+    def test_threaded_inserts_and_deletes(self):
+        tree = ConcurrentRedBlackTree(batch_size=16)
+
+        def worker(base):
+            for x in range(base, base + 200):
+                tree.insert(x)
+            for x in range(base, base + 200, 2):
+                self.assertEqual(tree.delete(x), x)
+
+        threads = [threading.Thread(target=worker, args=(i * 1000,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        expected = [x for i in range(4) for x in range(i * 1000 + 1, i * 1000 + 200, 2)]
+        self.assertEqual(len(tree), len(expected))
+        self.assertEqual(tree.inorder_traverse(), expected)
+        self.assertEqual(tree.stats()['pending'], 0)
+
+    def test_deferred_writes_are_applied_by_flush_and_reads(self):
+        inner = RedBlackTree()
+        tree = ConcurrentRedBlackTree(inner, batch_size=1000)
+        for x in (3, 1, 2):
+            tree.insert(x, wait=False)
+        self.assertEqual(len(inner), 0)
+        tree.flush()
+        self.assertEqual(inner.inorder_traverse(), [1, 2, 3])
+        tree.delete(2, wait=False)
+        self.assertEqual(len(tree), 2)
+        self.assertEqual(tree.search_many([1, 2, 3]), [1, None, 3])
+
+    def test_failed_write_raises_in_submitter_only(self):
+        tree = ConcurrentRedBlackTree(batch_size=1000)
+        tree.insert(1)
+        with self.assertRaises(TypeError):
+            tree.insert('a')
+        tree.insert('b', wait=False)
+        tree.insert(2, wait=False)
+
+        other_errors = []
+
+        def other():
+            try:
+                tree.flush()
+            except Exception as error:
+                other_errors.append(error)
+
+        t = threading.Thread(target=other)
+        t.start()
+        t.join()
+        self.assertEqual(other_errors, [])
+        with self.assertRaises(TypeError):
+            tree.flush()
+        tree.flush()
+        self.assertEqual(tree.inorder_traverse(), [1, 2])
+
+    def test_wraps_map(self):
+        m = RedBlackMap()
+        tree = ConcurrentRedBlackTree(m)
+        tree.insert(2)
+        tree.insert(1)
+        tree.insert(2)
+        self.assertEqual(len(tree), 2)
+        self.assertIn(1, tree)
+        self.assertEqual(tree.irange(reverse=True), [2, 1])
+
+    def test_rejects_bad_batch_size(self):
+        with self.assertRaises(ValueError):
+            ConcurrentRedBlackTree(batch_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
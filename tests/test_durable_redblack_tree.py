@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+from durable_redblack_tree import DurableRedBlackTree
+from redblack_map import RedBlackMap
+from redblack_multiset import RedBlackMultiset
+
+
+class DurableRedBlackTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = self._directory.name
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_reopen_recovers_logged_writes(self):
+        with DurableRedBlackTree(self.path, sync_every=1, checkpoint_every=None) as tree:
+            for element in (5, 1, 9, 3):
+                tree.insert(element)
+            self.assertEqual(tree.delete(9), 9)
+            self.assertIsNone(tree.delete(42))
+        with DurableRedBlackTree(self.path) as tree:
+            self.assertEqual(list(tree), [1, 3, 5])
+
+    def test_reopen_after_checkpoints(self):
+        with DurableRedBlackTree(self.path, sync_every=1, checkpoint_every=4) as tree:
+            for element in range(10):
+                tree.insert(element)
+            tree.delete(0)
+        names = sorted(os.listdir(self.path))
+        self.assertEqual(names, ['checkpoint-2.rbt', 'wal-2.log'])
+        with DurableRedBlackTree(self.path) as tree:
+            self.assertEqual(list(tree), list(range(1, 10)))
+
+    def test_torn_log_tail_is_dropped(self):
+        with DurableRedBlackTree(self.path, sync_every=1, checkpoint_every=None) as tree:
+            tree.insert('a')
+            tree.insert('b')
+        log_path = os.path.join(self.path, 'wal-0.log')
+        with open(log_path, 'r+b') as f:
+            f.truncate(os.path.getsize(log_path) - 1)
+        with DurableRedBlackTree(self.path) as tree:
+            self.assertEqual(list(tree), ['a'])
+
+    def test_mixed_type_insert_is_rejected_before_the_write(self):
+        with DurableRedBlackTree(self.path, sync_every=1, checkpoint_every=3) as tree:
+            tree.insert(1)
+            with self.assertRaises(TypeError):
+                tree.insert(2.5)
+            tree.insert(2)
+            tree.insert(3)
+            tree.insert(4)
+            self.assertEqual(list(tree), [1, 2, 3, 4])
+        with DurableRedBlackTree(self.path) as tree:
+            self.assertEqual(list(tree), [1, 2, 3, 4])
+            with self.assertRaises(TypeError):
+                tree.insert('5')
+
+    def test_emptied_tree_accepts_another_type(self):
+        with DurableRedBlackTree(self.path, sync_every=1) as tree:
+            tree.insert(1)
+            tree.delete(1)
+            tree.insert('one')
+            self.assertEqual(list(tree), ['one'])
+
+    def test_unsupported_elements_are_not_logged(self):
+        with DurableRedBlackTree(self.path, sync_every=1) as tree:
+            with self.assertRaises(TypeError):
+                tree.insert((1, 2))
+            with self.assertRaises(OverflowError):
+                tree.insert(2 ** 64)
+            self.assertEqual(len(tree), 0)
+        self.assertEqual(os.path.getsize(os.path.join(self.path, 'wal-0.log')), 0)
+
+    def test_multiset_round_trip(self):
+        with DurableRedBlackTree(self.path, tree_class=RedBlackMultiset, sync_every=1, checkpoint_every=3) as tree:
+            for element in (2, 2, 1, 2):
+                tree.insert(element)
+            tree.delete(2)
+        with DurableRedBlackTree(self.path, tree_class=RedBlackMultiset) as tree:
+            self.assertEqual(list(tree), [1, 2, 2])
+
+    def test_map_tree_class_is_rejected(self):
+        with self.assertRaises(TypeError):
+            DurableRedBlackTree(self.path, tree_class=RedBlackMap)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from interval_tree import IntervalTree
+
+
+class IntervalTreeTest(unittest.TestCase):
+
+    def test_overlap_and_stab(self):
+        tree = IntervalTree()
+        for interval in [(1, 3), (2, 8), (5, 6), (9, 12), (10, 10)]:
+            tree.insert(interval)
+        self.assertEqual(list(tree.overlap(4, 9)), [(2, 8), (5, 6), (9, 12)])
+        self.assertEqual(list(tree.stab(10)), [(9, 12), (10, 10)])
+        self.assertTrue(tree.overlaps_any(0, 1))
+        self.assertFalse(tree.overlaps_any(13, 20))
+        self.assertFalse(tree.validate())
+
+    def test_inverted_intervals_are_rejected_on_every_path(self):
+        tree = IntervalTree()
+        with self.assertRaises(ValueError):
+            tree.insert((5, 1))
+        with self.assertRaises(ValueError):
+            tree.update([(5, 1)] * 20)
+        with self.assertRaises(ValueError):
+            tree.update([(0, 1), (5, 1)])
+        with self.assertRaises(ValueError):
+            IntervalTree.from_iterable([(3, 2)])
+        self.assertEqual(len(tree), 0)
+        self.assertFalse(tree.validate())
+
+    def test_bulk_update_keeps_max_invariant(self):
+        tree = IntervalTree()
+        tree.update([(i, i + 5) for i in range(0, 100, 2)])
+        self.assertFalse(tree.validate())
+        self.assertEqual(list(tree.stab(50)), [(46, 51), (48, 53), (50, 55)])
+
+
+if __name__ == '__main__':
+    unittest.main()
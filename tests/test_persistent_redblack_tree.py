@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from persistent_redblack_tree import PersistentRedBlackTree
+
+
+class PersistentRedBlackTreeTest(unittest.TestCase):
+
+    def test_snapshot_is_isolated_from_later_writes(self):
+        tree = PersistentRedBlackTree()
+        for x in range(20):
+            tree.insert(x)
+        snap = tree.snapshot()
+        for x in range(20, 40):
+            tree.insert(x)
+        for x in range(0, 20, 2):
+            tree.delete(x)
+        self.assertEqual(len(snap), 20)
+        self.assertEqual(snap.inorder_traverse(), list(range(20)))
+        self.assertIn(0, snap)
+        self.assertNotIn(0, tree)
+        self.assertEqual(tree.inorder_traverse(), list(range(1, 20, 2)) + list(range(20, 40)))
+        self.assertTrue(snap.check_tree_property_silent())
+        self.assertTrue(tree.check_tree_property_silent())
+
+    def test_snapshot_without_writes_is_reused(self):
+        tree = PersistentRedBlackTree()
+        tree.insert(1)
+        first = tree.snapshot()
+        self.assertIs(tree.snapshot(), first)
+        tree.insert(2)
+        self.assertIsNot(tree.snapshot(), first)
+        self.assertEqual(first.inorder_traverse(), [1])
+
+    def test_every_version_keeps_its_contents(self):
+        rng = random.Random(7)
+        tree = PersistentRedBlackTree()
+        model = set()
+        versions = []
+        for _ in range(300):
+            x = rng.randrange(100)
+            if x in model:
+                self.assertEqual(tree.delete(x), x)
+                model.discard(x)
+            else:
+                tree.insert(x)
+                model.add(x)
+            versions.append((tree.snapshot(), sorted(model)))
+        for snap, expected in versions:
+            self.assertEqual(snap.inorder_traverse(), expected)
+            self.assertEqual(len(snap), len(expected))
+            self.assertTrue(snap.check_tree_property_silent())
+
+    def test_irange_and_missing_delete(self):
+        tree = PersistentRedBlackTree()
+        for x in (5, 1, 9, 3, 7):
+            tree.insert(x)
+        snap = tree.snapshot()
+        self.assertIsNone(tree.delete(4))
+        self.assertEqual(list(snap.irange(3, 7)), [3, 5, 7])
+        self.assertEqual(list(snap.irange(3, 7, inclusive=(False, True), reverse=True)), [7, 5])
+        self.assertEqual(snap.search(9), 9)
+        self.assertIsNone(snap.search(8))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from redblack_map import RedBlackMap
+
+
+class RedBlackMapTest(unittest.TestCase):
+
+    def test_setitem_getitem_and_overwrite(self):
+        m = RedBlackMap()
+        for key in (5, 1, 9, 3):
+            m[key] = str(key)
+        m[3] = 'three'
+        self.assertEqual(len(m), 4)
+        self.assertEqual(m[3], 'three')
+        self.assertEqual(list(m.items()), [(1, '1'), (3, 'three'), (5, '5'), (9, '9')])
+        with self.assertRaises(KeyError):
+            m[4]
+        self.assertFalse(m.validate())
+
+    def test_insert_keeps_keys_unique(self):
+        m = RedBlackMap()
+        m[1] = 'a'
+        m.insert(1)
+        m.insert(2, 'b')
+        self.assertEqual(len(m), 2)
+        self.assertEqual(list(m.items()), [(1, None), (2, 'b')])
+
+    def test_update_keeps_keys_unique(self):
+        m = RedBlackMap()
+        m.update({1: 'a', 2: 'b'})
+        m.update([(2, 'B'), (3, 'C'), (3, 'c')])
+        self.assertEqual(list(m.items()), [(1, 'a'), (2, 'B'), (3, 'c')])
+
+    def test_get_setdefault_pop_and_del(self):
+        m = RedBlackMap()
+        self.assertEqual(m.setdefault(1, 'a'), 'a')
+        self.assertEqual(m.setdefault(1, 'z'), 'a')
+        self.assertEqual(m.get(2, 'none'), 'none')
+        self.assertEqual(m.pop(1), 'a')
+        self.assertEqual(m.pop(1, 'gone'), 'gone')
+        with self.assertRaises(KeyError):
+            m.pop(1)
+        m[2] = 'b'
+        del m[2]
+        self.assertNotIn(2, m)
+        with self.assertRaises(KeyError):
+            del m[2]
+
+    def test_values_survive_deletes(self):
+        m = RedBlackMap()
+        for key in range(100):
+            m[key] = key * key
+        for key in range(0, 100, 3):
+            del m[key]
+        self.assertEqual(dict(m.items()), {key: key * key for key in range(100) if key % 3})
+        self.assertFalse(m.validate())
+
+    def test_pop_min_and_pop_max_return_pairs(self):
+        m = RedBlackMap()
+        m.update([(2, 'b'), (1, 'a'), (3, 'c')])
+        self.assertEqual(m.pop_min(), (1, 'a'))
+        self.assertEqual(m.pop_max(), (3, 'c'))
+        self.assertEqual(m.pop_max(), (2, 'b'))
+        self.assertIsNone(m.pop_min())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+from redblack_storage import MappedRedBlackTree, read_sorted, write_sorted
+from redblack_tree import RedBlackTree
+
+
+class RedBlackStorageTest(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, 'tree.rbt')
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_dump_load_round_trip(self):
+        for elements in ([5, -3, 2 ** 62, 0], [2.5, -1.0, 3.25], ['b', 'a', '한글', 'ccc'], []):
+            tree = RedBlackTree.from_iterable(elements)
+            tree.dump(self.path)
+            loaded = RedBlackTree.load(self.path)
+            self.assertEqual(loaded.inorder_traverse(), sorted(elements))
+            self.assertEqual(read_sorted(self.path), sorted(elements))
+            self.assertFalse(loaded.validate())
+
+    def test_mapped_search_and_irange(self):
+        write_sorted(self.path, [1, 3, 5, 7, 9])
+        with MappedRedBlackTree(self.path) as mapped:
+            self.assertEqual(len(mapped), 5)
+            self.assertEqual(mapped.search(5), 5)
+            self.assertIsNone(mapped.search(4))
+            self.assertNotIn(10, mapped)
+            self.assertEqual(list(mapped.irange(3, 7)), [3, 5, 7])
+            self.assertEqual(list(mapped.irange(3, 7, inclusive=(False, False))), [5])
+            self.assertEqual(list(mapped.irange(hi=5, reverse=True)), [5, 3, 1])
+
+    def test_mapped_strings(self):
+        words = ['apple', 'banana', '체리', 'date']
+        write_sorted(self.path, sorted(words))
+        with MappedRedBlackTree(self.path) as mapped:
+            self.assertEqual(mapped.inorder_traverse(), sorted(words))
+            self.assertEqual(mapped.search('체리'), '체리')
+            self.assertIsNone(mapped.search('cherry'))
+            self.assertEqual(list(mapped.irange('b', 'e')), ['banana', 'date'])
+
+    def test_rejects_unsupported_elements(self):
+        with self.assertRaises(TypeError):
+            write_sorted(self.path, [1, 2.0])
+        with self.assertRaises(TypeError):
+            write_sorted(self.path, [(1, 2)])
+        with self.assertRaises(OverflowError):
+            write_sorted(self.path, [2 ** 64])
+
+    def test_rejects_foreign_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a tree file at all, just some bytes')
+        with self.assertRaises(ValueError):
+            read_sorted(self.path)
+        with self.assertRaises(ValueError):
+            MappedRedBlackTree(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
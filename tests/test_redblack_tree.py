@@ -0,0 +1,54 @@
+import operator
+import random
+import unittest
+
+from redblack_tree import RedBlackTree
+
+
+class RedBlackTreeTest(unittest.TestCase):
+
+    def test_insert_delete_match_a_sorted_list(self):
+        rng = random.Random(1)
+        tree = RedBlackTree()
+        expected = []
+        for _ in range(2000):
+            element = rng.randrange(300)
+            if rng.random() < 0.6:
+                tree.insert(element)
+                expected.append(element)
+            else:
+                removed = tree.delete(element)
+                self.assertEqual(removed is not None, element in expected)
+                if removed is not None:
+                    expected.remove(element)
+            self.assertFalse(tree.validate_path())
+        self.assertEqual(list(tree), sorted(expected))
+        self.assertEqual(len(tree), len(expected))
+        self.assertFalse(tree.validate())
+
+    def test_split_and_join_sizes(self):
+        tree = RedBlackTree.from_iterable(range(1000))
+        left, right = tree.split(400)
+        self.assertEqual((len(left), len(right), len(tree)), (400, 600, 0))
+        self.assertFalse(left.validate() or right.validate())
+        left.insert(-1)
+        joined = RedBlackTree.join(left, right)
+        self.assertEqual(len(joined), 1001)
+        self.assertEqual(list(joined), [-1] + list(range(1000)))
+        self.assertFalse(joined.validate())
+
+    def test_trace_reports_the_user_element_in_keyed_trees(self):
+        traced = []
+        tree = RedBlackTree(key=operator.itemgetter(0))
+        tree.enable_instrumentation(lambda op, element, delta, elapsed: traced.append((op, element)))
+        for record in [(3, 'c'), (1, 'a'), (2, 'b')]:
+            tree.insert(record)
+        tree.delete((3, None))
+        tree.pop_min()
+        self.assertEqual(traced, [('insert', (3, 'c')), ('insert', (1, 'a')), ('insert', (2, 'b')),
+                                  ('delete', (3, 'c')), ('delete', (1, 'a'))])
+        self.assertEqual(tree.stats()['inserts'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import random
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from redblack_map import RedBlackMap
+from sharded_redblack_tree import ShardedRedBlackTree
+
+
+class ShardedRedBlackTreeTest(unittest.TestCase):
+
+    def test_load_and_reads_match_sorted_list(self):
+        rng = random.Random(3)
+        items = [rng.randrange(10000) for _ in range(2000)]
+        with ThreadPoolExecutor(4) as executor:
+            tree = ShardedRedBlackTree(shard_count=4, executor=executor)
+            tree.load(items)
+            self.assertEqual(len(tree), len(items))
+            self.assertEqual(tree.inorder_traverse(), sorted(items))
+            self.assertEqual(list(reversed(tree)), sorted(items, reverse=True))
+            self.assertEqual(list(tree.irange(100, 200)), [x for x in sorted(items) if 100 <= x <= 200])
+            probes = [items[0], -1, items[5], 10001]
+            self.assertEqual(tree.search_many(probes), [items[0], None, items[5], None])
+            self.assertEqual(tree.contains_many(probes), [True, False, True, False])
+            self.assertTrue(tree.check_tree_property_silent())
+
+    def test_skewed_inserts_trigger_rebalance(self):
+        tree = ShardedRedBlackTree.from_iterable(range(1000), shard_count=4)
+        for x in range(1000, 5000):
+            tree.insert(x)
+        sizes = tree.shard_sizes()
+        self.assertEqual(sum(sizes), 5000)
+        self.assertLessEqual(max(sizes), 2 * 5000 / 4 + 1)
+        self.assertEqual(tree.inorder_traverse(), list(range(5000)))
+        self.assertTrue(tree.check_tree_property_silent())
+
+    def test_delete(self):
+        tree = ShardedRedBlackTree.from_iterable(range(100), shard_count=3)
+        self.assertEqual(tree.delete(50), 50)
+        self.assertIsNone(tree.delete(50))
+        self.assertEqual(len(tree), 99)
+        self.assertNotIn(50, tree)
+
+    def test_rebalance_keeps_map_values(self):
+        tree = ShardedRedBlackTree(shard_count=4, tree_class=RedBlackMap)
+        for x in range(200):
+            tree.insert(x)
+            tree._shard_for(x)[x] = str(x)
+        tree.rebalance()
+        self.assertEqual([tree._shard_for(x)[x] for x in range(200)], [str(x) for x in range(200)])
+
+    def test_rejects_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            ShardedRedBlackTree(shard_count=0)
+        with self.assertRaises(ValueError):
+            ShardedRedBlackTree(max_skew=1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -203,19 +203,16 @@ class Tree:
         yield p             # visit p after its subtrees
 
     """
-    levelorder(self) 메소드는 levelorder traversal의 순서로 tree 객체의 position을 yield한다. levelorder traversal은 tree의 node들을 level by level로, 각 level에서는 왼쪽에서 오른쪽으로 노드들을 방문하는 것을 말한다. 해당 메소드를 구현하기 위해서 queue를 이용한다.(여기선 q로 지정) 먼저 queue가 될 빈 리스트를 만들고 이 리스트에 root 노드를 append한다. 그 뒤에 queue에서 dequeue된, 즉 pop된 item들을 담을 빈 리스트를 만든다. (여기선, result라고 그 리스트를 담는 변수를 정했다.) 그 뒤에 queue의 첫 item을 부모로 지정한 뒤 이를 result에 넣고 그 자식을 queue에 넣고 다시 그 과정을 반복하고 이 과정을 통해 queue에는 맨 앞 노드가 하나씩 dequeue됨과 동시에 levelorder traversal 순서에 맞게 그 자식이 enqueue되기 때문에 최종적으로 result에 levelorder traversal 순서에 맞게 노드들이 append된다. 그 이후에는 for ele in result 반복문으로 result 리스트에 있는 노드들 각각에 대해서 그 position을 yield한다.
-    이 메소드의 running time은 O(n)이다. (for문이 들어있는 while문의 경우 결국 tree에 들어있는 노드들이 levelorder traversal 순서에 맞게 리스트에 들어가도록 하는 것이고 pop을 진행하며 len(q) == 0이 될때까지 진행하게 되는 반복문이므로 총 O(n)이 소요되며 그 뒤 for ele in result 반복문 역시 result에 들어있는 노드들의 수, 즉 tree에 있는 노드들의 수에 맞추어 반복되기 때문에 O(n)이다.)
+    levelorder(self) 메소드는 levelorder traversal의 순서로 tree 객체의 position을 yield한다. levelorder traversal은 tree의 node들을 level by level로, 각 level에서는 왼쪽에서 오른쪽으로 노드들을 방문하는 것을 말한다. 해당 메소드를 구현하기 위해서 queue를 이용한다.(여기선 q로 지정) queue로는 collections.deque를 사용하여 맨 앞의 노드를 popleft로 O(1)에 dequeue한다. (리스트의 pop(0)은 뒤의 item들을 모두 옮기므로 O(n)이다.) 먼저 root 노드를 queue에 넣은 뒤, queue의 맨 앞 노드를 꺼내 그 position을 바로 yield하고 그 자식들을 queue에 넣는 과정을 queue가 빌 때까지 반복한다. 노드를 꺼낼 때마다 바로 yield하므로 결과를 리스트에 모아둘 필요가 없다. tree가 empty라면 아무것도 yield하지 않는다.
+    이 메소드의 running time은 O(n)이다. (각 노드는 queue에 한번 들어가고 한번 나오며, enqueue와 dequeue가 모두 O(1)이기 때문이다.)
     
     :yield: levelorder traversal 순서에 맞추어 tree에 있는 노드들 각각의 position을 yield한다.
     """
     def levelorder(self):
-        q = []
-        q.append(self._validate(self._root))
-        result = []
-        while len(q) > 0:
-            pr = q.pop(0)
-            result.append(pr)
-            for ch in pr._children:
-                q.append(self._validate(self._make_position(ch)))
-        for ele in result:
-            yield self._make_position(ele)
\ No newline at end of file
+        if self.is_empty():
+            return
+        q = collections.deque([self._root])
+        while q:
+            pr = q.popleft()
+            yield self._make_position(pr)
+            q.extend(pr._children)